@@ -0,0 +1,155 @@
+"""
+Microbenchmark for the scraper's HTML parser backends.
+
+Runs every extractor on the saved fixture pages with each available backend
+(html.parser, lxml, selectolax), reports parse + extract time per page, and
+checks that every backend produces exactly the same output. Also checks that
+the rankings list rows (SCRAPE_MODE lite / hybrid) carry every list column and
+agree with what the player's JUCO profile gives for the same columns.
+
+Usage: python benchmark_parsers.py [iterations]
+"""
+
+import sys
+import time
+from pathlib import Path
+
+from scraper import (
+    HS_RANKINGS_MAP, JUCO_RANKINGS_MAP, TIMELINE_EVENT_ITEMS, ListRow,
+    available_parser_backends, extract_all_institution_ids, extract_commit_banner_team,
+    extract_hs_header, extract_list_rows, extract_player_urls, extract_profile_header, extract_rankings,
+    extract_timeline_items, find_juco_profile_link, parse_html,
+)
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+PROFILE_URL = "https://247sports.com/player/marcus-whitfield-46081234/"
+
+
+def extract_cover(doc) -> dict:
+    return {
+        'ids': extract_all_institution_ids(doc, PROFILE_URL),
+        'juco_link': find_juco_profile_link(doc),
+        'header': extract_profile_header(doc),
+        'commit_team': extract_commit_banner_team(doc),
+    }
+
+
+def extract_juco(doc) -> dict:
+    return {
+        'ids': extract_all_institution_ids(doc, PROFILE_URL + "junior-college-220011/"),
+        'header': extract_profile_header(doc),
+        'rankings': extract_rankings(doc, JUCO_RANKINGS_MAP, institution_check="JuniorCollege"),
+        'timeline': extract_timeline_items(doc),
+    }
+
+
+def extract_hs(doc) -> dict:
+    return {
+        'header': extract_hs_header(doc),
+        'rankings': extract_rankings(doc, HS_RANKINGS_MAP, institution_check="HighSchool"),
+    }
+
+
+def extract_timeline(doc) -> dict:
+    return {'timeline': extract_timeline_items(doc, TIMELINE_EVENT_ITEMS)}
+
+
+def extract_rankings_list(doc) -> dict:
+    return {'player_urls': extract_player_urls(doc), 'list_rows': extract_list_rows(doc)}
+
+
+FIXTURES = {
+    'cover_profile.html': extract_cover,
+    'juco_profile.html': extract_juco,
+    'hs_profile.html': extract_hs,
+    'timeline.html': extract_timeline,
+    'rankings_list.html': extract_rankings_list,
+}
+
+
+def check_list_rows() -> bool:
+    """Every list row has every list column, and the fixture player's row matches its JUCO profile"""
+    print("📋 rankings_list.html vs juco_profile.html (list columns)")
+    rows = extract_list_rows(parse_html((FIXTURES_DIR / "rankings_list.html").read_text(encoding='utf-8')))
+    columns = list(ListRow.__annotations__)
+    ok = bool(rows)
+    incomplete = [row.get('Profile URL') for row in rows if any(column not in row for column in columns)]
+    if not rows:
+        print("  ❌ No list rows extracted")
+    elif incomplete:
+        ok = False
+        print(f"  ❌ {len(incomplete)} of {len(rows)} rows are missing list columns, e.g. {incomplete[0]}")
+
+    profile = parse_html((FIXTURES_DIR / "juco_profile.html").read_text(encoding='utf-8'))
+    expected = {'Profile URL': PROFILE_URL, **extract_profile_header(profile)}
+    expected.update(extract_rankings(profile, JUCO_RANKINGS_MAP, institution_check="JuniorCollege"))
+    row = next((row for row in rows if row['Profile URL'] == PROFILE_URL), None)
+    if row is None:
+        ok = False
+        print(f"  ❌ {PROFILE_URL} is not on the list")
+    else:
+        for column in columns:
+            if row.get(column, "NA") != expected.get(column, "NA"):
+                ok = False
+                print(f"  ❌ {column}: list={row.get(column, 'NA')!r} profile={expected.get(column, 'NA')!r}")
+    if ok:
+        print(f"  ✓ {len(rows)} rows with all {len(columns)} list columns, fixture player matches its profile")
+    print()
+    return ok
+
+
+def run_benchmark(iterations: int) -> bool:
+    backends = available_parser_backends()
+    print(f"\n{'='*80}")
+    print(f"⚡ PARSER BACKEND BENCHMARK ({iterations} iterations, backends: {', '.join(backends)})")
+    print(f"{'='*80}\n")
+
+    all_identical = True
+    totals = {backend: 0.0 for backend in backends}
+
+    for fixture, extract in FIXTURES.items():
+        html = (FIXTURES_DIR / fixture).read_text(encoding='utf-8')
+        print(f"📄 {fixture} ({len(html) / 1024:.0f} KB)")
+
+        outputs = {}
+        for backend in backends:
+            started = time.perf_counter()
+            for _ in range(iterations):
+                output = extract(parse_html(html, backend))
+            per_page_ms = (time.perf_counter() - started) / iterations * 1000
+            totals[backend] += per_page_ms
+            outputs[backend] = output
+            print(f"  → {backend:<12} {per_page_ms:8.2f} ms/page")
+
+        reference = outputs[backends[0]]
+        for backend in backends[1:]:
+            if outputs[backend] != reference:
+                all_identical = False
+                print(f"  ❌ {backend} output differs from {backends[0]}")
+                for key in reference:
+                    if outputs[backend].get(key) != reference[key]:
+                        print(f"     {key}: {backends[0]}={reference[key]!r}")
+                        print(f"     {key}: {backend}={outputs[backend].get(key)!r}")
+        if all(outputs[backend] == reference for backend in backends):
+            print(f"  ✓ Identical output across backends")
+        print()
+
+    print("📊 Total per page set (cover + JUCO + HS + timeline + rankings list):")
+    baseline = totals[backends[0]]
+    for backend in backends:
+        print(f"  → {backend:<12} {totals[backend]:8.2f} ms ({baseline / totals[backend]:.1f}x vs {backends[0]})")
+
+    print()
+    list_rows_match = check_list_rows()
+
+    print(f"{'='*80}")
+    print("✅ ALL BACKENDS IDENTICAL" if all_identical else "❌ BACKEND OUTPUT MISMATCH")
+    if not list_rows_match:
+        print("❌ RANKINGS LIST ROWS DO NOT MATCH THE PROFILE")
+    print(f"{'='*80}\n")
+    return all_identical and list_rows_match
+
+
+if __name__ == "__main__":
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    sys.exit(0 if run_benchmark(iterations) else 1)
@@ -0,0 +1,157 @@
+"""
+Recombines sharded scraper output (SHARD_INDEX / SHARD_COUNT) into the normal per-year CSV.
+
+Looks for juco_recruiting_class_<year>_<date>_shard<i>of<n>.csv in DIR and the shard summaries
+(shards/shard_<year>_<i>of<n>.json) anywhere below it. For each year it checks that every shard
+is present, removes duplicate players by 247 Base ID (keeping the newest scrape), reports roster
+players no shard produced, and writes juco_recruiting_class_<year>_<date>.csv in roster order.
+
+Usage: python merge_shards.py [DIR] [--remove-shards]     (DIR defaults to output/)
+Exits 1 if any year is missing a shard.
+"""
+
+import csv
+import json
+import re
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+from scraper import CSV_HEADERS, shard_of
+
+SHARD_CSV = re.compile(r'^juco_recruiting_class_(?P<years>[\d-]+)_(?P<date>\d{8})_shard(?P<index>\d+)of(?P<count>\d+)\.csv$')
+
+
+def find_shard_csvs(directory: Path) -> dict:
+    """{years: [(shard_index, shard_count, date, path)]}"""
+    groups = defaultdict(list)
+    for path in sorted(directory.glob("*.csv")):
+        match = SHARD_CSV.match(path.name)
+        if match:
+            groups[match['years']].append((int(match['index']), int(match['count']), match['date'], path))
+    return groups
+
+
+def load_summaries(directory: Path, shards: list) -> dict:
+    """{shard_index: summary} for the summaries written alongside these shard CSVs"""
+    names = {path.name for _, _, _, path in shards}
+    summaries = {}
+    for path in sorted(directory.rglob("shard_*of*.json")):
+        try:
+            summary = json.loads(path.read_text(encoding='utf-8'))
+        except (OSError, ValueError) as e:
+            print(f"  ⚠️  Could not read shard summary {path}: {e}")
+            continue
+        if summary.get('csv') in names:
+            summaries[summary['shard_index']] = summary
+    return summaries
+
+
+def dedupe_rows(rows: list) -> tuple:
+    """One row per 247 Base ID (Profile URL when there is none), keeping the newest Scrape Date"""
+    kept = {}
+    for row in rows:
+        key = row['247 Base ID'] if row.get('247 Base ID', "NA") != "NA" else row['Profile URL']
+        if key not in kept or row.get('Scrape Date', '') > kept[key].get('Scrape Date', ''):
+            kept[key] = row
+    return list(kept.values()), len(rows) - len(kept)
+
+
+def check_coverage(summaries: dict, shard_count: int, rows: list) -> list:
+    """Roster URLs (union over every shard's roster) that no merged row covers, with the reason"""
+    scraped = {row['Profile URL'] for row in rows}
+    rosters = {index: set(summary['roster']) for index, summary in summaries.items()}
+    failed = {url for summary in summaries.values() for url in summary['failed']}
+    missing = []
+    for url in sorted(set().union(*rosters.values())):
+        if url in scraped:
+            continue
+        owner = shard_of(url, shard_count)
+        if owner not in rosters:
+            reason = f"shard {owner} is missing"
+        elif url not in rosters[owner]:
+            reason = f"not on shard {owner}'s roster"
+        elif url in failed:
+            reason = "failed"
+        else:
+            reason = "not scraped"
+        missing.append((url, reason))
+    return missing
+
+
+def merge_year(directory: Path, years: str, shards: list, remove_shards: bool) -> bool:
+    counts = {count for _, count, _, _ in shards}
+    print(f"\n📅 {years}: {len(shards)} shard files")
+    if len(counts) > 1:
+        print(f"  ❌ Shard files disagree on SHARD_COUNT: {sorted(counts)}")
+        return False
+    shard_count = counts.pop()
+    present = {index for index, _, _, _ in shards}
+    missing_shards = sorted(set(range(shard_count)) - present)
+    if missing_shards:
+        print(f"  ❌ Missing shards: {missing_shards} of {shard_count}")
+
+    rows = []
+    for index, _, _, path in sorted(shards):
+        with open(path, newline='', encoding='utf-8') as f:
+            shard_rows = list(csv.DictReader(f))
+        misplaced = sum(shard_of(row['Profile URL'], shard_count) != index for row in shard_rows)
+        print(f"  → Shard {index}: {len(shard_rows)} rows from {path.name}"
+              + (f" ⚠️  {misplaced} belong to another shard" if misplaced else ""))
+        rows.extend(shard_rows)
+    rows, duplicates = dedupe_rows(rows)
+    if duplicates:
+        print(f"  🔁 Removed {duplicates} duplicate players (by 247 Base ID)")
+
+    summaries = load_summaries(directory, shards)
+    if summaries:
+        discovered = {summary['roster_discovered_at'] for summary in summaries.values()}
+        if len(discovered) > 1:
+            print(f"  ⚠️  Shards split different roster snapshots: {sorted(discovered)}")
+        missing = check_coverage(summaries, shard_count, rows)
+        if missing:
+            print(f"  ⚠️  {len(missing)} roster players have no row:")
+            for url, reason in missing[:20]:
+                print(f"      {url} ({reason})")
+        roster = max(summaries.values(), key=lambda summary: summary['roster_discovered_at'])['roster']
+        positions = {url: position for position, url in enumerate(roster)}
+        rows.sort(key=lambda row: positions.get(row['Profile URL'], len(positions)))
+    else:
+        print(f"  ⚠️  No shard summaries found, cannot check roster coverage")
+
+    date = max(shard_date for _, _, shard_date, _ in shards)
+    output = directory / f"juco_recruiting_class_{years}_{date}.csv"
+    with open(output, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=CSV_HEADERS, extrasaction='ignore')
+        writer.writeheader()
+        writer.writerows(rows)
+    print(f"  {'✅' if not missing_shards else '❌'} Wrote {output.name}: {len(rows)} players")
+
+    if remove_shards:
+        for _, _, _, path in shards:
+            path.unlink()
+    return not missing_shards
+
+
+def main():
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    directory = Path(args[0]) if args else Path("output")
+    groups = find_shard_csvs(directory)
+
+    print(f"\n{'='*80}")
+    print(f"🧩 MERGING SHARDS in {directory}")
+    print(f"{'='*80}")
+    if not groups:
+        print("\nℹ️  No shard CSVs found, nothing to merge")
+        return
+    results = [merge_year(directory, years, shards, '--remove-shards' in sys.argv)
+               for years, shards in sorted(groups.items())]
+    print(f"\n{'='*80}")
+    print("✅ ALL SHARDS MERGED" if all(results) else "❌ SOME YEARS ARE MISSING SHARDS")
+    print(f"{'='*80}\n")
+    if not all(results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""
+Live progress of a shared work queue (QUEUE_DB): players done / leased / pending / failed per
+year and throughput per worker process. Read-only, safe to run while workers are scraping.
+
+Usage: python queue_status.py [QUEUE_DB] [--watch SECONDS]     (QUEUE_DB defaults to $QUEUE_DB)
+"""
+
+import sys
+import time
+from pathlib import Path
+
+from scraper import QUEUE_DB, LeaseQueue, print_queue_progress
+
+
+def main():
+    args = sys.argv[1:]
+    watch = None
+    if '--watch' in args:
+        index = args.index('--watch')
+        watch = float(args[index + 1]) if index + 1 < len(args) else 10.0
+        args = args[:index] + args[index + 2:]
+    path = args[0] if args else QUEUE_DB
+    if not path or not Path(path).exists():
+        print(__doc__)
+        sys.exit(1)
+
+    work_queue = LeaseQueue(path, worker='status')
+    try:
+        while True:
+            print_queue_progress(work_queue)
+            if watch is None or not work_queue.unfinished():
+                break
+            time.sleep(watch)
+    finally:
+        work_queue.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+Diffs two saved roster snapshots (output/rosters/roster_<year>_<timestamp>.json).
+
+Shows who was added to the class list, who dropped off and who moved, by list-page rank.
+
+Usage: python roster_diff.py YEAR              (newest two snapshots for that year)
+       python roster_diff.py OLD.json NEW.json
+"""
+
+import sys
+from pathlib import Path
+
+from scraper import diff_rosters, load_roster_snapshot, roster_snapshot_paths
+
+
+def resolve_paths(args: list) -> list:
+    if len(args) == 1 and args[0].isdigit():
+        paths = roster_snapshot_paths(int(args[0]))
+        if len(paths) < 2:
+            print(f"❌ Need at least two snapshots for {args[0]}, found {len(paths)}")
+            sys.exit(1)
+        return paths[-2:]
+    if len(args) == 2:
+        return [Path(arg) for arg in args]
+    print(__doc__)
+    sys.exit(1)
+
+
+def main():
+    old_path, new_path = resolve_paths(sys.argv[1:])
+    old, new = load_roster_snapshot(old_path), load_roster_snapshot(new_path)
+    if old is None or new is None:
+        sys.exit(1)
+    diff = diff_rosters(old, new)
+
+    print(f"\n{'='*80}")
+    print(f"🔀 ROSTER DIFF {old['year']}: {old['discovered_at']} ({len(old['players'])} players) → "
+          f"{new['discovered_at']} ({len(new['players'])} players)")
+    print(f"{'='*80}\n")
+
+    print(f"➕ Added ({len(diff['added'])}):")
+    for url, rank in diff['added']:
+        print(f"  #{rank:<4} {url}")
+    print(f"\n➖ Dropped ({len(diff['dropped'])}):")
+    for url, rank in diff['dropped']:
+        print(f"  #{rank:<4} {url}")
+    print(f"\n↕️  Moved ({len(diff['moved'])}):")
+    for url, old_rank, new_rank in sorted(diff['moved'], key=lambda move: move[2]):
+        print(f"  #{old_rank:<4} → #{new_rank:<4} ({old_rank - new_rank:+d}) {url}")
+    print()
+
+
+if __name__ == "__main__":
+    main()
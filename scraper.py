@@ -10,25 +10,195 @@ DEBUG FEATURES:
 
 import asyncio
 import csv
+import gzip
+import hashlib
+import heapq
+import json
+import multiprocessing
 import os
+import random
 import re
+import signal
+import socket
+import sqlite3
 import sys
+import time
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import asynccontextmanager, contextmanager
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
+from typing import Dict, List, Optional, TypedDict
+from urllib.parse import urlencode, parse_qsl, urlparse, urlunparse
+from bs4 import BeautifulSoup
 from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
 
 # =============================================================================
 # CONFIGURATION
 # =============================================================================
 
-YEARS = [int(os.getenv('SCRAPE_YEAR', '2024'))]
+def parse_years(spec: str) -> list:
+    """'2024', '2016-2022' or '2019,2021,2023-2025' → sorted list of years"""
+    years = set()
+    for part in filter(None, (part.strip() for part in spec.split(','))):
+        first, _, last = part.partition('-')
+        years.update(range(int(first), int(last or first) + 1))
+    return sorted(years)
+
+# SCRAPE_YEARS takes a list and/or ranges ('2016-2019,2021') and overrides SCRAPE_YEAR
+YEARS = parse_years(os.getenv('SCRAPE_YEARS') or os.getenv('SCRAPE_YEAR', '2024'))
 OUTPUT_DIR = Path("output")
 TEST_MODE = os.getenv('TEST_MODE', 'false').lower() == 'true'
-MAX_CONCURRENT = 4
-DEEP_TIMELINE_LIMIT = 1000
+MAX_CONCURRENT = int(os.getenv('MAX_CONCURRENT', '4'))
+
+# Timeline deep dive: every player's TimelineEvents list is walked, TIMELINE_PAGE_CONCURRENCY numbered pages
+# at a time, until a commitment inside the class window turns up or TIMELINE_BUDGET_S runs out for that
+# player (0 skips the deep dive). This replaces the old fixed cutoff of the top 1000 ranked players.
+TIMELINE_BUDGET_S = float(os.getenv('TIMELINE_BUDGET_S', '20'))
+TIMELINE_PAGE_CONCURRENCY = int(os.getenv('TIMELINE_PAGE_CONCURRENCY', '3'))
+TIMELINE_MAX_PAGES = 11
+
+# Run planner: with a RUN_BUDGET_MIN wall-clock budget (0 = none) each player's depth is picked from live
+# timings, 'full', 'no_deep' (no timeline deep dive) or 'juco_only' (no HS profile either), so every roster
+# player gets a row in time. No player starts in the last RUN_RESERVE_S; on SIGTERM/SIGINT players still
+# running get RUN_SIGNAL_GRACE_S before the journal is compacted and a resume manifest written
+RUN_BUDGET_MIN = float(os.getenv('RUN_BUDGET_MIN', '0'))
+RUN_RESERVE_S = float(os.getenv('RUN_RESERVE_S', '180'))
+RUN_SIGNAL_GRACE_S = float(os.getenv('RUN_SIGNAL_GRACE_S', '5'))
+
+# Adaptive concurrency (AIMD): MAX_CONCURRENT is the worker/page ceiling, the per-host request limit
+# starts at INITIAL_CONCURRENT, grows by one per clean window and halves on 429s, challenges or timeouts
+ADAPTIVE_CONCURRENCY = os.getenv('ADAPTIVE_CONCURRENCY', 'true').lower() == 'true'
+MIN_CONCURRENT = int(os.getenv('MIN_CONCURRENT', '1'))
+INITIAL_CONCURRENT = int(os.getenv('INITIAL_CONCURRENT', '2'))
+AIMD_DECREASE_FACTOR = float(os.getenv('AIMD_DECREASE_FACTOR', '0.5'))
+MIN_REQUEST_GAP_MS = int(os.getenv('MIN_REQUEST_GAP_MS', '250'))
+MAX_REQUEST_GAP_MS = int(os.getenv('MAX_REQUEST_GAP_MS', '10000'))
+SLOW_RESPONSE_MS = int(os.getenv('SLOW_RESPONSE_MS', '8000'))
+ERROR_RATE_LIMIT = float(os.getenv('ERROR_RATE_LIMIT', '0.2'))
+RATE_LIMIT_PAUSE_S = float(os.getenv('RATE_LIMIT_PAUSE_S', '10'))
+
+# Several years in one process: 'concurrent' discovers every year at once and feeds all their players
+# through one scheduler (no year holds more than YEAR_MAX_SHARE of the slots while others wait),
+# 'sequential' scrapes them one after another
+YEAR_SCHEDULER = os.getenv('YEAR_SCHEDULER', 'concurrent').lower()
+YEAR_MAX_SHARE = float(os.getenv('YEAR_MAX_SHARE', '0.5'))
+
+# Page pool: warm pages are reused across players and recycled after N uses
+POOL_CONTEXTS = int(os.getenv('POOL_CONTEXTS', '1'))
+PAGE_MAX_USES = int(os.getenv('PAGE_MAX_USES', '25'))
+
+# Per-player pipelining: once the JUCO profile's IDs are known, the timeline walk (on the player's tab)
+# and the HS profile (on a second tab, borrowed only if it needs the browser) load at the same time
+PARALLEL_BRANCHES = os.getenv('PARALLEL_BRANCHES', 'true').lower() == 'true'
+
+# Readiness waits: 'event' waits on the selector each step needs, 'fixed' restores the old sleeps
+WAIT_MODE = os.getenv('WAIT_MODE', 'event').lower()
+WAIT_TIMEOUT_MS = int(os.getenv('WAIT_TIMEOUT_MS', '5000'))
+WAIT_DEBUG = os.getenv('WAIT_DEBUG', 'false').lower() == 'true'
+
+# Request router: resource types and third-party hosts we never need for extraction
+BLOCK_RESOURCES = os.getenv('BLOCK_RESOURCES', 'true').lower() == 'true'
+BLOCKED_RESOURCE_TYPES = set(filter(None, os.getenv('BLOCKED_RESOURCE_TYPES', 'image,media,font').split(',')))
+ALLOWED_HOSTS = list(filter(None, os.getenv('ALLOWED_HOSTS', '247sports.com,cbsistatic.com').split(',')))
+
+# HTML parser backend for all extractors: 'selectolax' (fastest, falls back to lxml if missing), 'lxml' or 'html.parser'
+PARSER_BACKEND = os.getenv('PARSER_BACKEND', 'selectolax').lower()
+
+# Browser-rendered pages: 'html' serializes the DOM and parses it in Python, 'browser' runs one in-page
+# extraction script and ships only its JSON, 'compare' does both and checks them for parity
+EXTRACT_MODE = os.getenv('EXTRACT_MODE', 'html').lower()
+
+# Off-loop parsing: fetched HTML is parsed and extracted in PARSE_WORKERS processes (default one per core,
+# 0 parses on the event loop). The lag monitor wakes every LOOP_LAG_INTERVAL_MS (0 disables it) and
+# logs any stall longer than LOOP_LAG_WARN_MS
+PARSE_WORKERS = int(os.getenv('PARSE_WORKERS', str(os.cpu_count() or 1)))
+LOOP_LAG_INTERVAL_MS = int(os.getenv('LOOP_LAG_INTERVAL_MS', '100'))
+LOOP_LAG_WARN_MS = int(os.getenv('LOOP_LAG_WARN_MS', '250'))
+
+# Fetch engine: 'auto' tries plain HTTP first and falls back to the browser, 'http'/'browser' force one path
+FETCH_MODE = os.getenv('FETCH_MODE', 'auto').lower()
+HTTP_TIMEOUT_MS = int(os.getenv('HTTP_TIMEOUT_MS', '20000'))
+
+# Player discovery: 'pages' requests rankings pages by number (Load More clicks as fallback),
+# 'click' uses only the Load More loop, 'compare' runs both and reports the difference
+DISCOVERY_MODE = os.getenv('DISCOVERY_MODE', 'pages').lower()
+RANKINGS_PAGE_CONCURRENCY = int(os.getenv('RANKINGS_PAGE_CONCURRENCY', '4'))
+
+# Row source: 'full' opens every player's profiles, 'lite' builds each row from the rankings list alone (name,
+# position, size, hometown, JUCO, composite JUCO stars/rating/ranks) without opening a profile, 'hybrid' does
+# the same and then scrapes the profiles (HS ratings, timeline, IDs) of the HYBRID_TOP_N best-ranked players
+SCRAPE_MODE = os.getenv('SCRAPE_MODE', 'full').lower()
+HYBRID_TOP_N = int(os.getenv('HYBRID_TOP_N', '100'))
+
+# Page cache: 'on' reads and writes, 'replay' serves only from disk with zero network access, 'off' disables
+CACHE_MODE = os.getenv('CACHE_MODE', 'on').lower()
+CACHE_DIR = Path(os.getenv('CACHE_DIR', 'cache/pages'))
+CACHE_MAX_MB = int(os.getenv('CACHE_MAX_MB', '500'))
 
-# Resume capability
-START_FROM_PLAYER = int(os.getenv('START_FROM', '0'))
+# Player ID -> JUCO profile URL index kept across runs, so cover profiles are only resolved once ('' disables)
+PROFILE_INDEX_PATH = Path(os.getenv('PROFILE_INDEX', 'cache/profile_index.json')) if os.getenv('PROFILE_INDEX', 'x') else None
+CACHE_TTL_HOURS = {
+    'rankings': float(os.getenv('CACHE_TTL_RANKINGS_HOURS', '12')),
+    'profile': float(os.getenv('CACHE_TTL_PROFILE_HOURS', '24')),
+    'hs': float(os.getenv('CACHE_TTL_HS_HOURS', '168')),
+    'timeline': float(os.getenv('CACHE_TTL_TIMELINE_HOURS', '24')),
+}
+# Classes older than this many years almost never change, so their pages keep for much longer
+CACHE_HISTORICAL_AGE_YEARS = int(os.getenv('CACHE_HISTORICAL_AGE_YEARS', '3'))
+CACHE_HISTORICAL_TTL_HOURS = float(os.getenv('CACHE_HISTORICAL_TTL_HOURS', str(24 * 90)))
+
+# Parsed-result store: HS columns by HS ID and whole-player results (JUCO columns, timeline items) by
+# 247 Base ID, reused across players and classes. Entries from an earlier run are only reused for
+# RESULT_STORE_MAX_AGE_HOURS (and never on INCREMENTAL runs, which must see what changed since)
+RESULT_STORE_MODE = os.getenv('RESULT_STORE', 'on').lower()
+RESULT_STORE_DIR = Path(os.getenv('RESULT_STORE_DIR', 'cache/results'))
+RESULT_STORE_MAX_AGE_HOURS = float(os.getenv('RESULT_STORE_MAX_AGE_HOURS', '12'))
+
+# Resume capability: a number of roster players to skip, or the URL / slug of the player to resume at
+START_FROM = os.getenv('START_FROM', '0').strip()
+
+# Roster snapshots: each year's discovered class list is saved and reused while younger than the max age
+ROSTER_DIR = Path(os.getenv('ROSTER_DIR', 'output/rosters'))
+ROSTER_MAX_AGE_HOURS = float(os.getenv('ROSTER_MAX_AGE_HOURS', '24'))
+
+# Write-ahead journal: every finished player is fsynced (keyed by URL, per roster snapshot) and skipped
+# on restart; RETRY_FAILED=true scrapes only the URLs recorded as failed
+JOURNAL_DIR = Path(os.getenv('JOURNAL_DIR', 'output/journal'))
+JOURNAL_RESUME = os.getenv('JOURNAL_RESUME', 'true').lower() == 'true'
+RETRY_FAILED = os.getenv('RETRY_FAILED', 'false').lower() == 'true'
+
+# Retry queue: failed players are classified and retried after the rest of the roster, backing off from
+# RETRY_BACKOFF_S (doubling per attempt up to RETRY_BACKOFF_MAX_S, jittered) for up to RETRY_MAX_ATTEMPTS
+# attempts in all; only the RETRY_CATEGORIES failures are retried
+RETRY_MAX_ATTEMPTS = int(os.getenv('RETRY_MAX_ATTEMPTS', '3'))
+RETRY_BACKOFF_S = float(os.getenv('RETRY_BACKOFF_S', '15'))
+RETRY_BACKOFF_MAX_S = float(os.getenv('RETRY_BACKOFF_MAX_S', '300'))
+RETRY_CATEGORIES = set(filter(None, os.getenv(
+    'RETRY_CATEGORIES', 'navigation_timeout,rate_limit,missing_selector,http_error,parse_error,other').split(',')))
+
+# Incremental re-scrape: a per-year manifest keeps each player's row and section fingerprints; unchanged
+# sections are reused instead of re-parsed, and INCREMENTAL_FULL_CHECK also re-fetches HS pages to compare
+INCREMENTAL = os.getenv('INCREMENTAL', 'false').lower() == 'true'
+INCREMENTAL_FULL_CHECK = os.getenv('INCREMENTAL_FULL_CHECK', 'false').lower() == 'true'
+MANIFEST_DIR = Path(os.getenv('MANIFEST_DIR', 'output/manifests'))
+DELTA_DIR = Path(os.getenv('DELTA_DIR', 'output/deltas'))
+
+# Sharding: SHARD_COUNT jobs split one year's roster by a stable hash of each player URL (SHARD_INDEX is 0-based)
+SHARD_INDEX = int(os.getenv('SHARD_INDEX', '0'))
+SHARD_COUNT = int(os.getenv('SHARD_COUNT', '1'))
+
+# Shared work queue: QUEUE_DB points every scraper process at one SQLite lease queue. QUEUE_ROLE 'coordinator'
+# enqueues YEARS, reports progress and writes the CSVs once it drains, 'worker' only leases players, 'all' does both
+QUEUE_DB = os.getenv('QUEUE_DB', '').strip()
+QUEUE_ROLE = os.getenv('QUEUE_ROLE', 'all').lower()
+QUEUE_LEASE_S = float(os.getenv('QUEUE_LEASE_S', '180'))
+QUEUE_HEARTBEAT_S = float(os.getenv('QUEUE_HEARTBEAT_S', '30'))
+QUEUE_MAX_ATTEMPTS = int(os.getenv('QUEUE_MAX_ATTEMPTS', '3'))
+QUEUE_STATUS_INTERVAL_S = float(os.getenv('QUEUE_STATUS_INTERVAL_S', '60'))
+WORKER_ID = os.getenv('WORKER_ID', f"{socket.gethostname()}-{os.getpid()}")
 
 USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
 
@@ -60,6 +230,14 @@ def extract_player_id(url: str) -> str:
     match = re.search(r'/player/[^/]+-(\d+)/', url)
     return match.group(1) if match else "NA"
 
+def institution_profile_url(player_url: str, base_id: str, kind: str, institution_id: str) -> Optional[str]:
+    """Builds /player/<slug>-<base id>/<kind>-<id>/ (kind 'junior-college' or 'high-school') from IDs we already have"""
+    slug_match = re.search(r'/player/([^/]+)-\d+', player_url)
+    if not slug_match or base_id in (None, "NA") or institution_id in (None, "NA"):
+        return None
+    return f"https://247sports.com/player/{slug_match.group(1)}-{base_id}/{kind}-{institution_id}/"
+
+
 def clean_text(text: str) -> str:
     if not text: return "NA"
     # Replace non-breaking spaces and other whitespace
@@ -108,447 +286,326 @@ def append_to_csv(filename: Path, players: list):
         writer.writerows(players)
 
 # =============================================================================
-# LOAD MORE FUNCTIONALITY
+# HTML PARSING BACKENDS
 # =============================================================================
 
-async def click_load_more_until_complete(browser, year: int) -> list:
-    print(f"\n📋 Loading all JUCO players for {year}...")
-    context = await browser.new_context(user_agent=USER_AGENT)
-    page = await context.new_page()
-    
-    # Correct Modern URL for JUCO Rankings
-    url = f"https://247sports.com/Season/{year}-Football/CompositeRecruitRankings/?InstitutionGroup=JuniorCollege"
-    
-    try:
-        await page.goto(url, wait_until='domcontentloaded', timeout=60000)
-        try:
-            await page.wait_for_selector(".rankings-page__list-item", timeout=10000)
-        except Exception:
-            print("⚠️ Timeout waiting for list items to hydrate")
-    except Exception as e:
-        print(f"❌ Failed to load initial page for {year}: {e}")
-        await context.close()
-        return []
+class SoupNode:
+    """Backend-neutral element wrapper around a BeautifulSoup tag (html.parser or lxml tree builder)"""
 
-    selectors = ["li.rankings-page__list-item", "li.recruit", ".rankings-page__container ul > li"]
-    valid_selector = None
-    for selector in selectors:
-        count = await page.locator(selector).count()
-        if count > 0:
-            valid_selector = selector
-            print(f"  ✓ Found {count} players using selector: '{selector}'")
-            break
-            
-    if not valid_selector:
-        print(f"⚠️  No players found")
-        await context.close()
-        return []
+    __slots__ = ('_el',)
 
-    click_count = 0
-    max_clicks = 500 if not TEST_MODE else 3
-    
-    while click_count < max_clicks:
-        current_players = await page.locator(valid_selector).count()
-        load_more_button = page.locator('a.load-more, button.load-more, a.rankings-page__showmore, a:has-text("Load More")')
+    def __init__(self, el):
+        self._el = el
+
+    def select(self, css: str) -> list:
+        return [SoupNode(el) for el in self._el.select(css)]
+
+    def select_one(self, css: str):
+        el = self._el.select_one(css)
+        return SoupNode(el) if el is not None else None
+
+    def text(self, strip: bool = False) -> str:
+        return self._el.get_text(strip=strip)
+
+    def attr(self, name: str, default: str = '') -> str:
+        value = self._el.get(name)
+        return value if value is not None else default
+
+
+class LexborNode:
+    """Same interface on top of selectolax's lexbor engine"""
+
+    __slots__ = ('_node',)
+
+    def __init__(self, node):
+        self._node = node
+
+    def select(self, css: str) -> list:
+        # lexbor returns an element once per matching selector in a group; soupsieve returns it once
+        seen = set()
+        nodes = []
+        for node in self._node.css(css):
+            if node.mem_id not in seen:
+                seen.add(node.mem_id)
+                nodes.append(LexborNode(node))
+        return nodes
+
+    def select_one(self, css: str):
+        node = self._node.css_first(css)
+        return LexborNode(node) if node is not None else None
+
+    def text(self, strip: bool = False) -> str:
+        return self._node.text(deep=True, separator='', strip=strip)
+
+    def attr(self, name: str, default: str = '') -> str:
+        value = self._node.attributes.get(name)
+        return value if value is not None else default
+
+
+def _parse_selectolax(html: str):
+    from selectolax.lexbor import LexborHTMLParser
+    return LexborNode(LexborHTMLParser(html))
+
+
+PARSER_FALLBACK_WARNED = set()
+
+PARSER_BACKENDS = {
+    'html.parser': lambda html: SoupNode(BeautifulSoup(html, 'html.parser')),
+    'lxml': lambda html: SoupNode(BeautifulSoup(html, 'lxml')),
+    'selectolax': _parse_selectolax,
+}
+
+
+_available_backends = None
+
+
+def available_parser_backends() -> list:
+    """Backends usable in this environment; selectolax is optional"""
+    global _available_backends
+    if _available_backends is None:
+        _available_backends = ['html.parser', 'lxml']
         try:
-            if await load_more_button.count() > 0 and await load_more_button.first.is_visible():
-                print(f"  → Click #{click_count + 1}: {current_players} players loaded...")
-                await load_more_button.first.click()
-                await page.wait_for_timeout(1500)
-                click_count += 1
-            else:
-                print(f"  ✓ All players loaded!")
-                break
-        except Exception:
-            break
-    
-    print(f"\n🔗 Extracting player profile URLs...")
-    player_links = await page.locator(f'{valid_selector} a.rankings-page__name-link, {valid_selector} a.recruit').all()
-    if not player_links:
-         player_links = await page.locator(f'{valid_selector} a[href*="/player/"]').all()
+            import selectolax.lexbor  # noqa: F401
+            _available_backends.append('selectolax')
+        except ImportError:
+            pass
+    return _available_backends
+
+
+def parse_html(html: str, backend: str = None):
+    """Parses HTML into a document node for the requested (or configured) backend"""
+    backend = backend or PARSER_BACKEND
+    if backend not in available_parser_backends():
+        if backend not in PARSER_FALLBACK_WARNED:
+            PARSER_FALLBACK_WARNED.add(backend)
+            print(f"⚠️  Parser backend '{backend}' unavailable, falling back to lxml")
+        backend = 'lxml'
+    return PARSER_BACKENDS[backend](html)
+
+
+def as_document(doc_or_html):
+    return parse_html(doc_or_html) if isinstance(doc_or_html, str) else doc_or_html
+
+# =============================================================================
+# EXTRACTORS
+# =============================================================================
+# Pure functions: HTML (or an already parsed document) in, plain dicts out.
+
+class InstitutionIds(TypedDict):
+    base: Optional[str]
+    juco: Optional[str]
+    hs: Optional[str]
+    colleges: List[str]
+
+
+ProfileHeader = TypedDict('ProfileHeader', {
+    'Player Name': str, 'Position': str, 'Height': str, 'Weight': str,
+    'Junior College': str, 'City, ST': str, 'Class': str,
+}, total=False)
+
+HsHeader = TypedDict('HsHeader', {'High School': str, 'HS Class Year': str}, total=False)
+
+
+class TimelineItem(TypedDict):
+    text: str
+    priority: int
+    date: str
+    team: Optional[str]
+    draft_date: Optional[str]
+    draft_team: Optional[str]
+
 
+TIMELINE_ITEMS = '.timeline-item, .timeline li, ul.timeline > li, .vertical-timeline-element-content'
+JUCO_RANKINGS_MAP = {"COMPOSITE": "Composite JUCO", "247SPORTS": "247 JUCO"}
+HS_RANKINGS_MAP = {"COMPOSITE": "Composite HS", "247SPORTS": "247 HS"}
+
+
+ListRow = TypedDict('ListRow', {
+    'Profile URL': str, 'Player Name': str, 'Position': str, 'Height': str, 'Weight': str,
+    'Junior College': str, 'City, ST': str, 'Composite JUCO Stars': str, 'Composite JUCO Rating': str,
+    'Composite JUCO National Rank': str, 'Composite JUCO Position': str, 'Composite JUCO Position Rank': str,
+}, total=False)
+
+RANKINGS_LIST_ITEMS = ["li.rankings-page__list-item", "li.recruit", ".rankings-page__container ul > li"]
+# "Iowa Western CC (Council Bluffs, IA)"
+LIST_META_PATTERN = re.compile(r'^(.*?)\s*\(([^()]*)\)\s*$')
+
+
+def extract_player_urls(doc) -> list:
+    """Player profile URLs from a fully loaded rankings page, in list order"""
+    doc = as_document(doc)
+    links = []
+    for selector in RANKINGS_LIST_ITEMS:
+        links = doc.select(f'{selector} a.rankings-page__name-link, {selector} a.recruit') or doc.select(f'{selector} a[href*="/player/"]')
+        if links:
+            break
     player_urls = []
-    for link in player_links:
-        href = await link.get_attribute('href')
+    for link in links:
+        href = link.attr('href')
         if href and '/player/' in href:
             if href.startswith('/'): href = f"https://247sports.com{href}"
             player_urls.append(href)
-    
-    player_urls = list(dict.fromkeys(player_urls))
-    print(f"  ✓ Found {len(player_urls)} player profiles")
-    
-    if TEST_MODE and len(player_urls) > 50:
-        player_urls = player_urls[:50]
-        print(f"  ℹ️  TEST MODE: Limited to 50 players")
-    
-    await context.close()
-    return player_urls
-
-# =============================================================================
-# PROFILE PARSING
-# =============================================================================
+    return list(dict.fromkeys(player_urls))
 
-async def navigate_to_recruiting_profile(page) -> bool:
-    """Ensures we are on the 'Recruiting' tab of the profile"""
-    try:
-        recruiting_link = page.locator('a:has-text("View recruiting profile"), a:has-text("Recruiting Profile")')
-        if await recruiting_link.count() > 0:
-            await recruiting_link.first.click()
-            await page.wait_for_load_state('domcontentloaded', timeout=30000)
-            await page.wait_for_timeout(1000)
-            return True
-        return False
-    except:
-        return False
 
-async def find_most_recent_hs_profile(page) -> tuple:
-    """
-    ENHANCED: JavaScript-based dropdown with FORCED visibility.
-    Returns (hs_url, hs_name, hs_id)
-    """
-    try:
-        print(f"      🔍 DEBUG: Starting HS profile search (ENHANCED)...")
-        
-        await page.wait_for_timeout(2000)
-        
-        # STEP 1: Try to click button first
-        print(f"      → DEBUG: Attempting JavaScript click...")
-        clicked = await page.evaluate('''() => {
-            const button = document.querySelector('button[data-js="institution-selector"]');
-            if (button) {
-                button.click();
-                return true;
-            }
-            return false;
-        }''')
-        
-        if clicked:
-            print(f"      ✓ DEBUG: Button clicked!")
-            await page.wait_for_timeout(1500)
-        else:
-            print(f"      ⚠️  DEBUG: Button not found, trying to force visibility...")
-        
-        # STEP 2: FORCE the dropdown to be visible
-        print(f"      → DEBUG: Forcing dropdown visibility with JavaScript...")
-        forced = await page.evaluate('''() => {
-            const list = document.querySelector('ul.institution-list');
-            if (list) {
-                list.classList.remove('hidden');
-                list.style.display = 'block';
-                list.style.visibility = 'visible';
-                list.style.opacity = '1';
-                return true;
-            }
-            return false;
-        }''')
-        
-        if forced:
-            print(f"      ✓ DEBUG: Dropdown forced visible!")
-            await page.wait_for_timeout(500)
-        else:
-            print(f"      ⚠️  DEBUG: Could not find institution-list")
-        
-        # STEP 3: Now parse the HTML
-        html = await page.content()
-        from bs4 import BeautifulSoup
-        soup = BeautifulSoup(html, 'html.parser')
-        
-        # Try multiple selectors
-        selectors = [
-            'ul.institution-list a',
-            '.institution-list a',
-            'div.institution-block ul a',
-            'a[href*="/high-school-"]'
-        ]
-        
-        institution_links = []
-        for selector in selectors:
-            institution_links = soup.select(selector)
-            if institution_links:
-                print(f"      ✓ DEBUG: Found {len(institution_links)} links with selector: {selector}")
-                break
-        
-        # Print all links
-        for idx, link in enumerate(institution_links):
-            link_text = link.get_text(strip=True)
-            href = link.get('href', '')
-            print(f"      → DEBUG: Link #{idx+1}: '{link_text}' → {href[:60] if href else 'NO HREF'}")
-        
-        # Find (HS) link and extract HS ID
-        for link in institution_links:
-            link_text = link.get_text(strip=True)
-            
-            if '(HS)' in link_text:
-                hs_url = link.get('href', '')
-                if not hs_url:
-                    continue
-                    
-                if hs_url.startswith('/'):
-                    hs_url = f"https://247sports.com{hs_url}"
-                    
-                hs_name = link_text.replace('(HS)', '').strip()
-                
-                # EXTRACT HS ID from URL
-                hs_id = None
-                hs_id_match = re.search(r'/high-school-(\d+)', hs_url)
-                if hs_id_match:
-                    hs_id = hs_id_match.group(1)
-                
-                print(f"      ✅ DEBUG: Found HS profile!")
-                print(f"         Name: {hs_name}")
-                print(f"         URL: {hs_url}")
-                print(f"         HS ID: {hs_id}")
-                
-                return (hs_url, hs_name, hs_id)
-        
-        print(f"      ⚠️  DEBUG: No (HS) link found")
-        return (None, None, None)
-        
-    except Exception as e:
-        print(f"      ❌ DEBUG: Exception: {e}")
-        import traceback
-        traceback.print_exc()
-        return (None, None, None)
+def extract_list_rows(doc) -> List[ListRow]:
+    """Every CSV column the rankings list shows for each player, in list order; items without a profile link are skipped"""
+    doc = as_document(doc)
+    items = []
+    for selector in RANKINGS_LIST_ITEMS:
+        items = doc.select(selector)
+        if items:
+            break
+    rows = {}
+    for item in items:
+        link = item.select_one('a.rankings-page__name-link, a.recruit') or item.select_one('a[href*="/player/"]')
+        href = link.attr('href') if link else ''
+        if '/player/' not in href:
+            continue
+        if href.startswith('/'): href = f"https://247sports.com{href}"
+        fields = {'Profile URL': href, 'Player Name': clean_text(link.text())}
+        meta = item.select_one('.recruit .meta, .meta')
+        if meta:
+            text = clean_text(meta.text())
+            match = LIST_META_PATTERN.match(text)
+            fields['Junior College'] = clean_text(match.group(1)) if match else text
+            if match: fields['City, ST'] = clean_text(match.group(2))
+        position = item.select_one('.position')
+        if position: fields['Position'] = clean_text(position.text())
+        metrics = item.select_one('.metrics')
+        if metrics and '/' in metrics.text():
+            height, _, weight = metrics.text().partition('/')
+            fields['Height'] = normalize_height(height)
+            fields['Weight'] = clean_text(weight)
+        stars = item.select('span.icon-starsolid.yellow, i.icon-starsolid.yellow')
+        if stars: fields['Composite JUCO Stars'] = str(min(len(stars), 5))
+        score = item.select_one('.score')
+        if score:
+            rating_match = re.search(r'(\d+(?:\.\d+)?)', clean_text(score.text()))
+            if rating_match: fields['Composite JUCO Rating'] = rating_match.group(1)
+        national = item.select_one('.natrank')
+        if national: fields['Composite JUCO National Rank'] = parse_rank(national.text())
+        position_rank = item.select_one('.posrank')
+        if position_rank:
+            fields['Composite JUCO Position Rank'] = parse_rank(position_rank.text())
+            if 'Position' in fields: fields['Composite JUCO Position'] = fields['Position']
+        # The status column's logo is a commitment, not a signing: Signed Team comes from the timeline only
+        rows.setdefault(href, {key: value for key, value in fields.items() if value not in ("NA", "")})
+    return list(rows.values())
 
 
-async def extract_all_institution_ids(page) -> dict:
+def extract_all_institution_ids(doc, current_url: str) -> InstitutionIds:
     """
     Extract all 247 IDs for a player across all institutions.
     Returns dict with keys: 'base', 'juco', 'hs', 'colleges'
     """
-    try:
-        print(f"      → DEBUG: Extracting all institution IDs...")
-        
-        # Force dropdown visible
-        await page.evaluate('''() => {
-            const list = document.querySelector('ul.institution-list');
-            if (list) {
-                list.classList.remove('hidden');
-                list.style.display = 'block';
-                list.style.visibility = 'visible';
-            }
-        }''')
-        
-        await page.wait_for_timeout(500)
-        
-        html = await page.content()
-        from bs4 import BeautifulSoup
-        soup = BeautifulSoup(html, 'html.parser')
-        
-        ids = {
-            'base': None,
-            'juco': None,
-            'hs': None,
-            'colleges': []
-        }
-        
-        # Get base ID from current URL
-        current_url = page.url
-        base_match = re.search(r'/player/[^/]+-(\d+)', current_url)
-        if base_match:
-            ids['base'] = base_match.group(1)
-        
-        # Parse all institution links
-        all_links = soup.select('a[href*="/player/"]')
+    doc = as_document(doc)
+    ids = {'base': None, 'juco': None, 'hs': None, 'colleges': []}
+    
+    # Get base ID from current URL
+    base_match = re.search(r'/player/[^/]+-(\d+)', current_url)
+    if base_match:
+        ids['base'] = base_match.group(1)
+    
+    # Parse all institution links
+    for link in doc.select('a[href*="/player/"]'):
+        href = link.attr('href')
         
-        for link in all_links:
-            href = link.get('href', '')
-            text = link.get_text(strip=True)
-            
-            # JUCO ID
-            if '/junior-college-' in href:
-                juco_match = re.search(r'/junior-college-(\d+)', href)
-                if juco_match and not ids['juco']:
-                    ids['juco'] = juco_match.group(1)
-                    print(f"      → Found JUCO ID: {ids['juco']}")
-            
-            # HS ID
-            elif '/high-school-' in href:
-                hs_match = re.search(r'/high-school-(\d+)', href)
-                if hs_match and not ids['hs']:
-                    ids['hs'] = hs_match.group(1)
-                    print(f"      → Found HS ID: {ids['hs']}")
-            
-            # College IDs (can be multiple)
-            elif '/college-' in href and '(NCAA)' in text:
-                college_match = re.search(r'/college-(\d+)', href)
-                if college_match:
-                    college_id = college_match.group(1)
-                    if college_id not in ids['colleges']:
-                        ids['colleges'].append(college_id)
-                        print(f"      → Found College ID: {college_id} ({text})")
+        # JUCO ID
+        if '/junior-college-' in href:
+            juco_match = re.search(r'/junior-college-(\d+)', href)
+            if juco_match and not ids['juco']:
+                ids['juco'] = juco_match.group(1)
         
-        print(f"      ✓ DEBUG: IDs extracted - Base: {ids['base']}, JUCO: {ids['juco']}, HS: {ids['hs']}, Colleges: {len(ids['colleges'])}")
-        return ids
+        # HS ID
+        elif '/high-school-' in href:
+            hs_match = re.search(r'/high-school-(\d+)', href)
+            if hs_match and not ids['hs']:
+                ids['hs'] = hs_match.group(1)
         
-    except Exception as e:
-        print(f"      ⚠️  DEBUG: Error extracting IDs: {e}")
-        return {'base': None, 'juco': None, 'hs': None, 'colleges': []}
+        # College IDs (can be multiple)
+        elif '/college-' in href and '(NCAA)' in link.text(strip=True):
+            college_match = re.search(r'/college-(\d+)', href)
+            if college_match and college_match.group(1) not in ids['colleges']:
+                ids['colleges'].append(college_match.group(1))
+    
+    return ids
 
 
-async def navigate_to_juco_profile_from_cover(page) -> bool:
-    """
-    For cover profiles (2022 and earlier), click the JUCO link using JavaScript.
-    Returns True if successfully navigated, False otherwise.
-    """
-    try:
-        print(f"      → DEBUG: Checking if this is a cover profile...")
-        
-        # Wait for page to render
-        await page.wait_for_timeout(2000)
-        
-        # Try to click JUCO dropdown using JavaScript with valid selector
-        print(f"      → DEBUG: Attempting to click JUCO dropdown with JavaScript...")
-        try:
-            clicked = await page.evaluate('''() => {
-                // Find any element (a or button) that contains "JUCO" text
-                const elements = Array.from(document.querySelectorAll('a, button, div'));
-                const jucoButton = elements.find(el => {
-                    const text = el.textContent || '';
-                    return text.includes('JUCO') && !text.includes('(JUCO)');
-                });
-                if (jucoButton) {
-                    jucoButton.click();
-                    return true;
-                }
-                return false;
-            }''')
-            
-            if clicked:
-                print(f"      ✓ DEBUG: Clicked JUCO button, waiting for dropdown...")
-                await page.wait_for_timeout(1500)
-            else:
-                print(f"      → DEBUG: No JUCO button found (might already be on JUCO profile)")
-                
-        except Exception as e:
-            print(f"      → DEBUG: JUCO button click attempt: {e}")
-        
-        # Now look for JUCO profile link in the dropdown
-        html = await page.content()
-        from bs4 import BeautifulSoup
-        soup = BeautifulSoup(html, 'html.parser')
-        
-        # Look for links containing (JUCO) and /junior-college-
-        all_links = soup.select('a')
-        for link in all_links:
-            link_text = link.get_text(strip=True)
-            href = link.get('href', '')
-            
-            if '(JUCO)' in link_text and '/junior-college-' in href:
-                juco_url = href
-                if juco_url.startswith('/'):
-                    juco_url = f"https://247sports.com{juco_url}"
-                
-                print(f"      ✓ DEBUG: Found JUCO profile link: {link_text}")
-                print(f"      → DEBUG: Navigating to: {juco_url[:70]}...")
-                
-                await page.goto(juco_url, wait_until='domcontentloaded', timeout=30000)
-                await page.wait_for_timeout(2000)
-                print(f"      ✓ DEBUG: Successfully loaded JUCO recruiting profile")
-                return True
-        
-        print(f"      → DEBUG: No JUCO profile link found (might already be on correct profile)")
-        return True
-        
-    except Exception as e:
-        print(f"      ⚠️  DEBUG: Error in navigate_to_juco_profile_from_cover: {e}")
-        return True  # Continue anyway
+def find_juco_profile_link(doc):
+    """Returns the absolute URL of the '(JUCO)' institution profile, if the page links to one"""
+    for link in as_document(doc).select('a'):
+        href = link.attr('href')
+        if '(JUCO)' in link.text(strip=True) and '/junior-college-' in href:
+            return f"https://247sports.com{href}" if href.startswith('/') else href
+    return None
+
+
+def _vitals_items(doc) -> list:
+    return doc.select('.metrics-list li') + doc.select('.details li') + doc.select('ul.vitals li')
+
+
+def extract_profile_header(doc) -> ProfileHeader:
+    """Player name and the vitals list (position, height, weight, JUCO, hometown, class)"""
+    doc = as_document(doc)
+    fields = {}
+    name_elem = doc.select_one('.name') or doc.select_one('h1.name')
+    if name_elem: fields['Player Name'] = clean_text(name_elem.text())
+    
+    for item in _vitals_items(doc):
+        text = item.text(strip=True)
+        if 'Pos' in text or 'Position' in text:
+            match = re.search(r'(?:Pos|Position)[:\s]*(.*)', text, re.IGNORECASE)
+            if match: fields['Position'] = clean_text(match.group(1))
+        elif 'Height' in text:
+            match = re.search(r'Height[:\s]*(.*)', text, re.IGNORECASE)
+            if match: fields['Height'] = normalize_height(match.group(1))
+        elif 'Weight' in text:
+            match = re.search(r'Weight[:\s]*(.*)', text, re.IGNORECASE)
+            if match: fields['Weight'] = clean_text(match.group(1))
+        elif 'Junior College' in text:
+            match = re.search(r'Junior College[:\s]*(.*)', text, re.IGNORECASE)
+            if match: fields['Junior College'] = clean_text(match.group(1))
+        elif 'Home Town' in text or 'Hometown' in text or 'City' in text:
+            match = re.search(r'(?:Home Town|Hometown|City)[:\s]*(.*)', text, re.IGNORECASE)
+            if match: fields['City, ST'] = clean_text(match.group(1))
+        elif 'Class' in text:
+            match = re.search(r'Class[:\s]*(.*)', text, re.IGNORECASE)
+            if match: fields['Class'] = clean_text(match.group(1))
+    return fields
+
+
+def extract_hs_header(doc) -> HsHeader:
+    """High school name and class year from an HS profile"""
+    doc = as_document(doc)
+    fields = {}
+    hs_institution = doc.select_one('.institution, .team-name, h2.institution')
+    if hs_institution:
+        fields['High School'] = clean_text(hs_institution.text())
+    for item in _vitals_items(doc):
+        text = item.text(strip=True)
+        if 'Class' in text:
+            match = re.search(r'Class[:\s]*(.*)', text, re.IGNORECASE)
+            if match: fields['HS Class Year'] = clean_text(match.group(1))
+    return fields
 
-async def parse_timeline(page, data, year, do_deep_dive: bool):
-    try:
-        html = await page.content()
-        from bs4 import BeautifulSoup
-        soup = BeautifulSoup(html, 'html.parser')
-        
-        items = soup.select('.timeline-item, .timeline li, ul.timeline > li, .vertical-timeline-element-content')
-        for item in items:
-            item_text = clean_text(item.get_text())
-            if 'draft' in item_text.lower():
-                date_match = re.search(r'([A-Z][a-z]+\s+\d{1,2},\s+\d{4}|\d{1,2}/\d{1,2}/\d{4})', item_text)
-                if date_match and data['Draft Date'] == "NA":
-                     data['Draft Date'] = normalize_date(date_match.group(1))
-                team_match = re.search(r'(?:Draft[:\s]+)?([A-Z][A-Za-z0-9\s\.]+?)\s+(?:select|pick)', item_text, re.IGNORECASE)
-                if team_match and data['Draft Team'] == "NA":
-                    team_name = clean_text(team_match.group(1))
-                    team_name = re.sub(r'^Draft\s*', '', team_name, flags=re.IGNORECASE).strip()
-                    if team_name and team_name.lower() not in ['draft']:
-                        data['Draft Team'] = team_name
-            
-            item_priority = 0
-            if 'commitment' in item_text.lower() or 'committed' in item_text.lower() or 'commits to' in item_text.lower():
-                 item_priority = 100
-            elif 'signed' in item_text.lower() or 'signing' in item_text.lower():
-                 item_priority = 1
-            
-            if item_priority > 0:
-                date_match = re.search(r'([A-Z][a-z]+\s+\d{1,2},\s+\d{4}|\d{1,2}/\d{1,2}/\d{4})', item_text)
-                found_date = normalize_date(date_match.group(1)) if date_match else "NA"
-                if found_date != "NA" and is_date_valid_for_class(found_date, year):
-                    current_priority = data.get('_date_priority', -1)
-                    if item_priority > current_priority:
-                        data['Signed Date'] = found_date
-                        data['_date_priority'] = item_priority
-                        team_match = re.search(r'(?:to|with|at|commits to)\s+([A-Z][^,.]+)', item_text)
-                        if team_match:
-                            data['Signed Team'] = clean_text(team_match.group(1))
-        
-        if do_deep_dive:
-            await page.evaluate('window.scrollTo(0, document.body.scrollHeight)')
-            await page.wait_for_timeout(1500)
-            see_all_link = page.locator('a[href*="TimelineEvents"]')
-            if await see_all_link.count() > 0:
-                href = await see_all_link.first.get_attribute('href')
-                if href:
-                    full_timeline_url = f"https://247sports.com{href}" if href.startswith('/') else href
-                    try:
-                        await page.goto(full_timeline_url, wait_until='domcontentloaded', timeout=15000)
-                        page_count = 0
-                        while page_count < 10:
-                            html = await page.content()
-                            soup = BeautifulSoup(html, 'html.parser')
-                            full_items = soup.select('ul.timeline-event-index_lst li')
-                            for item in full_items:
-                                item_text = clean_text(item.get_text())
-                                item_priority = 0
-                                if 'commitment' in item_text.lower() or 'committed' in item_text.lower() or 'commits to' in item_text.lower():
-                                     item_priority = 100
-                                elif 'signed' in item_text.lower() or 'signing' in item_text.lower():
-                                     item_priority = 1
-                                if item_priority > 0:
-                                    date_match = re.search(r'([A-Z][a-z]+\s+\d{1,2},\s+\d{4}|\d{1,2}/\d{1,2}/\d{4})', item_text)
-                                    found_date = normalize_date(date_match.group(1)) if date_match else "NA"
-                                    if found_date != "NA" and is_date_valid_for_class(found_date, year):
-                                        current_priority = data.get('_date_priority', -1)
-                                        if item_priority > current_priority:
-                                            data['Signed Date'] = found_date
-                                            data['_date_priority'] = item_priority
-                                            team_match = re.search(r'(?:to|with|at|commits to)\s+([A-Z][^,.]+)', item_text)
-                                            if team_match:
-                                                data['Signed Team'] = clean_text(team_match.group(1))
-                                            if item_priority == 100: return
-                            next_button = page.locator('li.next_itm a')
-                            if await next_button.count() > 0 and await next_button.is_visible():
-                                await next_button.click()
-                                await page.wait_for_timeout(1000)
-                                page_count += 1
-                            else: break
-                    except Exception: pass
-    except Exception: pass
 
 # --- FIXED RANKING PARSER ---
-def parse_rankings_section_robust(soup, data, prefix_map, institution_check=None):
+def extract_rankings(doc, prefix_map: dict, institution_check: str = None) -> Dict[str, str]:
     """
     Robust ranking parser that handles the 247Sports Composite headers
     and extracts ranks even if specific tags (like <strong>) are missing.
+    Returns CSV fields named '<prefix> Stars', '<prefix> Rating', etc.
     """
-    ranking_sections = soup.select('section.rankings, section.rankings-section, div.ranking-section')
+    doc = as_document(doc)
+    fields = {}
     
-    for section in ranking_sections:
+    for section in doc.select('section.rankings, section.rankings-section, div.ranking-section'):
         header = section.select_one('.rankings-header h3, h3.title, h3')
         if not header: continue
         
         # Upper case and clean to handle "®" or other symbols
-        header_text = clean_text(header.get_text()).upper()
+        header_text = clean_text(header.text()).upper()
         
         prefix = None
         # Robust Header Matching
@@ -561,14 +618,13 @@ def parse_rankings_section_robust(soup, data, prefix_map, institution_check=None
         
         # Stars
         stars = section.select('span.icon-starsolid.yellow, i.icon-starsolid.yellow')
-        if stars: data[f'{prefix} Stars'] = str(min(len(stars), 5))
+        if stars: fields[f'{prefix} Stars'] = str(min(len(stars), 5))
         
         # Rating
         rating_elem = section.select_one('.rank-block, .score, .rating')
         if rating_elem:
-            rating_text = clean_text(rating_elem.get_text())
-            rating_match = re.search(r'(\d+(?:\.\d+)?)', rating_text)
-            if rating_match: data[f'{prefix} Rating'] = rating_match.group(1)
+            rating_match = re.search(r'(\d+(?:\.\d+)?)', clean_text(rating_elem.text()))
+            if rating_match: fields[f'{prefix} Rating'] = rating_match.group(1)
 
         # Ranks
         ranks_list = section.select_one('ul.ranks-list')
@@ -578,18 +634,17 @@ def parse_rankings_section_robust(soup, data, prefix_map, institution_check=None
                 link_tag = li.select_one('a')
                 
                 if link_tag:
-                    href = link_tag.get('href', '')
+                    href = link_tag.attr('href')
                     
                     # EXTRACT RANK TEXT ROBUSTLY (Try <strong>, then fallback to <a> text)
                     rank_node = link_tag.select_one('strong')
-                    rank_text_raw = rank_node.get_text() if rank_node else link_tag.get_text()
-                    rank_val = parse_rank(rank_text_raw)
+                    rank_val = parse_rank(rank_node.text() if rank_node else link_tag.text())
 
                     # Position Rank
                     if 'Position=' in href:
                         if pos_node: 
-                            data[f'{prefix} Position'] = clean_text(pos_node.get_text())
-                        data[f'{prefix} Position Rank'] = rank_val
+                            fields[f'{prefix} Position'] = clean_text(pos_node.text())
+                        fields[f'{prefix} Position Rank'] = rank_val
                     
                     # Skip State Ranks
                     elif 'State=' in href or 'state=' in href:
@@ -597,239 +652,4015 @@ def parse_rankings_section_robust(soup, data, prefix_map, institution_check=None
                     
                     # National Rank (Checks InstitutionGroup if provided)
                     elif institution_check and f'InstitutionGroup={institution_check}' in href:
-                         data[f'{prefix} National Rank'] = rank_val
+                         fields[f'{prefix} National Rank'] = rank_val
+    return fields
 
-async def parse_profile(page, url: str, year: int, player_num: int, total: int) -> dict:
-    data = {header: "NA" for header in CSV_HEADERS}
-    data['Profile URL'] = url
-    data['Recruiting Year'] = str(year)
-    data['Scrape Date'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-    data['Data Source'] = '247Sports JUCO'
-    data['_date_priority'] = -1
-    
-    try:
-        # --- 1. LOAD INITIAL PROFILE PAGE ---
-        await page.goto(url, wait_until='domcontentloaded', timeout=30000)
-        await page.wait_for_timeout(2000)
-        
-        # --- 2. CHECK FOR COVER PROFILE (2022 and earlier) ---
-        # Navigate to JUCO-specific profile if needed
-        await navigate_to_juco_profile_from_cover(page)
-        
-        # --- 2.5 EXTRACT ALL INSTITUTION IDs ---
+
+def parse_rankings_section_robust(doc, data, prefix_map, institution_check=None):
+    data.update(extract_rankings(doc, prefix_map, institution_check))
+
+
+# Timeline event classifier: patterns compiled once, shared by the profile timeline and the TimelineEvents pages
+TIMELINE_DATE_PATTERN = re.compile(r'([A-Z][a-z]+\s+\d{1,2},\s+\d{4}|\d{1,2}/\d{1,2}/\d{4})')
+DRAFT_TEAM_PATTERN = re.compile(r'(?:Draft[:\s]+)?([A-Z][A-Za-z0-9\s\.]+?)\s+(?:select|pick)', re.IGNORECASE)
+DRAFT_PREFIX_PATTERN = re.compile(r'^Draft\s*', re.IGNORECASE)
+SIGNING_TEAM_PATTERN = re.compile(r'(?:to|with|at|commits to)\s+([A-Z][^,.]+)')
+COMMITMENT_KEYWORDS = ('commitment', 'committed', 'commits to')
+SIGNING_KEYWORDS = ('signed', 'signing')
+
+
+@lru_cache(maxsize=4096)
+def classify_timeline_item(item_text: str) -> TimelineItem:
+    """
+    Scores one timeline entry: commitments beat signings; drafts carry their own date/team.
+    Cached by text, because the profile timeline repeats the TimelineEvents entries: treat the result as read-only.
+    """
+    lowered = item_text.lower()
+    item = {'text': item_text, 'priority': 0, 'date': "NA", 'team': None, 'draft_date': None, 'draft_team': None}
+    
+    if 'draft' in lowered:
+        date_match = TIMELINE_DATE_PATTERN.search(item_text)
+        if date_match:
+            item['draft_date'] = normalize_date(date_match.group(1))
+        team_match = DRAFT_TEAM_PATTERN.search(item_text)
+        if team_match:
+            team_name = DRAFT_PREFIX_PATTERN.sub('', clean_text(team_match.group(1))).strip()
+            if team_name and team_name.lower() not in ['draft']:
+                item['draft_team'] = team_name
+    
+    if any(keyword in lowered for keyword in COMMITMENT_KEYWORDS):
+        item['priority'] = 100
+    elif any(keyword in lowered for keyword in SIGNING_KEYWORDS):
+        item['priority'] = 1
+    
+    if item['priority'] > 0:
+        date_match = TIMELINE_DATE_PATTERN.search(item_text)
+        item['date'] = normalize_date(date_match.group(1)) if date_match else "NA"
+        team_match = SIGNING_TEAM_PATTERN.search(item_text)
+        if team_match:
+            item['team'] = clean_text(team_match.group(1))
+    return item
+
+
+def extract_timeline_items(doc, selector: str = TIMELINE_ITEMS) -> List[TimelineItem]:
+    return [classify_timeline_item(clean_text(node.text())) for node in as_document(doc).select(selector)]
+
+
+def apply_timeline_item(data: dict, item: TimelineItem, year: int, include_draft: bool = True) -> bool:
+    """Merges one classified item into the row; returns True if it became the signing date"""
+    if include_draft:
+        if item['draft_date'] and data['Draft Date'] == "NA":
+            data['Draft Date'] = item['draft_date']
+        if item['draft_team'] and data['Draft Team'] == "NA":
+            data['Draft Team'] = item['draft_team']
+    if item['priority'] > 0 and item['date'] != "NA" and is_date_valid_for_class(item['date'], year):
+        if item['priority'] > data.get('_date_priority', -1):
+            data['Signed Date'] = item['date']
+            data['_date_priority'] = item['priority']
+            if item['team']:
+                data['Signed Team'] = item['team']
+            return True
+    return False
+
+
+def extract_link_href(doc, selector: str) -> Optional[str]:
+    """Raw href of the first link matching selector ('' if it has none), or None when there is no link"""
+    link = as_document(doc).select_one(selector)
+    return link.attr('href') if link else None
+
+
+def extract_commit_banner_team(doc) -> Optional[str]:
+    """Fallback signed team from the commitment banner"""
+    commit_banner = as_document(doc).select_one('.commit-banner, .commitment')
+    if commit_banner:
+        team_elem = commit_banner.select_one('span, a')
+        if team_elem:
+            team_text = clean_text(team_elem.text())
+            if team_text.lower() not in ['committed', 'commitment', 'signed']:
+                return team_text
+    return None
+
+# =============================================================================
+# REQUEST ROUTING
+# =============================================================================
+
+class TrafficStats:
+    """Per-run request counts and bytes transferred, grouped by resource type"""
+
+    def __init__(self):
+        self.types = {}
+
+    def _entry(self, resource_type: str) -> dict:
+        return self.types.setdefault(resource_type, {'requests': 0, 'blocked': 0, 'failed': 0, 'bytes': 0})
+
+    def record(self, resource_type: str, size: int):
+        entry = self._entry(resource_type)
+        entry['requests'] += 1
+        entry['bytes'] += max(size, 0)
+
+    def record_blocked(self, resource_type: str):
+        self._entry(resource_type)['blocked'] += 1
+
+    def record_failed(self, resource_type: str):
+        self._entry(resource_type)['failed'] += 1
+
+    def report(self):
+        if not self.types:
+            return
+        print(f"\n📡 Network traffic (blocking {'on' if BLOCK_RESOURCES else 'off'}):")
+        for resource_type, entry in sorted(self.types.items(), key=lambda kv: -kv[1]['bytes']):
+            print(f"    → {resource_type}: {entry['requests']} requests, {entry['bytes'] / 1024 / 1024:.2f} MB, "
+                  f"{entry['blocked']} blocked, {entry['failed']} failed")
+        total_bytes = sum(e['bytes'] for e in self.types.values())
+        total_requests = sum(e['requests'] for e in self.types.values())
+        total_blocked = sum(e['blocked'] for e in self.types.values())
+        print(f"    → Total: {total_requests} requests, {total_bytes / 1024 / 1024:.2f} MB, {total_blocked} blocked")
+
+
+TRAFFIC_STATS = TrafficStats()
+
+
+def is_allowed_host(url: str) -> bool:
+    host = urlparse(url).hostname
+    if not host:
+        return True
+    return any(host == allowed or host.endswith('.' + allowed) for allowed in ALLOWED_HOSTS)
+
+
+def should_block_request(resource_type: str, url: str) -> bool:
+    """Blocks heavy resource types everywhere and anything served from a non-allowlisted host"""
+    if resource_type in BLOCKED_RESOURCE_TYPES:
+        return True
+    return not is_allowed_host(url)
+
+
+async def route_request(route):
+    request = route.request
+    if should_block_request(request.resource_type, request.url):
+        TRAFFIC_STATS.record_blocked(request.resource_type)
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+async def record_finished_request(request):
+    try:
+        sizes = await request.sizes()
+        size = sizes['responseBodySize'] + sizes['responseHeadersSize']
+    except Exception:
+        size = 0
+    TRAFFIC_STATS.record(request.resource_type, size)
+
+
+def record_failed_request(request):
+    # Requests we aborted ourselves are already counted as blocked
+    if BLOCK_RESOURCES and should_block_request(request.resource_type, request.url):
+        return
+    TRAFFIC_STATS.record_failed(request.resource_type)
+
+
+# Bumps window.__scraperDomVersion on every DOM mutation so cached snapshots know when they are stale
+DOM_VERSION_SCRIPT = '''(() => {
+    window.__scraperDomVersion = 0;
+    new MutationObserver(() => { window.__scraperDomVersion++; })
+        .observe(document, {subtree: true, childList: true, attributes: true, characterData: true});
+})();'''
+
+
+async def new_scraper_context(browser):
+    """Creates a browser context with our user agent, request router, traffic accounting and DOM versioning"""
+    context = await browser.new_context(user_agent=USER_AGENT)
+    await context.add_init_script(DOM_VERSION_SCRIPT)
+    if BLOCK_RESOURCES:
+        await context.route('**/*', route_request)
+    context.on('requestfinished', record_finished_request)
+    context.on('requestfailed', record_failed_request)
+    return context
+
+# =============================================================================
+# READINESS WAITS
+# =============================================================================
+
+PROFILE_READY = '.name, h1.name, ul.institution-list, section.rankings'
+HS_PROFILE_READY = 'section.rankings, section.rankings-section, div.ranking-section, .institution'
+INSTITUTION_LINKS = 'ul.institution-list a, .institution-list a'
+JUCO_PROFILE_LINK = 'a[href*="/junior-college-"]'
+TIMELINE_EVENTS_LINK = 'a[href*="TimelineEvents"]'
+TIMELINE_EVENT_ITEMS = 'ul.timeline-event-index_lst li'
+TIMELINE_NEXT_LINK = 'li.next_itm a'
+
+TIMELINE_PAGE_CHANGED = '''(previous) => {
+    const first = document.querySelector('ul.timeline-event-index_lst li');
+    return first !== null && first.textContent !== previous;
+}'''
+
+
+class WaitStats:
+    """Per-step record of how long each readiness wait took against the sleep it replaced"""
+
+    def __init__(self):
+        self.steps = {}
+
+    def record(self, step: str, actual_ms: float, legacy_ms: int, ready: bool):
+        entry = self.steps.setdefault(step, {'count': 0, 'actual_ms': 0.0, 'legacy_ms': 0, 'timeouts': 0})
+        entry['count'] += 1
+        entry['actual_ms'] += actual_ms
+        entry['legacy_ms'] += legacy_ms
+        if not ready:
+            entry['timeouts'] += 1
+
+    def report(self):
+        if not self.steps:
+            return
+        print(f"\n⏱️  Readiness waits ({WAIT_MODE} mode):")
+        total_actual = total_legacy = 0.0
+        for step, entry in sorted(self.steps.items()):
+            avg = entry['actual_ms'] / entry['count']
+            legacy = entry['legacy_ms'] / entry['count']
+            total_actual += entry['actual_ms']
+            total_legacy += entry['legacy_ms']
+            print(f"    → {step}: {entry['count']}x, avg {avg:.0f} ms (was {legacy:.0f} ms), {entry['timeouts']} timeouts")
+        print(f"    → Total: {total_actual / 1000:.1f}s waited vs {total_legacy / 1000:.1f}s of fixed sleeps")
+
+
+WAIT_STATS = WaitStats()
+
+
+async def wait_until_ready(page, step: str, legacy_ms: int, selector: str = None, function: str = None,
+                           arg=None, state: str = 'attached', timeout_ms: int = None) -> bool:
+    """
+    Waits for the DOM condition a step actually needs instead of sleeping blindly.
+    `legacy_ms` is the fixed sleep this wait replaced; it is used for the timing log
+    and is slept verbatim when WAIT_MODE=fixed. Returns False on timeout.
+    """
+    started = time.perf_counter()
+    ready = True
+    if WAIT_MODE == 'fixed' or (selector is None and function is None):
+        await page.wait_for_timeout(legacy_ms)
+    else:
+        timeout = timeout_ms or WAIT_TIMEOUT_MS
+        try:
+            if selector:
+                await page.wait_for_selector(selector, state=state, timeout=timeout)
+            else:
+                await page.wait_for_function(function, arg=arg, timeout=timeout)
+        except PlaywrightTimeoutError:
+            ready = False
+    actual_ms = (time.perf_counter() - started) * 1000
+    WAIT_STATS.record(step, actual_ms, legacy_ms, ready)
+    if WAIT_DEBUG:
+        print(f"      ⏱️  DEBUG: {step} ready in {actual_ms:.0f} ms (was {legacy_ms} ms){'' if ready else ' - TIMEOUT'}")
+    return ready
+
+# =============================================================================
+# LOAD MORE FUNCTIONALITY
+# =============================================================================
+
+def rankings_url(year: int) -> str:
+    # Correct Modern URL for JUCO Rankings
+    return f"https://247sports.com/Season/{year}-Football/CompositeRecruitRankings/?InstitutionGroup=JuniorCollege"
+
+
+def limit_for_test_mode(player_urls: list) -> list:
+    if TEST_MODE and len(player_urls) > 50:
+        print(f"  ℹ️  TEST MODE: Limited to 50 players")
+        return player_urls[:50]
+    return player_urls
+
+
+LOAD_MORE_LINK = 'a.load-more, a.rankings-page__showmore'
+
+
+def rankings_page_url(year: int, page_number: int, load_more_href: str = None) -> str:
+    """
+    URL of one rankings list page. Uses the Load More link's own href as the template when
+    the first page has one (it points at the list endpoint), otherwise the rankings URL.
+    """
+    href = rankings_url(year)
+    if load_more_href and not load_more_href.startswith(('#', 'javascript')):
+        href = f"https://247sports.com{load_more_href}" if load_more_href.startswith('/') else load_more_href
+    parts = urlparse(href)
+    query = [(key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True) if key.lower() != 'page']
+    query.append(('Page', str(page_number)))
+    return urlunparse(parts._replace(query=urlencode(query)))
+
+
+class DiscoveryStats:
+    """Wall time and players found per discovery method, per year"""
+
+    def __init__(self):
+        self.runs = {}
+
+    def record(self, year: int, method: str, seconds: float, players: Optional[list]):
+        self.runs.setdefault(year, {})[method] = (seconds, players)
+
+    def report(self):
+        if not self.runs:
+            return
+        print(f"\n🧭 Player discovery ({DISCOVERY_MODE} mode):")
+        for year, methods in sorted(self.runs.items()):
+            parts = [f"{method} {len(players) if players is not None else 'failed'} players in {seconds:.1f}s"
+                     for method, (seconds, players) in methods.items()]
+            print(f"    → {year}: " + ", ".join(parts))
+            if 'pages' in methods and 'click' in methods:
+                (page_seconds, page_players), (click_seconds, click_players) = methods['pages'], methods['click']
+                if page_players is None or click_players is None:
+                    continue
+                missing = len(set(click_players) - set(page_players))
+                extra = len(set(page_players) - set(click_players))
+                speedup = click_seconds / page_seconds if page_seconds else 0
+                print(f"      {speedup:.1f}x faster than clicking, {missing} missing / {extra} extra vs click, "
+                      f"same order: {page_players == click_players}")
+
+
+DISCOVERY_STATS = DiscoveryStats()
+
+
+def collect_list_rows(list_rows: Optional[dict], page):
+    """Keeps each player's list row from a rankings page (keyed by profile URL) when the caller asked for them"""
+    if list_rows is not None:
+        for row in page.extract('list_rows'):
+            list_rows.setdefault(row['Profile URL'], row)
+
+
+async def fetch_rankings_pages(browser, year: int, list_rows: dict = None) -> Optional[list]:
+    """
+    Discovers players by requesting the rankings list page by page over plain HTTP,
+    RANKINGS_PAGE_CONCURRENCY pages at a time, one extraction pass per page.
+    Stops at the first empty page. Returns None if the list could not be read this way
+    (including an endpoint that ignores the page number), so the caller can fall back
+    to clicking Load More. Each player's list columns go into list_rows.
+    """
+    context = await new_scraper_context(browser) if browser is not None else None
+    engine = FetchEngine(None, HttpFetcher(context.request) if context else None, mode='http', year=year)
+    try:
+        first = await engine.fetch(rankings_url(year), 'rankings')
+        player_urls = first.extract('player_urls') if first is not None else []
+        if not player_urls:
+            print(f"  ⚠️  Rankings page {year} had no player links over HTTP")
+            return None
+        print(f"  ✓ Page 1: {len(player_urls)} players")
+        collect_list_rows(list_rows, first)
+        load_more_href = first.extract('load_more_link')
+        seen = set(player_urls)
+        max_pages = 4 if TEST_MODE else 500
+        next_page = 2
+        while next_page <= max_pages:
+            numbers = range(next_page, min(next_page + RANKINGS_PAGE_CONCURRENCY, max_pages + 1))
+            pages = await asyncio.gather(*(engine.fetch(rankings_page_url(year, n, load_more_href), 'rankings')
+                                           for n in numbers))
+            for number, page in zip(numbers, pages):
+                if page is None:
+                    if CACHE_MODE == 'replay':
+                        return player_urls
+                    print(f"  ⚠️  Rankings page {number} failed to load")
+                    return None
+                page_urls = page.extract('player_urls')
+                if not page_urls:
+                    print(f"  ✓ Page {number} empty, all players loaded!")
+                    return player_urls
+                new_urls = [url for url in page_urls if url not in seen]
+                if not new_urls:
+                    # The endpoint ignored the page number (or served the already expanded list)
+                    if len(seen) > len(page_urls):
+                        print(f"  ✓ Page {number} only repeats earlier players, all players loaded!")
+                        return player_urls
+                    print(f"  ⚠️  Page {number} repeats page 1, rankings pagination not honoured")
+                    return None
+                seen.update(new_urls)
+                player_urls.extend(new_urls)
+                collect_list_rows(list_rows, page)
+                print(f"  ✓ Page {number}: +{len(new_urls)} players ({len(player_urls)} total)")
+            next_page += RANKINGS_PAGE_CONCURRENCY
+        return player_urls
+    finally:
+        if context is not None:
+            await context.close()
+
+
+async def discover_player_urls(browser, year: int, list_rows: dict = None) -> list:
+    """Player profile URLs for a class: paginated fetch first, the Load More click loop as fallback"""
+    print(f"\n📋 Loading all JUCO players for {year}...")
+    player_urls = None
+    if DISCOVERY_MODE in ('pages', 'compare'):
+        started = time.perf_counter()
+        player_urls = await fetch_rankings_pages(browser, year, list_rows)
+        DISCOVERY_STATS.record(year, 'pages', time.perf_counter() - started, player_urls)
+    if player_urls is None or DISCOVERY_MODE == 'compare':
+        if player_urls is None and DISCOVERY_MODE != 'click':
+            print(f"  → Falling back to the Load More click loop")
+        started = time.perf_counter()
+        click_urls = await click_load_more_until_complete(browser, year, list_rows)
+        DISCOVERY_STATS.record(year, 'click', time.perf_counter() - started, click_urls)
+        player_urls = player_urls if player_urls is not None else click_urls
+    print(f"  ✓ Found {len(player_urls)} player profiles")
+    return player_urls
+
+
+async def click_load_more_until_complete(browser, year: int, list_rows: dict = None) -> list:
+    url = rankings_url(year)
+    
+    if CACHE_MODE == 'replay':
+        cached = await PARSE_POOL.prepare(PAGE_CACHE.get(url, 'rankings', year))
+        if cached is None:
+            print(f"❌ REPLAY: No cached rankings page for {year}")
+            return []
+        player_urls = cached.extract('player_urls')
+        collect_list_rows(list_rows, cached)
+        print(f"  ✓ REPLAY: Found {len(player_urls)} player profiles in cached rankings page")
+        return player_urls
+    
+    context = await new_scraper_context(browser)
+    page = await context.new_page()
+    
+    try:
+        await page.goto(url, wait_until='domcontentloaded', timeout=60000)
+        try:
+            await page.wait_for_selector(".rankings-page__list-item", timeout=10000)
+        except Exception:
+            print("⚠️ Timeout waiting for list items to hydrate")
+    except Exception as e:
+        print(f"❌ Failed to load initial page for {year}: {e}")
+        await context.close()
+        return []
+
+    selectors = ["li.rankings-page__list-item", "li.recruit", ".rankings-page__container ul > li"]
+    valid_selector = None
+    for selector in selectors:
+        count = await page.locator(selector).count()
+        if count > 0:
+            valid_selector = selector
+            print(f"  ✓ Found {count} players using selector: '{selector}'")
+            break
+            
+    if not valid_selector:
+        print(f"⚠️  No players found")
+        await context.close()
+        return []
+
+    click_count = 0
+    max_clicks = 500 if not TEST_MODE else 3
+    
+    while click_count < max_clicks:
+        current_players = await page.locator(valid_selector).count()
+        load_more_button = page.locator('a.load-more, button.load-more, a.rankings-page__showmore, a:has-text("Load More")')
+        try:
+            if await load_more_button.count() > 0 and await load_more_button.first.is_visible():
+                print(f"  → Click #{click_count + 1}: {current_players} players loaded...")
+                await load_more_button.first.click()
+                await page.wait_for_timeout(1500)
+                click_count += 1
+            else:
+                print(f"  ✓ All players loaded!")
+                break
+        except Exception:
+            break
+    
+    print(f"\n🔗 Extracting player profile URLs...")
+    player_links = await page.locator(f'{valid_selector} a.rankings-page__name-link, {valid_selector} a.recruit').all()
+    if not player_links:
+         player_links = await page.locator(f'{valid_selector} a[href*="/player/"]').all()
+
+    player_urls = []
+    for link in player_links:
+        href = await link.get_attribute('href')
+        if href and '/player/' in href:
+            if href.startswith('/'): href = f"https://247sports.com{href}"
+            player_urls.append(href)
+    
+    player_urls = list(dict.fromkeys(player_urls))
+    print(f"  ✓ Clicked through to {len(player_urls)} player profiles")
+    
+    if player_urls and (PAGE_CACHE is not None or list_rows is not None):
+        expanded = PageSnapshot(page.url, await page.content(), 'browser')
+        if PAGE_CACHE is not None:
+            PAGE_CACHE.put(url, 'rankings', expanded)
+        collect_list_rows(list_rows, await PARSE_POOL.prepare(expanded, 'rankings'))
+    
+    await context.close()
+    return player_urls
+
+# =============================================================================
+# ROSTER SNAPSHOTS
+# =============================================================================
+# Each discovery is saved as output/rosters/roster_<year>_<timestamp>.json: the ordered class
+# list with each player's rank on the list page. Reruns and resumes reuse the newest one.
+
+def roster_snapshot_paths(year: int) -> list:
+    """Saved snapshots for a class, oldest first (the timestamp in the name sorts chronologically)"""
+    return sorted(ROSTER_DIR.glob(f"roster_{year}_*.json"))
+
+
+def load_roster_snapshot(path: Path) -> Optional[dict]:
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"  ⚠️  Could not read roster snapshot {path}: {e}")
+        return None
+
+
+def latest_roster_snapshot(year: int, include_partial: bool = False) -> Optional[dict]:
+    """Newest readable snapshot; partial (TEST_MODE) lists only when asked for"""
+    for path in reversed(roster_snapshot_paths(year)):
+        snapshot = load_roster_snapshot(path)
+        if snapshot is not None and (snapshot['complete'] or include_partial):
+            return snapshot
+    return None
+
+
+def roster_age_hours(snapshot: dict) -> float:
+    return (datetime.now() - datetime.fromisoformat(snapshot['discovered_at'])).total_seconds() / 3600
+
+
+def save_roster_snapshot(year: int, player_urls: list, complete: bool, list_rows: dict = None) -> tuple:
+    """Saves the class list; each player keeps the columns the rankings list showed for it under 'list'"""
+    discovered_at = datetime.now()
+    list_rows = list_rows or {}
+    snapshot = {
+        'year': year,
+        'discovered_at': discovered_at.isoformat(timespec='seconds'),
+        'complete': complete,
+        'players': [{'rank': rank, 'player_id': extract_player_id(url), 'url': url}
+                    for rank, url in enumerate(player_urls, start=1)],
+    }
+    for player in snapshot['players']:
+        row = list_rows.get(player['url'])
+        if row:
+            player['list'] = {column: value for column, value in row.items() if column != 'Profile URL'}
+    path = ROSTER_DIR / f"roster_{year}_{discovered_at.strftime('%Y%m%d_%H%M%S')}.json"
+    ROSTER_DIR.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix('.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(snapshot, f, indent=1)
+    os.replace(tmp_path, path)
+    return path, snapshot
+
+
+def diff_rosters(old: dict, new: dict) -> dict:
+    """
+    Players added, dropped and moved between two snapshots, matched by 247 ID (URL if
+    there is none) so a renamed slug is not reported as a drop plus an add.
+    Returns {'added': [(url, rank)], 'dropped': [(url, rank)], 'moved': [(url, old_rank, new_rank)]}.
+    """
+    def by_key(snapshot):
+        return {p['player_id'] if p['player_id'] != "NA" else p['url']: p for p in snapshot['players']}
+    old_players, new_players = by_key(old), by_key(new)
+    return {
+        'added': [(p['url'], p['rank']) for key, p in new_players.items() if key not in old_players],
+        'dropped': [(p['url'], p['rank']) for key, p in old_players.items() if key not in new_players],
+        'moved': [(p['url'], old_players[key]['rank'], p['rank']) for key, p in new_players.items()
+                  if key in old_players and old_players[key]['rank'] != p['rank']],
+    }
+
+
+def print_roster_diff(old: dict, new: dict, limit: int = 10):
+    diff = diff_rosters(old, new)
+    print(f"  🔀 Roster changes since {old['discovered_at']}: +{len(diff['added'])} added, "
+          f"-{len(diff['dropped'])} dropped, {len(diff['moved'])} moved")
+    for url, rank in diff['added'][:limit]:
+        print(f"      + #{rank} {url}")
+    for url, rank in diff['dropped'][:limit]:
+        print(f"      - #{rank} {url}")
+    for url, old_rank, new_rank in sorted(diff['moved'], key=lambda m: -abs(m[1] - m[2]))[:limit]:
+        print(f"      ↕ #{old_rank} → #{new_rank} {url}")
+
+
+async def load_roster(browser, year: int) -> tuple:
+    """
+    The class list for a year and the snapshot it came from: the newest saved snapshot while
+    it is younger than ROSTER_MAX_AGE_HOURS (at any age when resuming, so START_FROM keeps
+    pointing at the same players, in replay mode and while its journal is unfinished, since
+    journals are kept per snapshot), otherwise a fresh discovery saved as a new snapshot.
+    The snapshot is None only when nothing was discovered.
+    """
+    resuming = START_FROM not in ('', '0')
+    previous = latest_roster_snapshot(year, include_partial=TEST_MODE)
+    # Lite and hybrid rows come from the snapshot, so one saved before list columns were kept is rediscovered
+    has_list = previous is not None and any('list' in player for player in previous['players'])
+    if previous is not None and SCRAPE_MODE != 'full' and not has_list:
+        print(f"\n📋 Roster snapshot for {year} from {previous['discovered_at']} has no list columns, rediscovering")
+    elif previous is not None:
+        age = roster_age_hours(previous)
+        unfinished = unfinished_journal(year, previous) if JOURNAL_RESUME and age > ROSTER_MAX_AGE_HOURS else None
+        if age <= ROSTER_MAX_AGE_HOURS or resuming or CACHE_MODE == 'replay' or unfinished:
+            print(f"\n📋 Reusing roster snapshot for {year} from {previous['discovered_at']} "
+                  f"({age:.1f}h old, {len(previous['players'])} players)")
+            if age > ROSTER_MAX_AGE_HOURS and resuming:
+                print(f"  ℹ️  Older than ROSTER_MAX_AGE_HOURS, kept so START_FROM matches the original order")
+            elif unfinished:
+                print(f"  ℹ️  Older than ROSTER_MAX_AGE_HOURS, kept because {unfinished}; its journal resumes")
+            return limit_for_test_mode([player['url'] for player in previous['players']]), previous
+    list_rows = {}
+    player_urls = await discover_player_urls(browser, year, list_rows)
+    if not player_urls:
+        return [], None
+    path, snapshot = save_roster_snapshot(year, player_urls, complete=not TEST_MODE, list_rows=list_rows)
+    print(f"  💾 Roster snapshot saved: {path}")
+    if previous is not None:
+        print_roster_diff(previous, snapshot)
+    return limit_for_test_mode(player_urls), snapshot
+
+
+def resolve_start_index(player_urls: list, start_from: str) -> int:
+    """START_FROM as a number of players to skip, or the URL / slug of the player to resume at"""
+    if not start_from or start_from.isdigit():
+        return int(start_from or 0)
+    target = start_from.rstrip('/')
+    for index, url in enumerate(player_urls):
+        if url.rstrip('/') == target or url.rstrip('/').split('/')[-1] == target:
+            return index
+    print(f"  ⚠️  START_FROM player '{start_from}' is not on the roster, scraping the whole class")
+    return 0
+
+# =============================================================================
+# SCRAPE JOURNAL
+# =============================================================================
+
+class ScrapeJournal:
+    """
+    Crash-safe record of finished players for one roster snapshot.
+    Every result is appended to a JSONL file and fsynced before the next one, keyed by
+    profile URL: rows to journal_<year>_<roster>.jsonl, failures to failed_<year>_<roster>.jsonl.
+    On restart, URLs already done are skipped and the CSV is rebuilt from the journal.
+    """
+
+    def __init__(self, year: int, roster: dict, directory: Path = None):
+        directory = directory or JOURNAL_DIR
+        roster_id = datetime.fromisoformat(roster['discovered_at']).strftime('%Y%m%d_%H%M%S')
+        self.path = directory / f"journal_{year}_{roster_id}{shard_suffix()}.jsonl"
+        self.failed_path = directory / f"failed_{year}_{roster_id}{shard_suffix()}.jsonl"
+        self.done = {}
+        self.failed = {}
+        self._files = {}
+
+    def load(self):
+        """Reads both files back; a line cut short by a crash is ignored"""
+        for path, records in ((self.path, self.done), (self.failed_path, self.failed)):
+            if not path.exists():
+                continue
+            with open(path, encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue
+                    records[record['url']] = record
+        for url in self.done:
+            self.failed.pop(url, None)
+        return self
+
+    def _append(self, path: Path, record: dict):
+        f = self._files.get(path)
+        if f is None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            f = self._files[path] = open(path, 'a', encoding='utf-8')
+        f.write(json.dumps(record) + '\n')
+        f.flush()
+        os.fsync(f.fileno())
+
+    def record_done(self, url: str, row: dict, depth: str = 'full', incomplete: 'ScrapeFailure' = None):
+        record = {'url': url, 'at': datetime.now().isoformat(timespec='seconds'), 'row': row}
+        if depth != 'full':
+            record['depth'] = depth
+        if incomplete is not None:
+            record['incomplete'] = incomplete.category
+            record['reason'] = incomplete.detail
+        self._append(self.path, record)
+        self.done[url] = record
+        self.failed.pop(url, None)
+
+    def record_failed(self, url: str, reason: str, category: str = None):
+        record = {'url': url, 'at': datetime.now().isoformat(timespec='seconds'), 'reason': reason}
+        if category:
+            record['category'] = category
+        self._append(self.failed_path, record)
+        self.failed[url] = record
+
+    def depth(self, url: str) -> Optional[str]:
+        """Depth the journaled row was scraped at (None if the player is not done)"""
+        record = self.done.get(url)
+        return record.get('depth', 'full') if record else None
+
+    def reduced(self, player_urls: list) -> list:
+        return [url for url in player_urls if self.depth(url) not in (None, 'full')]
+
+    def is_incomplete(self, url: str) -> bool:
+        """The row was kept after its HS profile or timeline pages kept failing"""
+        return 'incomplete' in self.done.get(url, {})
+
+    def incomplete(self, player_urls: list) -> list:
+        return [url for url in player_urls if self.is_incomplete(url)]
+
+    def pending(self, player_urls: list) -> list:
+        """Players without a row, then the ones only scraped at reduced depth or with sections missing"""
+        if RETRY_FAILED:
+            return [url for url in player_urls if url in self.failed] + self.incomplete(player_urls)
+        redo = set(self.reduced(player_urls)) | set(self.incomplete(player_urls))
+        return [url for url in player_urls if url not in self.done] + [url for url in player_urls if url in redo]
+
+    def rows(self, player_urls: list) -> list:
+        """Finished rows in roster order, then any journaled URL no longer on the roster"""
+        ordered = [url for url in player_urls if url in self.done]
+        ordered += [url for url in self.done if url not in set(player_urls)]
+        return [self.done[url]['row'] for url in ordered]
+
+    def compact(self, filename: Path, player_urls: list) -> list:
+        """Rewrites the CSV from the journal (one row per URL, roster order) and returns the rows"""
+        rows = self.rows(player_urls)
+        tmp_path = filename.with_suffix('.tmp')
+        with open(tmp_path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=CSV_HEADERS)
+            writer.writeheader()
+            writer.writerows(rows)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, filename)
+        return rows
+
+    def close(self):
+        for f in self._files.values():
+            f.close()
+        self._files = {}
+
+
+def unfinished_journal(year: int, roster: dict) -> Optional[str]:
+    """
+    Why this roster snapshot's journal still has players to do, or None. A run the planner stopped
+    leaves a resume manifest; a run killed outright leaves a journal short of the roster. Players
+    that only failed do not hold the snapshot, a fresh roster retries them anyway.
+    """
+    journal = ScrapeJournal(year, roster)
+    resume_path = resume_manifest_path(journal)
+    if resume_path.exists():
+        try:
+            resume = json.loads(resume_path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return None
+        left = set(resume.get('missing', [])) - set(resume.get('failed', []))
+        if resume.get('stopped') or left:
+            return f"the run was stopped ({resume.get('stopped') or 'players left'})"
+        return None
+    if not journal.path.exists():
+        return None
+    journal.load()
+    player_urls = [player['url'] for player in roster['players']]
+    if SHARD_COUNT > 1:
+        player_urls = shard_urls(player_urls)
+    left = sum(url not in journal.done and url not in journal.failed for url in player_urls)
+    return f"the run was cut off with {left} players never finished" if left else None
+
+# =============================================================================
+# SHARDING
+# =============================================================================
+# SHARD_COUNT jobs can split one year: each scrapes the roster players whose URL hashes to its
+# SHARD_INDEX, so a player always lands in the same shard however the roster grows or reorders.
+# merge_shards.py recombines the shard CSVs into the normal per-year file.
+
+def shard_of(url: str, shard_count: int) -> int:
+    """Stable shard for a player URL, keyed by its 247 ID so a renamed slug keeps its shard"""
+    player_id = extract_player_id(url)
+    key = player_id if player_id != "NA" else url.rstrip('/')
+    return int(hashlib.sha256(key.encode('utf-8')).hexdigest()[:8], 16) % shard_count
+
+
+def shard_urls(player_urls: list, shard_index: int = None, shard_count: int = None) -> list:
+    shard_index = SHARD_INDEX if shard_index is None else shard_index
+    shard_count = SHARD_COUNT if shard_count is None else shard_count
+    if shard_count <= 1:
+        return player_urls
+    return [url for url in player_urls if shard_of(url, shard_count) == shard_index]
+
+
+def shard_suffix() -> str:
+    """File name suffix that keeps each shard's CSV, journal and manifest apart ('' when not sharded)"""
+    return f"_shard{SHARD_INDEX}of{SHARD_COUNT}" if SHARD_COUNT > 1 else ""
+
+
+def write_shard_summary(year: int, roster: dict, roster_urls: list, assigned: list, rows: list,
+                        failed: list, filename: Path) -> Path:
+    """
+    output/shards/shard_<year>_<i>of<n>.json: the roster this shard split and what it produced,
+    so the merge can tell a missing shard or a roster that differed between shards
+    """
+    summary = {
+        'year': year,
+        'shard_index': SHARD_INDEX,
+        'shard_count': SHARD_COUNT,
+        'roster_discovered_at': roster['discovered_at'],
+        'roster': roster_urls,
+        'assigned': len(assigned),
+        'rows': len(rows),
+        'failed': failed,
+        'csv': filename.name,
+        'finished_at': datetime.now().isoformat(timespec='seconds'),
+    }
+    path = OUTPUT_DIR / "shards" / f"shard_{year}_{SHARD_INDEX}of{SHARD_COUNT}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix('.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(summary, f, indent=1)
+    os.replace(tmp_path, path)
+    return path
+
+# =============================================================================
+# WORK QUEUE
+# =============================================================================
+# Any number of scraper processes can share one year's (or several years') players through a
+# SQLite file: the coordinator enqueues the rosters, workers lease URLs one at a time, heartbeat
+# while scraping and mark them done with their row. A worker that dies simply stops
+# heartbeating and its leases expire back to pending, so slow players never strand a static split.
+
+QUEUE_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS players (
+    url TEXT PRIMARY KEY,
+    year INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    total INTEGER NOT NULL,
+    state TEXT NOT NULL DEFAULT 'pending',
+    worker TEXT,
+    lease_expires REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    row TEXT,
+    reason TEXT,
+    seconds REAL,
+    updated_at REAL
+);
+CREATE INDEX IF NOT EXISTS players_state ON players (state, year, position);
+CREATE TABLE IF NOT EXISTS workers (
+    worker TEXT PRIMARY KEY,
+    started_at REAL NOT NULL,
+    last_seen REAL NOT NULL,
+    completed INTEGER NOT NULL DEFAULT 0,
+    failed INTEGER NOT NULL DEFAULT 0,
+    busy_seconds REAL NOT NULL DEFAULT 0
+);
+'''
+
+
+class LeaseQueue:
+    """
+    Lease-based player queue in one SQLite file (WAL mode, so readers never block workers).
+    States: pending → leased → done | failed; a lease not heartbeated within QUEUE_LEASE_S goes
+    back to pending, and a player that fails QUEUE_MAX_ATTEMPTS times stays failed.
+    Async code goes through call(), so SQLite work and lock waits (up to 30s) never block the event loop.
+    """
+
+    def __init__(self, path, worker: str = None):
+        self.path = Path(path)
+        self.worker = worker or WORKER_ID
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # One queue thread (started on first call()) runs every event-loop call, one at a time, on this connection
+        self.db = sqlite3.connect(str(self.path), timeout=30, isolation_level=None, check_same_thread=False)
+        self.db.execute('PRAGMA journal_mode=WAL')
+        self.db.executescript(QUEUE_SCHEMA)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='lease-queue')
+        self.in_flight = set()
+        self.requeued = 0
+
+    async def call(self, fn, *args):
+        """Runs fn(*args) (a queue method, or a helper that reads the queue) on the queue thread"""
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    @contextmanager
+    def _transaction(self):
+        self.db.execute('BEGIN IMMEDIATE')
+        try:
+            yield self.db
+        except BaseException:
+            self.db.execute('ROLLBACK')
+            raise
+        self.db.execute('COMMIT')
+
+    def _seen(self, db, completed: int = 0, failed: int = 0, seconds: float = 0.0):
+        now = time.time()
+        db.execute('INSERT INTO workers (worker, started_at, last_seen) VALUES (?, ?, ?) '
+                   'ON CONFLICT(worker) DO UPDATE SET last_seen = excluded.last_seen', (self.worker, now, now))
+        if completed or failed:
+            db.execute('UPDATE workers SET completed = completed + ?, failed = failed + ?, '
+                       'busy_seconds = busy_seconds + ? WHERE worker = ?', (completed, failed, seconds, self.worker))
+
+    def enqueue(self, year: int, player_urls: list) -> int:
+        """Adds a roster in order (URLs already queued keep their state); RETRY_FAILED re-opens failures"""
+        now = time.time()
+        with self._transaction() as db:
+            before = db.total_changes
+            db.executemany('INSERT OR IGNORE INTO players (url, year, position, total, updated_at) VALUES (?, ?, ?, ?, ?)',
+                           [(url, year, position, len(player_urls), now) for position, url in enumerate(player_urls, start=1)])
+            added = db.total_changes - before
+            if RETRY_FAILED:
+                db.execute("UPDATE players SET state = 'pending', attempts = 0, reason = NULL "
+                           "WHERE state = 'failed' AND year = ?", (year,))
+        return added
+
+    def lease(self) -> Optional[tuple]:
+        """(year, position, total, url) of the next pending player, now leased to this worker; None if none"""
+        now = time.time()
+        with self._transaction() as db:
+            expired = db.execute("UPDATE players SET state = 'pending', worker = NULL, lease_expires = NULL "
+                                 "WHERE state = 'leased' AND lease_expires < ?", (now,)).rowcount
+            leased = db.execute("SELECT year, position, total, url FROM players WHERE state = 'pending' "
+                                "ORDER BY year, position LIMIT 1").fetchone()
+            if leased:
+                db.execute("UPDATE players SET state = 'leased', worker = ?, lease_expires = ?, "
+                           "attempts = attempts + 1, updated_at = ? WHERE url = ?",
+                           (self.worker, now + QUEUE_LEASE_S, now, leased[3]))
+                self.in_flight.add(leased[3])
+            self._seen(db)
+        if expired:
+            self.requeued += expired
+            print(f"    ⏰ Requeued {expired} players whose lease expired")
+        return leased
+
+    def heartbeat(self):
+        """Extends this worker's leases on everything it is still scraping"""
+        now = time.time()
+        with self._transaction() as db:
+            db.executemany("UPDATE players SET lease_expires = ? WHERE url = ? AND worker = ? AND state = 'leased'",
+                           [(now + QUEUE_LEASE_S, url, self.worker) for url in self.in_flight])
+            self._seen(db)
+
+    def complete(self, url: str, row: dict, seconds: float):
+        self.in_flight.discard(url)
+        with self._transaction() as db:
+            db.execute("UPDATE players SET state = 'done', worker = ?, lease_expires = NULL, row = ?, reason = NULL, "
+                       "seconds = ?, updated_at = ? WHERE url = ?",
+                       (self.worker, json.dumps(row), seconds, time.time(), url))
+            self._seen(db, completed=1, seconds=seconds)
+
+    def fail(self, url: str, reason: str, seconds: float):
+        """Back to pending for another worker, or failed for good after QUEUE_MAX_ATTEMPTS"""
+        self.in_flight.discard(url)
+        with self._transaction() as db:
+            db.execute("UPDATE players SET state = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, "
+                       "worker = NULL, lease_expires = NULL, reason = ?, seconds = ?, updated_at = ? "
+                       "WHERE url = ? AND state = 'leased'",
+                       (QUEUE_MAX_ATTEMPTS, reason, seconds, time.time(), url))
+            self._seen(db, failed=1, seconds=seconds)
+
+    def release(self):
+        """Hands unfinished leases straight back on a clean shutdown instead of waiting for them to expire"""
+        if not self.in_flight:
+            return
+        with self._transaction() as db:
+            db.executemany("UPDATE players SET state = 'pending', worker = NULL, lease_expires = NULL, "
+                           "attempts = attempts - 1 WHERE url = ? AND worker = ? AND state = 'leased'",
+                           [(url, self.worker) for url in self.in_flight])
+        self.in_flight = set()
+
+    def unfinished(self) -> int:
+        """Players pending or leased anywhere; 0 means the queue has drained"""
+        return self.db.execute("SELECT COUNT(*) FROM players WHERE state IN ('pending', 'leased')").fetchone()[0]
+
+    def progress(self) -> dict:
+        """{year: {state: count}}"""
+        progress = {}
+        for year, state, count in self.db.execute('SELECT year, state, COUNT(*) FROM players GROUP BY year, state'):
+            progress.setdefault(year, Counter())[state] = count
+        return progress
+
+    def workers(self) -> list:
+        return self.db.execute('SELECT worker, started_at, last_seen, completed, failed, busy_seconds '
+                               'FROM workers ORDER BY started_at').fetchall()
+
+    def rows(self, year: int = None) -> list:
+        """Finished rows in roster order (one year, or every year in the queue)"""
+        query = "SELECT row FROM players WHERE state = 'done'" + (" AND year = ?" if year is not None else "")
+        params = (year,) if year is not None else ()
+        return [json.loads(row) for row, in self.db.execute(query + " ORDER BY year, position", params)]
+
+    def failures(self, year: int) -> list:
+        return self.db.execute("SELECT url, attempts, reason FROM players WHERE state = 'failed' AND year = ? "
+                               "ORDER BY position", (year,)).fetchall()
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+        self.db.close()
+
+
+def print_queue_progress(work_queue: LeaseQueue):
+    """Per-year state counts and per-worker throughput (players/min over the time each worker has been up)"""
+    now = time.time()
+    print(f"\n📊 Work queue {work_queue.path}:")
+    for year, states in sorted(work_queue.progress().items()):
+        total = sum(states.values())
+        print(f"    → {year}: {states['done']}/{total} done ({100 * states['done'] / total:.1f}%), "
+              f"{states['leased']} leased, {states['pending']} pending, {states['failed']} failed")
+    for worker, started_at, last_seen, completed, failed, busy_seconds in work_queue.workers():
+        up_minutes = max(last_seen - started_at, 1) / 60
+        per_player = f", {busy_seconds / (completed + failed):.1f}s/player" if completed + failed else ""
+        print(f"      👷 {worker}: {completed} done, {failed} failed, {completed / up_minutes:.1f} players/min"
+              f"{per_player}, last seen {now - last_seen:.0f}s ago")
+
+# =============================================================================
+# ADAPTIVE CONCURRENCY
+# =============================================================================
+
+RATE_LIMIT_STATUSES = {429, 503}
+# Bot-challenge interstitials (Cloudflare / PerimeterX); they arrive as 200s or 403s, never as real pages
+CHALLENGE_MARKERS = ('Just a moment...', 'Attention Required! | Cloudflare', 'cf-browser-verification',
+                     'cf_chl_opt', 'px-captcha')
+# Outcomes that mean "back off": halve the limit (and widen the gap once we are at the minimum)
+CONGESTION_OUTCOMES = {'rate_limited', 'challenge', 'timeout'}
+
+
+def classify_response(status: int = None, text: str = None, error: Exception = None) -> str:
+    """Buckets one document request as 'ok', 'rate_limited', 'challenge', 'timeout' or 'error'"""
+    if error is not None:
+        if isinstance(error, (PlaywrightTimeoutError, asyncio.TimeoutError)) or 'timeout' in str(error).lower():
+            return 'timeout'
+        return 'error'
+    if status in RATE_LIMIT_STATUSES:
+        return 'rate_limited'
+    if text and any(marker in text for marker in CHALLENGE_MARKERS):
+        return 'challenge'
+    if status is not None and status >= 500:
+        return 'error'
+    return 'ok'
+
+
+def parse_retry_after(headers) -> Optional[float]:
+    """Seconds from a Retry-After header (delta-seconds or HTTP date), if present"""
+    value = (headers or {}).get('retry-after')
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        from email.utils import parsedate_to_datetime
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class HostLimiter:
+    """
+    AIMD limit on in-flight document requests to one host, plus a minimum gap
+    between request starts. A clean window of `limit` successes adds one slot;
+    a 429, challenge page, timeout, slow response or high error rate multiplies
+    the limit by AIMD_DECREASE_FACTOR (at the floor, the gap doubles instead).
+    """
+
+    def __init__(self, host: str, limit: int, ceiling: int):
+        self.host = host
+        self.limit = limit
+        self.ceiling = ceiling
+        self.gap = MIN_REQUEST_GAP_MS / 1000
+        self.in_flight = 0
+        self.next_start = 0.0
+        self.paused_until = 0.0
+        self.last_decrease = 0.0
+        self.successes = 0
+        self.recent = deque(maxlen=20)
+        self.latency = None
+        self.outcomes = Counter()
+        self.changes = 0
+        self.low = self.high = limit
+        self.ready = asyncio.Condition()
+
+    async def acquire(self):
+        async with self.ready:
+            await self.ready.wait_for(lambda: self.in_flight < self.limit)
+            self.in_flight += 1
+            now = time.monotonic()
+            start = max(now, self.next_start, self.paused_until)
+            self.next_start = start + self.gap
+        if start > now:
+            try:
+                await asyncio.sleep(start - now)
+            except asyncio.CancelledError:
+                # No release() follows a cancelled acquire (e.g. the planner's SIGTERM grace): give the slot back
+                async with self.ready:
+                    self.in_flight -= 1
+                    self.ready.notify_all()
+                raise
+
+    async def release(self, outcome: str, seconds: float, retry_after: float = None):
+        async with self.ready:
+            self.in_flight -= 1
+            self._record(outcome, seconds, retry_after)
+            self.ready.notify_all()
+
+    def _record(self, outcome: str, seconds: float, retry_after: float = None):
+        self.outcomes[outcome] += 1
+        self.recent.append(outcome != 'ok')
+        if outcome in ('rate_limited', 'challenge'):
+            self.paused_until = max(self.paused_until, time.monotonic() + (retry_after or RATE_LIMIT_PAUSE_S))
+        if outcome in CONGESTION_OUTCOMES:
+            self._decrease(outcome.replace('_', ' '))
+        elif outcome == 'error':
+            if len(self.recent) >= 10 and sum(self.recent) / len(self.recent) > ERROR_RATE_LIMIT:
+                self._decrease(f"error rate {sum(self.recent) / len(self.recent):.0%}")
+                self.recent.clear()
+        elif seconds * 1000 > SLOW_RESPONSE_MS:
+            self._decrease(f"slow response {seconds:.1f}s")
+        else:
+            self.latency = seconds if self.latency is None else 0.8 * self.latency + 0.2 * seconds
+            self.successes += 1
+            if self.successes >= self.limit:
+                self._increase()
+
+    def _increase(self):
+        self.successes = 0
+        if self.gap > MIN_REQUEST_GAP_MS / 1000:
+            self._set(self.limit, max(MIN_REQUEST_GAP_MS / 1000, self.gap / 2), "clean window")
+        elif ADAPTIVE_CONCURRENCY and self.limit < self.ceiling:
+            self._set(self.limit + 1, self.gap, "clean window")
+
+    def _decrease(self, reason: str):
+        now = time.monotonic()
+        self.successes = 0
+        # One decrease per round trip: requests already in flight were sent at the old rate
+        if now - self.last_decrease < max(2.0, 2 * (self.latency or 0)):
+            return
+        self.last_decrease = now
+        limit = max(MIN_CONCURRENT, int(self.limit * AIMD_DECREASE_FACTOR)) if ADAPTIVE_CONCURRENCY else self.limit
+        if limit < self.limit:
+            self._set(limit, self.gap, reason)
+        else:
+            self._set(limit, min(MAX_REQUEST_GAP_MS / 1000, max(self.gap, 0.1) * 2), reason)
+
+    def _set(self, limit: int, gap: float, reason: str):
+        if (limit, gap) == (self.limit, self.gap):
+            return
+        changed = []
+        if limit != self.limit:
+            changed.append(f"{self.limit} → {limit} in flight")
+        if gap != self.gap:
+            changed.append(f"gap {self.gap * 1000:.0f} → {gap * 1000:.0f} ms")
+        print(f"    🎚️  Concurrency {self.host}: {', '.join(changed)} ({reason})")
+        self.limit, self.gap = limit, gap
+        self.changes += 1
+        self.low, self.high = min(self.low, limit), max(self.high, limit)
+
+
+class RequestSlot:
+    """`async with` one host slot around a document request; call finish() with what came back"""
+
+    def __init__(self, limiter: HostLimiter):
+        self.limiter = limiter
+        self.outcome = None
+        self.retry_after = None
+
+    def finish(self, status: int = None, text: str = None, headers=None) -> str:
+        self.outcome = classify_response(status, text)
+        self.retry_after = parse_retry_after(headers)
+        return self.outcome
+
+    async def __aenter__(self):
+        await self.limiter.acquire()
+        self.started = time.perf_counter()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        outcome = self.outcome or (classify_response(error=exc) if exc is not None else 'ok')
+        await self.limiter.release(outcome, time.perf_counter() - self.started, self.retry_after)
+        return False
+
+
+class ConcurrencyController:
+    """Per-host AIMD limiters shared by every worker in this process"""
+
+    def __init__(self):
+        self.hosts = {}
+
+    def slot(self, url: str) -> RequestSlot:
+        host = urlparse(url).hostname or ''
+        limiter = self.hosts.get(host)
+        if limiter is None:
+            start = min(INITIAL_CONCURRENT, MAX_CONCURRENT) if ADAPTIVE_CONCURRENCY else MAX_CONCURRENT
+            limiter = self.hosts[host] = HostLimiter(host, max(MIN_CONCURRENT, start), MAX_CONCURRENT)
+        return RequestSlot(limiter)
+
+    def report(self):
+        if not self.hosts:
+            return
+        mode = "adaptive" if ADAPTIVE_CONCURRENCY else "fixed"
+        print(f"\n🎚️  Request concurrency ({mode}, {MIN_CONCURRENT}-{MAX_CONCURRENT} per host):")
+        for host, limiter in sorted(self.hosts.items()):
+            outcomes = ", ".join(f"{name} {count}" for name, count in limiter.outcomes.most_common())
+            latency = f", latency ~{limiter.latency * 1000:.0f} ms" if limiter.latency is not None else ""
+            print(f"    → {host}: final {limiter.limit} (range {limiter.low}-{limiter.high}), "
+                  f"gap {limiter.gap * 1000:.0f} ms, {limiter.changes} changes{latency}")
+            print(f"      {outcomes}")
+
+
+CONCURRENCY = ConcurrencyController()
+
+# =============================================================================
+# FAILURES AND RETRIES
+# =============================================================================
+# A player whose profile did not load, or whose HS profile or timeline pages failed, is no longer saved
+# as a silent row of NAs. The failure is classified, and the player waits out an exponential backoff on
+# the retry queue. That queue is drained once the rest of the roster is done. Only after
+# RETRY_MAX_ATTEMPTS is the player journaled as failed, or its partial row kept and flagged for the next run.
+
+FAILURE_CATEGORIES = ('navigation_timeout', 'rate_limit', 'missing_selector', 'http_error', 'parse_error',
+                      'not_found', 'cache_miss', 'other')
+# classify_response() outcomes of a failed document request
+FETCH_FAILURES = {'timeout': 'navigation_timeout', 'rate_limited': 'rate_limit', 'challenge': 'rate_limit',
+                  'error': 'http_error', 'ok': 'http_error'}
+
+
+class ScrapeFailure(Exception):
+    """Why a player, or one page or section of it, could not be scraped; category is one of FAILURE_CATEGORIES"""
+
+    def __init__(self, category: str, detail: str):
+        super().__init__(detail)
+        self.category = category
+        self.detail = detail
+
+
+def fetch_failure(outcome: str, status: int = None, detail: str = '') -> ScrapeFailure:
+    category = 'not_found' if status in (404, 410) else FETCH_FAILURES.get(outcome, 'http_error')
+    return ScrapeFailure(category, detail)
+
+
+def classify_failure(error: BaseException) -> str:
+    if isinstance(error, ScrapeFailure):
+        return error.category
+    if classify_response(error=error) == 'timeout':
+        return 'navigation_timeout'
+    if isinstance(error, (AttributeError, IndexError, KeyError, TypeError, ValueError)):
+        return 'parse_error'
+    return 'other'
+
+
+def mark_incomplete(data: dict, section: str, error: BaseException):
+    """Notes the first section of a row that failed; a page that does not exist is not missing data"""
+    category = classify_failure(error)
+    if category != 'not_found':
+        data.setdefault('_incomplete', ScrapeFailure(category, f"{section}: {error}"))
+
+
+def retry_delay(attempt: int) -> float:
+    """Backoff before retry `attempt` (1 = the first retry): doubling, capped, with half of it jittered"""
+    delay = min(RETRY_BACKOFF_MAX_S, RETRY_BACKOFF_S * 2 ** (attempt - 1))
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+class RetryQueue:
+    """Failed players waiting out their backoff, soonest first"""
+
+    def __init__(self):
+        self.heap = []
+        self.sequence = 0
+
+    def __len__(self):
+        return len(self.heap)
+
+    def push(self, item: tuple, attempt: int) -> float:
+        delay = retry_delay(attempt)
+        self.sequence += 1
+        heapq.heappush(self.heap, (time.monotonic() + delay, self.sequence, item))
+        return delay
+
+    def pop_ready(self) -> Optional[tuple]:
+        if self.heap and self.heap[0][0] <= time.monotonic():
+            return heapq.heappop(self.heap)[2]
+        return None
+
+    def wait(self) -> Optional[float]:
+        """Seconds until the next retry is due (None when nothing is waiting)"""
+        return max(0.0, self.heap[0][0] - time.monotonic()) if self.heap else None
+
+    def drain(self) -> list:
+        """Everything still waiting, for a run that stops before retrying it"""
+        items = [entry[2] for entry in sorted(self.heap)]
+        self.heap = []
+        return items
+
+    def years(self) -> Counter:
+        return Counter(entry[2][0].year for entry in self.heap)
+
+
+class FailureStats:
+    """Player failures by category: retried, recovered on a retry, kept as partial rows, given up on"""
+
+    OUTCOMES = ('retried', 'recovered', 'partial', 'failed', 'abandoned')
+
+    def __init__(self):
+        self.counts = {}
+        self.final = []
+
+    def record(self, failure: ScrapeFailure, outcome: str, url: str = None):
+        self.counts.setdefault(failure.category, Counter())[outcome] += 1
+        if url and outcome in ('partial', 'failed', 'abandoned'):
+            self.final.append((url, outcome, failure))
+
+    def report(self):
+        if not self.counts:
+            return
+        print(f"\n🩹 Player failures by category (up to {RETRY_MAX_ATTEMPTS} attempts each):")
+        for category in sorted(self.counts, key=lambda category: -sum(self.counts[category].values())):
+            counts = self.counts[category]
+            print(f"    → {category}: " + ", ".join(f"{counts[outcome]} {outcome}"
+                                                  for outcome in self.OUTCOMES if counts[outcome]))
+        for url, outcome, failure in self.final[:10]:
+            print(f"      {outcome} ({failure.category}): {url} - {failure.detail[:100]}")
+        if len(self.final) > 10:
+            print(f"      ... and {len(self.final) - 10} more (see the failed_*.jsonl journals)")
+
+
+FAILURE_STATS = FailureStats()
+
+# =============================================================================
+# PAGE FETCHING
+# =============================================================================
+
+# Markup each page type must contain before we trust a plain-HTTP response
+REQUIRED_MARKUP = {
+    'profile': ['.name, h1.name', 'ul.institution-list, .institution-list'],
+    'hs': ['section.rankings, section.rankings-section, div.ranking-section'],
+    'timeline': ['ul.timeline-event-index_lst'],
+}
+
+# Readiness selector, fixed sleep it replaced and navigation timeout per page type (browser path)
+BROWSER_LOAD = {
+    'profile': (PROFILE_READY, 2000, 30000),
+    'hs': (HS_PROFILE_READY, 2000, 30000),
+    'timeline': (TIMELINE_EVENT_ITEMS, 0, 15000),
+}
+
+# Every field parse_profile reads from each page type (see SNAPSHOT_EXTRACTORS / PAGE_EXTRACT_SCRIPT)
+SNAPSHOT_FIELDS = {
+    'profile': ['markup', 'ids', 'juco_link', 'header', 'juco_rankings', 'timeline_items', 'timeline_link', 'commit_team'],
+    'hs': ['markup', 'hs_header', 'hs_rankings'],
+    'timeline': ['markup', 'timeline_event_items', 'next_link'],
+}
+
+# Fields the script returns as raw element text; they are classified in Python like the HTML path
+TIMELINE_TEXT_FIELDS = {'timeline_items', 'timeline_event_items'}
+
+# In-page port of the extractors above, run with a single page.evaluate() per DOM state.
+# Returns one JSON string so only the extracted fields cross the CDP channel.
+PAGE_EXTRACT_SCRIPT = r'''(args) => {
+    const cleanText = (t) => t ? t.trim().replace(/\n/g, ' ').replace(/\r/g, '').replace(/\u00a0/g, ' ') : 'NA';
+    const strippedText = (el) => {
+        const walker = document.createTreeWalker(el, NodeFilter.SHOW_TEXT);
+        const parts = [];
+        while (walker.nextNode()) {
+            const part = walker.currentNode.nodeValue.trim();
+            if (part) parts.push(part);
+        }
+        return parts.join('');
+    };
+    const normalizeHeight = (h) => {
+        if (!h || h === 'NA') return 'NA';
+        h = h.trim().replace(/^['"]+|['"]+$/g, '');
+        if (h.includes('-') || h.includes("'") || (h.length <= 4 && /\d/.test(h))) return `'${h}`;
+        return h;
+    };
+    const parseRank = (t) => {
+        const m = t ? t.match(/#?(\d+)/) : null;
+        return m ? m[1] : 'NA';
+    };
+    const all = (root, css) => Array.from(root.querySelectorAll(css));
+    const href = (el) => el.getAttribute('href') ?? '';
+    const absolute = (h) => h.startsWith('/') ? `https://247sports.com${h}` : h;
+    const vitals = () => [...all(document, '.metrics-list li'), ...all(document, '.details li'), ...all(document, 'ul.vitals li')];
+
+    const VITALS = [
+        [['Pos', 'Position'], /(?:Pos|Position)[:\s]*(.*)/i, 'Position', cleanText],
+        [['Height'], /Height[:\s]*(.*)/i, 'Height', normalizeHeight],
+        [['Weight'], /Weight[:\s]*(.*)/i, 'Weight', cleanText],
+        [['Junior College'], /Junior College[:\s]*(.*)/i, 'Junior College', cleanText],
+        [['Home Town', 'Hometown', 'City'], /(?:Home Town|Hometown|City)[:\s]*(.*)/i, 'City, ST', cleanText],
+        [['Class'], /Class[:\s]*(.*)/i, 'Class', cleanText],
+    ];
+
+    const header = () => {
+        const fields = {};
+        const name = document.querySelector('.name') || document.querySelector('h1.name');
+        if (name) fields['Player Name'] = cleanText(name.textContent);
+        for (const item of vitals()) {
+            const text = strippedText(item);
+            const rule = VITALS.find(([words]) => words.some((w) => text.includes(w)));
+            const m = rule ? text.match(rule[1]) : null;
+            if (m) fields[rule[2]] = rule[3](m[1]);
+        }
+        return fields;
+    };
+
+    const hsHeader = () => {
+        const fields = {};
+        const school = document.querySelector('.institution, .team-name, h2.institution');
+        if (school) fields['High School'] = cleanText(school.textContent);
+        for (const item of vitals()) {
+            const text = strippedText(item);
+            const m = text.includes('Class') ? text.match(/Class[:\s]*(.*)/i) : null;
+            if (m) fields['HS Class Year'] = cleanText(m[1]);
+        }
+        return fields;
+    };
+
+    const rankings = (prefixMap, institutionCheck) => {
+        const fields = {};
+        for (const section of all(document, 'section.rankings, section.rankings-section, div.ranking-section')) {
+            const title = section.querySelector('.rankings-header h3, h3.title, h3');
+            if (!title) continue;
+            const headerText = cleanText(title.textContent).toUpperCase();
+            const prefix = headerText.includes('COMPOSITE') ? prefixMap['COMPOSITE']
+                : headerText.includes('247SPORTS') ? prefixMap['247SPORTS'] : null;
+            if (!prefix) continue;
+
+            const stars = all(section, 'span.icon-starsolid.yellow, i.icon-starsolid.yellow').length;
+            if (stars) fields[`${prefix} Stars`] = String(Math.min(stars, 5));
+            const rating = section.querySelector('.rank-block, .score, .rating');
+            const ratingMatch = rating ? cleanText(rating.textContent).match(/(\d+(?:\.\d+)?)/) : null;
+            if (ratingMatch) fields[`${prefix} Rating`] = ratingMatch[1];
+
+            const ranksList = section.querySelector('ul.ranks-list');
+            if (!ranksList) continue;
+            for (const li of all(ranksList, 'li')) {
+                const pos = li.querySelector('b');
+                const link = li.querySelector('a');
+                if (!link) continue;
+                const h = href(link);
+                const rank = parseRank((link.querySelector('strong') || link).textContent);
+                if (h.includes('Position=')) {
+                    if (pos) fields[`${prefix} Position`] = cleanText(pos.textContent);
+                    fields[`${prefix} Position Rank`] = rank;
+                } else if (h.includes('State=') || h.includes('state=')) {
+                    continue;
+                } else if (institutionCheck && h.includes(`InstitutionGroup=${institutionCheck}`)) {
+                    fields[`${prefix} National Rank`] = rank;
+                }
+            }
+        }
+        return fields;
+    };
+
+    const ids = () => {
+        const found = {base: null, juco: null, hs: null, colleges: []};
+        const base = location.href.match(/\/player\/[^/]+-(\d+)/);
+        if (base) found.base = base[1];
+        for (const link of all(document, 'a[href*="/player/"]')) {
+            const h = href(link);
+            let m;
+            if (h.includes('/junior-college-')) {
+                if ((m = h.match(/\/junior-college-(\d+)/)) && !found.juco) found.juco = m[1];
+            } else if (h.includes('/high-school-')) {
+                if ((m = h.match(/\/high-school-(\d+)/)) && !found.hs) found.hs = m[1];
+            } else if (h.includes('/college-') && strippedText(link).includes('(NCAA)')) {
+                if ((m = h.match(/\/college-(\d+)/)) && !found.colleges.includes(m[1])) found.colleges.push(m[1]);
+            }
+        }
+        return found;
+    };
+
+    const jucoLink = () => {
+        for (const link of all(document, 'a')) {
+            const h = href(link);
+            if (h.includes('/junior-college-') && strippedText(link).includes('(JUCO)')) return absolute(h);
+        }
+        return null;
+    };
+
+    const commitTeam = () => {
+        const banner = document.querySelector('.commit-banner, .commitment');
+        const team = banner ? banner.querySelector('span, a') : null;
+        if (!team) return null;
+        const text = cleanText(team.textContent);
+        return ['committed', 'commitment', 'signed'].includes(text.toLowerCase()) ? null : text;
+    };
+
+    const linkHref = (css) => {
+        const link = document.querySelector(css);
+        return link ? href(link) : null;
+    };
+
+    const EXTRACTORS = {
+        markup: () => args.required.every((css) => document.querySelector(css) !== null),
+        ids: ids,
+        juco_link: jucoLink,
+        header: header,
+        hs_header: hsHeader,
+        juco_rankings: () => rankings(args.jucoRankings, 'JuniorCollege'),
+        hs_rankings: () => rankings(args.hsRankings, 'HighSchool'),
+        timeline_items: () => all(document, args.timelineItems).map((el) => el.textContent),
+        timeline_event_items: () => all(document, args.timelineEventItems).map((el) => el.textContent),
+        timeline_link: () => linkHref(args.timelineLink),
+        next_link: () => linkHref(args.nextLink),
+        commit_team: commitTeam,
+    };
+    const fields = {};
+    for (const key of args.keys) fields[key] = EXTRACTORS[key]();
+    return JSON.stringify(fields);
+}'''
+
+
+class ParseStats:
+    """
+    Counts how often extractors asked for a parsed document against how often we
+    actually serialized and parsed one. Every document request used to be a full
+    page.content() + BeautifulSoup parse of its own.
+    """
+
+    def __init__(self):
+        self.players = 0
+        self.requests = 0
+        self.parses = 0
+        self.parse_seconds = 0.0
+        self.serializations = 0
+        self.reused_captures = 0
+
+    def report(self):
+        if not self.players or not self.parses:
+            return
+        avg_parse_ms = self.parse_seconds / self.parses * 1000
+        requests = self.requests / self.players
+        parses = self.parses / self.players
+        print(f"\n🧩 HTML parsing ({self.players} players, {PARSER_BACKEND} backend):")
+        print(f"    → Per player: {parses:.1f} parses, {parses * avg_parse_ms:.0f} ms "
+              f"(before: {requests:.1f} parses, ~{requests * avg_parse_ms:.0f} ms)")
+        print(f"    → Browser DOM serializations: {self.serializations}, reused unchanged snapshots: {self.reused_captures}")
+
+
+PARSE_STATS = ParseStats()
+
+
+class PageSnapshot:
+    """
+    One fetched document (one DOM state for browser pages) plus where it came from.
+    The document is parsed lazily on first use and shared by every extractor.
+    """
+
+    def __init__(self, url: str, html: Optional[str], via: str, state=None, page_type: str = None,
+                 fields: dict = None):
+        self.url = url
+        self.html = html
+        self.via = via
+        self.state = state
+        self.page_type = page_type
+        self.fields = fields
+        self._doc = None
+
+    @property
+    def doc(self):
+        PARSE_STATS.requests += 1
+        if self._doc is None:
+            if self.html is None:
+                raise ValueError(f"No HTML captured for {self.url} (EXTRACT_MODE={EXTRACT_MODE})")
+            started = time.perf_counter()
+            self._doc = parse_html(self.html)
+            PARSE_STATS.parse_seconds += time.perf_counter() - started
+            PARSE_STATS.parses += 1
+        return self._doc
+
+    def extract(self, key: str):
+        """One named field: from the in-page extraction result if we have it, otherwise from the parsed HTML"""
+        if self.fields is not None and key in self.fields:
+            # Counted like a parse request: without the pool this would have needed the document
+            PARSE_STATS.requests += 1
+            return self.fields[key]
+        return SNAPSHOT_EXTRACTORS[key](self)
+
+
+# Python side of PAGE_EXTRACT_SCRIPT, keyed like SNAPSHOT_FIELDS
+SNAPSHOT_EXTRACTORS = {
+    'markup': lambda snapshot: has_required_markup(snapshot, snapshot.page_type),
+    'ids': lambda snapshot: extract_all_institution_ids(snapshot.doc, snapshot.url),
+    'juco_link': lambda snapshot: find_juco_profile_link(snapshot.doc),
+    'header': lambda snapshot: extract_profile_header(snapshot.doc),
+    'hs_header': lambda snapshot: extract_hs_header(snapshot.doc),
+    'juco_rankings': lambda snapshot: extract_rankings(snapshot.doc, JUCO_RANKINGS_MAP, institution_check="JuniorCollege"),
+    'hs_rankings': lambda snapshot: extract_rankings(snapshot.doc, HS_RANKINGS_MAP, institution_check="HighSchool"),
+    'timeline_items': lambda snapshot: extract_timeline_items(snapshot.doc),
+    'timeline_event_items': lambda snapshot: extract_timeline_items(snapshot.doc, TIMELINE_EVENT_ITEMS),
+    'timeline_link': lambda snapshot: extract_link_href(snapshot.doc, TIMELINE_EVENTS_LINK),
+    'next_link': lambda snapshot: extract_link_href(snapshot.doc, TIMELINE_NEXT_LINK),
+    'commit_team': lambda snapshot: extract_commit_banner_team(snapshot.doc),
+    'player_urls': lambda snapshot: extract_player_urls(snapshot.doc),
+    'load_more_link': lambda snapshot: extract_link_href(snapshot.doc, LOAD_MORE_LINK),
+    'list_rows': lambda snapshot: extract_list_rows(snapshot.doc),
+}
+
+
+class ExtractStats:
+    """
+    Bytes and time per browser-rendered page: page.content() against the in-page
+    extraction script, plus field mismatches between the two in compare mode.
+    """
+
+    def __init__(self):
+        self.page_types = {}
+        self.mismatches = {}
+
+    def record(self, page_type: str, path: str, size: int, seconds: float):
+        entry = self.page_types.setdefault(page_type, {})
+        count, total_size, total_seconds = entry.get(path, (0, 0, 0.0))
+        entry[path] = (count + 1, total_size + size, total_seconds + seconds)
+
+    def record_mismatch(self, page_type: str, key: str, expected, actual):
+        count = self.mismatches.get((page_type, key), 0)
+        self.mismatches[(page_type, key)] = count + 1
+        if not count:
+            print(f"      ⚠️  DEBUG: Extraction mismatch on {page_type}.{key}: html={str(expected)[:120]!r} "
+                  f"script={str(actual)[:120]!r}")
+
+    def report(self):
+        if not self.page_types:
+            return
+        print(f"\n📦 Browser page extraction ({EXTRACT_MODE} mode):")
+        for page_type, paths in sorted(self.page_types.items()):
+            parts = []
+            for path, (count, size, seconds) in sorted(paths.items()):
+                transfer = f"{size / count / 1024:.1f} KB, " if size else ""
+                parts.append(f"{path} {count}x ({transfer}{seconds / count * 1000:.1f} ms/page)")
+            print(f"    → {page_type}: " + ", ".join(parts))
+        if EXTRACT_MODE == 'compare':
+            if self.mismatches:
+                mismatched = ", ".join(f"{page_type}.{key} {count}x" for (page_type, key), count in sorted(self.mismatches.items()))
+                print(f"    ❌ Parity mismatches: {mismatched}")
+            else:
+                print(f"    ✓ Script output identical to the HTML extractors on every compared page")
+
+
+EXTRACT_STATS = ExtractStats()
+
+
+class FetchStats:
+    """Counts which path (plain HTTP, browser, HTTP-then-browser fallback) each page type took"""
+
+    def __init__(self):
+        self.page_types = {}
+
+    def record(self, page_type: str, path: str, seconds: float = 0.0):
+        entry = self.page_types.setdefault(page_type, {})
+        count, total = entry.get(path, (0, 0.0))
+        entry[path] = (count + 1, total + seconds)
+
+    def report(self):
+        if not self.page_types:
+            return
+        print(f"\n🌐 Fetch paths ({FETCH_MODE} mode):")
+        for page_type, paths in sorted(self.page_types.items()):
+            parts = [f"{path} {count} (avg {total / count * 1000:.0f} ms)" for path, (count, total) in sorted(paths.items())]
+            print(f"    → {page_type}: " + ", ".join(parts))
+
+
+FETCH_STATS = FetchStats()
+
+
+def has_required_markup(result: PageSnapshot, page_type: str) -> bool:
+    if result.fields is not None and 'markup' in result.fields:
+        return bool(result.fields['markup'])
+    if result.html is None:
+        return False
+    return all(result.doc.select_one(selector) for selector in REQUIRED_MARKUP.get(page_type, []))
+
+
+class HttpFetcher:
+    """Plain HTTP/keep-alive fetcher built on the context's APIRequestContext (shares its cookie jar)"""
+
+    name = 'http'
+
+    def __init__(self, request_context):
+        self.request = request_context
+
+    async def fetch(self, url: str, page_type: str):
+        try:
+            async with CONCURRENCY.slot(url) as slot:
+                response = await self.request.get(url, timeout=HTTP_TIMEOUT_MS, headers={
+                    'User-Agent': USER_AGENT,
+                    'Accept': 'text/html,application/xhtml+xml',
+                })
+                body = await response.body()
+                html = body.decode('utf-8', errors='replace')
+                outcome = slot.finish(response.status, html, response.headers)
+        except Exception as e:
+            print(f"      ⚠️  DEBUG: HTTP fetch failed for {url[:70]}: {e}")
+            raise fetch_failure(classify_response(error=e), detail=f"HTTP fetch failed: {e}") from e
+        TRAFFIC_STATS.record('document (http)', len(body))
+        if outcome != 'ok' or not response.ok:
+            print(f"      ⚠️  DEBUG: HTTP {response.status} ({outcome}) for {url[:70]}")
+            raise fetch_failure(outcome, response.status, f"HTTP {response.status} ({outcome})")
+        return await PARSE_POOL.prepare(PageSnapshot(response.url, html, self.name, page_type=page_type))
+
+
+class BrowserFetcher:
+    """
+    The original Playwright path: navigate a real tab and serialize the rendered DOM.
+    It remembers the snapshot of the page's current state and hands the same one back
+    until the main frame navigates or the DOM mutation counter moves.
+    """
+
+    name = 'browser'
+
+    def __init__(self, page):
+        self.page = page
+        self.navigations = 0
+        self.page_type = None
+        self._snapshot = None
+        page.on('framenavigated', self._on_navigated)
+
+    def _on_navigated(self, frame):
+        if frame == self.page.main_frame:
+            self.invalidate()
+
+    def invalidate(self):
+        self.navigations += 1
+        self._snapshot = None
+
+    async def fetch(self, url: str, page_type: str):
+        selector, legacy_ms, timeout = BROWSER_LOAD.get(page_type, (PROFILE_READY, 2000, 30000))
+        try:
+            async with CONCURRENCY.slot(url) as slot:
+                response = await self.page.goto(url, wait_until='domcontentloaded', timeout=timeout)
+                outcome = slot.finish(response.status if response else None, await self.page.title(),
+                                      response.headers if response else None)
+        except Exception as e:
+            print(f"      ⚠️  DEBUG: Browser navigation failed for {url[:70]}: {e}")
+            raise fetch_failure(classify_response(error=e), detail=f"navigation failed: {e}") from e
+        if outcome != 'ok' or (response is not None and response.status in (404, 410)):
+            print(f"      ⚠️  DEBUG: Browser got {outcome} for {url[:70]}")
+            raise fetch_failure(outcome, response.status if response else None, f"browser got {outcome}")
+        await wait_until_ready(self.page, f'{page_type}_load', legacy_ms, selector=selector)
+        return await self.capture(page_type)
+
+    async def capture(self, page_type: str = None) -> PageSnapshot:
+        """Snapshot of the tab's current DOM state; page_type defaults to the last page we loaded"""
+        self.page_type = page_type = page_type or self.page_type
+        try:
+            version = await self.page.evaluate('() => window.__scraperDomVersion || 0')
+        except Exception:
+            version = None
+        state = (self.navigations, version)
+        if self._snapshot is not None and version is not None and self._snapshot.state == state:
+            PARSE_STATS.reused_captures += 1
+            return self._snapshot
+        fields = await self._extract_in_page(page_type) if EXTRACT_MODE != 'html' else None
+        if fields is not None and EXTRACT_MODE == 'browser':
+            self._snapshot = PageSnapshot(self.page.url, None, self.name, state=state,
+                                          page_type=page_type, fields=fields)
+            return self._snapshot
+        started = time.perf_counter()
+        html = await self.page.content()
+        EXTRACT_STATS.record(page_type, 'content()', len(html.encode('utf-8')), time.perf_counter() - started)
+        PARSE_STATS.serializations += 1
+        self._snapshot = PageSnapshot(self.page.url, html, self.name, state=state, page_type=page_type)
+        if fields is not None:
+            self._compare_fields(fields)
+        else:
+            await PARSE_POOL.prepare(self._snapshot)
+        return self._snapshot
+
+    async def _extract_in_page(self, page_type: str) -> Optional[dict]:
+        """Runs PAGE_EXTRACT_SCRIPT once; None means 'serialize the HTML instead'"""
+        keys = SNAPSHOT_FIELDS.get(page_type)
+        if not keys:
+            return None
+        args = {
+            'keys': keys,
+            'required': REQUIRED_MARKUP.get(page_type, []),
+            'jucoRankings': JUCO_RANKINGS_MAP,
+            'hsRankings': HS_RANKINGS_MAP,
+            'timelineItems': TIMELINE_ITEMS,
+            'timelineEventItems': TIMELINE_EVENT_ITEMS,
+            'timelineLink': TIMELINE_EVENTS_LINK,
+            'nextLink': TIMELINE_NEXT_LINK,
+        }
+        started = time.perf_counter()
+        try:
+            payload = await self.page.evaluate(PAGE_EXTRACT_SCRIPT, args)
+        except Exception as e:
+            print(f"      ⚠️  DEBUG: In-page extraction failed, falling back to HTML: {e}")
+            return None
+        EXTRACT_STATS.record(page_type, 'evaluate()', len(payload.encode('utf-8')), time.perf_counter() - started)
+        fields = json.loads(payload)
+        for key in TIMELINE_TEXT_FIELDS.intersection(fields):
+            fields[key] = [classify_timeline_item(clean_text(text)) for text in fields[key]]
+        return fields
+
+    def _compare_fields(self, fields: dict):
+        """Compare mode: run the HTML extractors on the same DOM state and record any field that differs"""
+        snapshot = self._snapshot
+        started = time.perf_counter()
+        for key, actual in fields.items():
+            expected = SNAPSHOT_EXTRACTORS[key](snapshot)
+            if expected != actual:
+                EXTRACT_STATS.record_mismatch(snapshot.page_type, key, expected, actual)
+        EXTRACT_STATS.record(snapshot.page_type, 'parse+extract', 0, time.perf_counter() - started)
+
+
+class FetchEngine:
+    """
+    Per-worker fetch front end. Each page type goes over plain HTTP first and falls
+    back to the worker's browser tab when the response is missing required markup.
+    """
+
+    def __init__(self, browser: BrowserFetcher = None, http: HttpFetcher = None, mode: str = FETCH_MODE,
+                 year: int = None, pool: 'PagePool' = None):
+        self.browser = browser
+        self.http = http
+        self.mode = mode
+        self.year = year
+        self.pool = pool
+        self.borrowed = None
+        self.cache = PAGE_CACHE
+        self.fetches = 0
+        self.failure = None
+
+    @property
+    def page(self):
+        return self.browser.page if self.browser else None
+
+    @asynccontextmanager
+    async def branch(self):
+        """
+        Engine for a sub-fetch running alongside this one. It shares the HTTP fetcher and
+        borrows a tab of its own from the page pool only if it has to fall back to the browser.
+        """
+        branch = FetchEngine(None, self.http, self.mode, self.year, pool=self.pool)
+        try:
+            yield branch
+        finally:
+            if branch.borrowed is not None:
+                await self.pool.release(branch.borrowed, failed=branch.borrowed.crashed)
+
+    async def _browser_fetcher(self) -> Optional[BrowserFetcher]:
+        if self.browser is None and self.pool is not None:
+            self.borrowed = await self.pool.acquire(extra=True)
+            self.browser = self.borrowed.fetcher
+        return self.browser
+
+    async def fetch(self, url: str, page_type: str):
+        """The page, or None with the reason left in self.failure"""
+        self.fetches += 1
+        self.failure = None
+        # Incremental runs are there to see what changed, so player pages are fetched live (and still cached)
+        live_only = INCREMENTAL and CACHE_MODE != 'replay' and page_type in INCREMENTAL_LIVE_PAGE_TYPES
+        if self.cache is not None and not live_only:
+            started = time.perf_counter()
+            cached = self.cache.get(url, page_type, self.year)
+            if cached is not None:
+                FETCH_STATS.record(page_type, 'cache', time.perf_counter() - started)
+                return await PARSE_POOL.prepare(cached, page_type)
+            if CACHE_MODE == 'replay':
+                FETCH_STATS.record(page_type, 'failed')
+                self.failure = ScrapeFailure('cache_miss', f"no cached {page_type} page")
+                return None
+        result = await self._fetch_live(url, page_type)
+        if (self.cache is not None and result is not None and result.html is not None
+                and has_required_markup(result, page_type)):
+            self.cache.put(url, page_type, result)
+        return result
+
+    async def _fetch_live(self, url: str, page_type: str):
+        if self.http is not None and (self.mode != 'browser' or (self.browser is None and self.pool is None)):
+            started = time.perf_counter()
+            try:
+                result = await self.http.fetch(url, page_type)
+            except ScrapeFailure as e:
+                self.failure, result = e, None
+            if result is not None and has_required_markup(result, page_type):
+                FETCH_STATS.record(page_type, 'http', time.perf_counter() - started)
+                return result
+            if result is not None:
+                self.failure = ScrapeFailure('missing_selector', f"{page_type} page over HTTP lacks its required markup")
+            if self.mode == 'http':
+                FETCH_STATS.record(page_type, 'failed', time.perf_counter() - started)
+                return result
+            FETCH_STATS.record(page_type, 'http_miss', time.perf_counter() - started)
+        browser = await self._browser_fetcher()
+        if browser is None:
+            FETCH_STATS.record(page_type, 'failed')
+            self.failure = self.failure or ScrapeFailure('other', "no browser to fall back to")
+            return None
+        started = time.perf_counter()
+        try:
+            result = await browser.fetch(url, page_type)
+        except ScrapeFailure as e:
+            self.failure, result = e, None
+        FETCH_STATS.record(page_type, 'browser' if result is not None else 'failed', time.perf_counter() - started)
+        return result
+
+# =============================================================================
+# OFF-LOOP PARSING
+# =============================================================================
+# Parsing and extraction are the only CPU-heavy work in a run. Done on the event loop, one large
+# profile stalls every other tab's CDP traffic, waits and timeouts. Instead each fetched page is
+# handed to a worker process that runs all of its page type's extractors and returns plain dicts,
+# which become the snapshot's fields; extract() then never has to parse on the loop.
+
+# Fields computed in the pool per page type (rankings pages never go through the in-page script)
+POOL_FIELDS = dict(SNAPSHOT_FIELDS, rankings=['markup', 'player_urls', 'load_more_link', 'list_rows'])
+
+
+def init_parse_worker(backend: str):
+    global PARSER_BACKEND
+    PARSER_BACKEND = backend
+
+
+def extract_page_fields(html: str, url: str, page_type: str, fingerprints: bool = False) -> tuple:
+    """Pool stage: parses one page once and runs every extractor (and, for incremental runs, section fingerprint) it needs"""
+    started = time.perf_counter()
+    snapshot = PageSnapshot(url, html, 'pool', page_type=page_type)
+    fields = {key: SNAPSHOT_EXTRACTORS[key](snapshot) for key in POOL_FIELDS[page_type]}
+    if fingerprints:
+        fields['fingerprints'] = {section: html_section_fingerprint(snapshot.doc, url, section)
+                                  for section, section_page_type in FINGERPRINT_PAGE_TYPES.items()
+                                  if section_page_type == page_type}
+    return fields, time.perf_counter() - started
+
+
+class ParsePool:
+    """ProcessPoolExecutor (started on first use) that fills PageSnapshot.fields off the event loop"""
+
+    def __init__(self, workers: int):
+        self.workers = workers
+        self._executor = None
+        self.broken = False
+        self.pages = 0
+        self.parse_seconds = 0.0
+        self.wait_seconds = 0.0
+        self.fallbacks = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.workers > 0 and not self.broken
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # spawn: forking a process that runs Playwright's driver threads can deadlock the child
+            self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context('spawn'),
+                                                 initializer=init_parse_worker, initargs=(PARSER_BACKEND,))
+        return self._executor
+
+    async def prepare(self, snapshot: Optional[PageSnapshot], page_type: str = None) -> Optional[PageSnapshot]:
+        """Returns the snapshot with its fields extracted in a worker process; on any pool error it is left to parse inline"""
+        if snapshot is None:
+            return None
+        page_type = snapshot.page_type = snapshot.page_type or page_type
+        if not self.enabled or snapshot.html is None or snapshot.fields is not None or page_type not in POOL_FIELDS:
+            return snapshot
+        started = time.perf_counter()
+        try:
+            fields, seconds = await asyncio.get_running_loop().run_in_executor(
+                self._get_executor(), extract_page_fields, snapshot.html, snapshot.url, page_type, INCREMENTAL)
+        except BrokenProcessPool as e:
+            print(f"      ⚠️  DEBUG: Parse pool died ({e}), parsing on the event loop from now on")
+            self.broken = True
+            self.fallbacks += 1
+            return snapshot
+        except Exception as e:
+            print(f"      ⚠️  DEBUG: Off-loop extraction failed for {snapshot.url[:70]}, parsing inline: {e}")
+            self.fallbacks += 1
+            return snapshot
+        snapshot.fields = fields
+        self.pages += 1
+        self.parse_seconds += seconds
+        self.wait_seconds += time.perf_counter() - started
+        PARSE_STATS.parses += 1
+        PARSE_STATS.parse_seconds += seconds
+        return snapshot
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+
+    def report(self):
+        if not self.pages and not self.fallbacks:
+            return
+        print(f"\n🧵 Parse pool ({self.workers} worker processes):")
+        if self.pages:
+            print(f"    → {self.pages} pages parsed off the event loop: {self.parse_seconds / self.pages * 1000:.1f} ms "
+                  f"parse+extract, {(self.wait_seconds - self.parse_seconds) / self.pages * 1000:.1f} ms queue+transfer per page")
+        if self.fallbacks:
+            print(f"    → {self.fallbacks} pages fell back to parsing on the event loop")
+
+
+PARSE_POOL = ParsePool(PARSE_WORKERS)
+
+
+class LoopLagMonitor:
+    """
+    Sleeps LOOP_LAG_INTERVAL_MS at a time and records how late each wake-up is. Lateness is time
+    something held the event loop (a parse, a blocking write), during which no other page progressed.
+    Lag is also grouped by the number of requests in flight, to show it does not grow with concurrency.
+    """
+
+    def __init__(self, interval_ms: int, warn_ms: int):
+        self.interval = interval_ms / 1000
+        self.warn = warn_ms / 1000
+        self.lags = []
+        self.worst = []
+        self.by_in_flight = {}
+        self.started = None
+        self._task = None
+
+    def start(self):
+        if self.interval > 0 and self._task is None:
+            self.started = time.monotonic()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            self.record(max(0.0, loop.time() - expected))
+
+    def record(self, lag: float):
+        in_flight = sum(limiter.in_flight for limiter in CONCURRENCY.hosts.values())
+        self.lags.append(lag)
+        count, total, worst = self.by_in_flight.get(in_flight, (0, 0.0, 0.0))
+        self.by_in_flight[in_flight] = (count + 1, total + lag, max(worst, lag))
+        entry = (lag, time.monotonic() - self.started, in_flight)
+        if len(self.worst) < 5:
+            heapq.heappush(self.worst, entry)
+        elif lag > self.worst[0][0]:
+            heapq.heapreplace(self.worst, entry)
+        if lag > self.warn:
+            print(f"      🐢 DEBUG: Event loop blocked for {lag * 1000:.0f} ms ({in_flight} requests in flight)")
+
+    def report(self):
+        if not self.lags:
+            return
+        lags = sorted(self.lags)
+        stalls = sum(lag > self.warn for lag in lags)
+        where = f"{PARSE_POOL.workers} parse processes" if PARSE_POOL.workers else "parsing on the loop"
+        print(f"\n🐢 Event loop lag ({len(lags)} samples every {self.interval * 1000:.0f} ms, {where}):")
+        print(f"    → avg {sum(lags) / len(lags) * 1000:.1f} ms, p99 {lags[int(len(lags) * 0.99)] * 1000:.1f} ms, "
+              f"max {lags[-1] * 1000:.1f} ms, {stalls} stalls over {self.warn * 1000:.0f} ms")
+        worst = ", ".join(f"{lag * 1000:.0f} ms at +{offset:.0f}s ({in_flight} in flight)"
+                          for lag, offset, in_flight in sorted(self.worst, reverse=True))
+        print(f"    → Worst: {worst}")
+        levels = ", ".join(f"{in_flight}: avg {total / count * 1000:.1f} / max {worst * 1000:.0f} ms"
+                           for in_flight, (count, total, worst) in sorted(self.by_in_flight.items()))
+        print(f"    → By requests in flight: {levels}")
+
+
+LOOP_LAG = LoopLagMonitor(LOOP_LAG_INTERVAL_MS, LOOP_LAG_WARN_MS)
+
+# =============================================================================
+# PAGE CACHE
+# =============================================================================
+
+def normalize_url(url: str) -> str:
+    """Canonical form used as the cache key: lowercase host, no fragment, sorted query, trailing slash"""
+    parts = urlparse(url.strip())
+    path = parts.path or '/'
+    if not path.endswith('/') and '.' not in path.rsplit('/', 1)[-1]:
+        path += '/'
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunparse((parts.scheme.lower() or 'https', parts.netloc.lower(), path, '', query, ''))
+
+
+def cache_ttl_seconds(page_type: str, year: int = None) -> float:
+    hours = CACHE_TTL_HOURS.get(page_type, 24)
+    if year is not None and year <= datetime.now().year - CACHE_HISTORICAL_AGE_YEARS:
+        hours = max(hours, CACHE_HISTORICAL_TTL_HOURS)
+    return hours * 3600
+
+
+class PageCache:
+    """
+    Content-addressed on-disk cache of fetched HTML.
+    Entries are gzipped JSON keyed by the SHA-256 of the normalized URL, expire after a
+    per-page-type TTL (much longer for historical classes), and the directory is kept
+    under CACHE_MAX_MB by evicting the least recently used entries.
+    """
+
+    def __init__(self, root: Path, max_bytes: int):
+        self.root = root
+        self.max_bytes = max_bytes
+        self._index = None
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.stores = 0
+        self.evictions = 0
+        self.bytes_served = 0
+
+    def _path(self, url: str) -> Path:
+        key = hashlib.sha256(normalize_url(url).encode('utf-8')).hexdigest()
+        return self.root / key[:2] / f"{key}.json.gz"
+
+    def _load_index(self) -> dict:
+        """path -> (last access, size); built once from the directory, then kept in memory"""
+        if self._index is None:
+            self._index = {}
+            if self.root.exists():
+                for path in self.root.glob('*/*.json.gz'):
+                    stat = path.stat()
+                    self._index[path] = (stat.st_mtime, stat.st_size)
+        return self._index
+
+    def get(self, url: str, page_type: str, year: int = None):
+        path = self._path(url)
+        try:
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        if CACHE_MODE != 'replay' and time.time() - entry['fetched_at'] > cache_ttl_seconds(page_type, year):
+            self.expired += 1
+            self.misses += 1
+            return None
+        now = time.time()
+        os.utime(path, (now, now))
+        index = self._load_index()
+        index[path] = (now, index.get(path, (now, path.stat().st_size))[1])
+        self.hits += 1
+        self.bytes_served += len(entry['html'])
+        return PageSnapshot(entry['final_url'], entry['html'], 'cache', page_type=page_type)
+
+    def put(self, url: str, page_type: str, result):
+        path = self._path(url)
+        entry = {
+            'url': url,
+            'final_url': result.url,
+            'page_type': page_type,
+            'fetched_at': time.time(),
+            'html': result.html,
+        }
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix('.tmp')
+            with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"      ⚠️  DEBUG: Could not write cache entry for {url[:70]}: {e}")
+            return
+        self.stores += 1
+        index = self._load_index()
+        index[path] = (time.time(), path.stat().st_size)
+        self._evict(index)
+
+    def _evict(self, index: dict):
+        total = sum(size for _, size in index.values())
+        if total <= self.max_bytes:
+            return
+        for path, (_, size) in sorted(index.items(), key=lambda kv: kv[1][0]):
+            if total <= self.max_bytes:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                pass
+            del index[path]
+            total -= size
+            self.evictions += 1
+
+    def report(self):
+        lookups = self.hits + self.misses
+        if not lookups and not self.stores:
+            return
+        size_mb = sum(size for _, size in self._load_index().values()) / 1024 / 1024
+        hit_rate = 100 * self.hits / lookups if lookups else 0
+        print(f"\n🗄️  Page cache ({CACHE_MODE} mode, {self.root}):")
+        print(f"    → {self.hits} hits / {self.misses} misses ({hit_rate:.1f}% hit rate), {self.expired} expired")
+        print(f"    → {self.stores} stored, {self.evictions} evicted, {size_mb:.1f} MB on disk, "
+              f"{self.bytes_served / 1024 / 1024:.1f} MB served from cache")
+
+
+PAGE_CACHE = PageCache(CACHE_DIR, CACHE_MAX_MB * 1024 * 1024) if CACHE_MODE != 'off' else None
+# Page types an INCREMENTAL run never reads from the cache: a cached copy would fingerprint as unchanged
+INCREMENTAL_LIVE_PAGE_TYPES = ('profile', 'hs', 'timeline')
+
+# =============================================================================
+# RESULT STORE
+# =============================================================================
+
+class ResultStore:
+    """
+    Parsed results keyed by 247 ID, shared by every player and class in the run and kept on
+    disk (cache/results/<kind>/<id>.json) for later runs. 'hs' entries hold an HS profile's
+    columns; 'player' entries hold a player's JUCO columns and raw timeline items, which are
+    re-applied for each class year. Entries expire with the page cache TTL of their page type,
+    capped at RESULT_STORE_MAX_AGE_HOURS.
+    """
+
+    PAGE_TYPES = {'hs': 'hs', 'player': 'profile'}
+
+    def __init__(self, root: Path, enabled: bool = True):
+        self.root = root
+        self.enabled = enabled
+        self.entries = {}
+        self.stored = set()
+        self._locks = {}
+        self.hits = Counter()
+        self.misses = Counter()
+        self.stores = Counter()
+        self.pages_avoided = 0
+        self.waits = 0
+
+    def _path(self, kind: str, key: str) -> Path:
+        return self.root / kind / f"{key}.json"
+
+    def get(self, kind: str, key: str, year: int = None, this_run: bool = False) -> Optional[dict]:
+        """A live entry, or None; this_run only accepts entries this run stored itself"""
+        if not self.enabled or not key or key == "NA":
+            return None
+        if this_run and (kind, key) not in self.stored:
+            self.misses[kind] += 1
+            return None
+        entry = self.entries.get((kind, key))
+        if entry is None:
+            try:
+                entry = json.loads(self._path(kind, key).read_text(encoding='utf-8'))
+            except (OSError, ValueError):
+                entry = None
+        ttl = min(cache_ttl_seconds(self.PAGE_TYPES[kind], year), RESULT_STORE_MAX_AGE_HOURS * 3600)
+        if entry is None or (CACHE_MODE != 'replay' and time.time() - entry['stored_at'] > ttl):
+            self.misses[kind] += 1
+            return None
+        self.entries[(kind, key)] = entry
+        return entry
+
+    def hit(self, kind: str, entry: dict):
+        self.hits[kind] += 1
+        self.pages_avoided += entry['pages']
+
+    def miss(self, kind: str):
+        """A stored entry that could not answer this lookup (e.g. a timeline walk that stopped too early)"""
+        self.misses[kind] += 1
+
+    def put(self, kind: str, key: str, entry: dict, pages: int):
+        if not self.enabled or not key or key == "NA":
+            return
+        entry = dict(entry, stored_at=time.time(), pages=pages)
+        self.entries[(kind, key)] = entry
+        self.stored.add((kind, key))
+        path = self._path(kind, key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix('.tmp')
+            tmp_path.write_text(json.dumps(entry), encoding='utf-8')
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"      ⚠️  DEBUG: Could not write result store entry {kind}/{key}: {e}")
+            return
+        self.stores[kind] += 1
+
+    @asynccontextmanager
+    async def exclusive(self, kind: str, key: str):
+        """One worker at a time per key: a second lookup waits for the first result instead of redoing it"""
+        lock = self._locks.setdefault((kind, key), asyncio.Lock())
+        if lock.locked():
+            self.waits += 1
+        async with lock:
+            yield
+
+    def report(self):
+        if not self.enabled or not (self.hits or self.misses):
+            return
+        print(f"\n🧠 Result store ({self.root}):")
+        for kind in self.PAGE_TYPES:
+            lookups = self.hits[kind] + self.misses[kind]
+            if lookups:
+                print(f"    → {kind}: {self.hits[kind]} reused / {lookups} lookups "
+                      f"({100 * self.hits[kind] / lookups:.1f}% dedup), {self.stores[kind]} stored")
+        print(f"    → ~{self.pages_avoided} page loads and parses avoided, "
+              f"{self.waits} lookups waited on a duplicate already in flight")
+
+
+RESULT_STORE = ResultStore(RESULT_STORE_DIR, enabled=RESULT_STORE_MODE != 'off')
+
+
+def replay_timeline(data: dict, timeline: dict, year: int, do_deep_dive: bool) -> bool:
+    """
+    Re-applies stored timeline items for this class year, exactly as parse_timeline would have.
+    False when the stored walk cannot answer: no deep dive was done, or it stopped at another
+    year's commitment before reaching the pages this year would have needed.
+    """
+    for item in timeline['profile_items']:
+        apply_timeline_item(data, item, year)
+    if not do_deep_dive or data.get('_date_priority', -1) >= 100:
+        return True
+    if not timeline['deep']:
+        return False
+    for item in timeline['event_items']:
+        if apply_timeline_item(data, item, year, include_draft=False) and item['priority'] == 100:
+            return True
+    return timeline['complete']
+
+
+def reuse_player_result(data: dict, player_id: str, year: int, do_deep_dive: bool) -> bool:
+    """
+    Fills the JUCO and timeline columns from the result store; False means load the profile.
+    Incremental runs only take what another class stored this run: an older entry would hide
+    the signing, commitment and draft changes the manifest is there to catch.
+    """
+    entry = RESULT_STORE.get('player', player_id, year, this_run=INCREMENTAL)
+    if entry is None:
+        return False
+    row = dict(data)
+    row.update(entry['juco'])
+    row['Class'] = str(year)
+    if not replay_timeline(row, entry['timeline'], year, do_deep_dive):
+        RESULT_STORE.miss('player')
+        return False
+    if row['Signed Team'] == "NA":
+        row['Signed Team'] = entry['commit_team'] or "NA"
+    data.update(row)
+    data['_incremental']['profile_url'] = entry['profile_url']
+    data['_incremental']['fingerprints'].update(entry['fingerprints'])
+    RESULT_STORE.hit('player', entry)
+    print(f"      🧠 DEBUG: Reusing parsed profile and timeline for 247 ID {player_id} "
+          f"({(time.time() - entry['stored_at']) / 3600:.1f}h old, {entry['pages']} page loads saved)")
+    return True
+
+# =============================================================================
+# INCREMENTAL RE-SCRAPE
+# =============================================================================
+# Each row is built from three sections: the JUCO profile header/IDs/rankings, its timeline
+# (signing, commitment, draft) and the HS profile. A section is fingerprinted from the elements
+# its extractors read, so unrelated markup churn (ads, scripts, view counts) never forces a re-parse.
+
+FINGERPRINT_SELECTORS = {
+    'juco': ['.name, h1.name', '.metrics-list li, .details li, ul.vitals li',
+             'section.rankings, section.rankings-section, div.ranking-section', 'a[href*="/player/"]'],
+    'timeline': [TIMELINE_ITEMS, TIMELINE_EVENTS_LINK, '.commit-banner, .commitment'],
+    'hs': ['.institution, .team-name, h2.institution', '.metrics-list li, .details li, ul.vitals li',
+           'section.rankings, section.rankings-section, div.ranking-section'],
+}
+# Pages extracted in the browser (EXTRACT_MODE=browser) carry no HTML: their script fields are hashed instead
+FINGERPRINT_FIELDS = {
+    'juco': ['ids', 'header', 'juco_rankings'],
+    'timeline': ['timeline_items', 'timeline_link', 'commit_team'],
+    'hs': ['hs_header', 'hs_rankings'],
+}
+# Page type each section is read from (the parse pool fingerprints these alongside extraction)
+FINGERPRINT_PAGE_TYPES = {'juco': 'profile', 'timeline': 'profile', 'hs': 'hs'}
+# CSV columns each section fills in
+SECTION_COLUMNS = {
+    'juco': ["247 Base ID", "247 JUCO ID", "247 HS ID", "247 College IDs",
+             "Player Name", "Position", "Height", "Weight", "City, ST", "Class", "Junior College",
+             "247 JUCO Stars", "247 JUCO Rating", "247 JUCO National Rank",
+             "247 JUCO Position", "247 JUCO Position Rank",
+             "Composite JUCO Stars", "Composite JUCO Rating", "Composite JUCO National Rank",
+             "Composite JUCO Position", "Composite JUCO Position Rank"],
+    'timeline': ["Signed Date", "Signed Team", "Draft Date", "Draft Team"],
+    'hs': ["High School", "HS Class Year",
+           "247 HS Stars", "247 HS Rating", "247 HS National Rank",
+           "247 HS Position", "247 HS Position Rank",
+           "Composite HS Stars", "Composite HS Rating", "Composite HS National Rank",
+           "Composite HS Position", "Composite HS Position Rank"],
+}
+# Columns that change on every run and are left out of the delta file
+DELTA_IGNORED_COLUMNS = {'Scrape Date'}
+DELTA_HEADERS = ["Profile URL", "Player Name", "Change", "Field", "Old Value", "New Value"]
+
+
+def section_fingerprint(snapshot: PageSnapshot, section: str) -> Optional[str]:
+    """
+    Short SHA-256 over the text and link targets of everything one section's extractors read.
+    None outside incremental mode, where there is no manifest entry to compare it with.
+    """
+    if not INCREMENTAL:
+        return None
+    fingerprints = (snapshot.fields or {}).get('fingerprints', {})
+    if section in fingerprints:
+        return fingerprints[section]
+    if snapshot.html is None:
+        digest = hashlib.sha256(snapshot.url.encode('utf-8'))
+        fields = {key: snapshot.extract(key) for key in FINGERPRINT_FIELDS[section]}
+        digest.update(json.dumps(fields, sort_keys=True, default=str).encode('utf-8'))
+        return digest.hexdigest()[:16]
+    return html_section_fingerprint(snapshot.doc, snapshot.url, section)
+
+
+def html_section_fingerprint(doc, url: str, section: str) -> str:
+    digest = hashlib.sha256(url.encode('utf-8'))
+    for selector in FINGERPRINT_SELECTORS[section]:
+        digest.update(b'\x1d')
+        for node in doc.select(selector):
+            digest.update(node.text(strip=True).encode('utf-8'))
+            digest.update(b'\x1f' + node.attr('href').encode('utf-8') + b'\x1e')
+    return digest.hexdigest()[:16]
+
+
+def reuse_section(data: dict, previous: Optional[dict], section: str, fingerprint: str = None) -> bool:
+    """
+    Copies a section's columns from the manifest row when its fingerprint has not moved
+    (no fingerprint means the caller already knows it is unchanged). False means re-parse it.
+    """
+    state = data['_incremental']
+    if fingerprint is not None:
+        state['fingerprints'][section] = fingerprint
+    known = previous['fingerprints'].get(section) if previous else None
+    if known is None or (fingerprint is not None and fingerprint != known):
+        state['reparsed'].append(section)
+        return False
+    state['fingerprints'][section] = known
+    data.update({column: previous['row'].get(column, "NA") for column in SECTION_COLUMNS[section]})
+    return True
+
+
+class IncrementalStats:
+    """Per year: players checked against the manifest, how many needed no re-parse and which sections did"""
+
+    def __init__(self):
+        self.years = {}
+
+    def record(self, year: int, reparsed: list, status: str):
+        entry = self.years.setdefault(year, {'checked': 0, 'skipped': 0, 'sections': Counter(), 'status': Counter()})
+        entry['checked'] += 1
+        entry['skipped'] += not reparsed
+        entry['sections'].update(reparsed)
+        entry['status'][status] += 1
+
+    def report(self):
+        if not INCREMENTAL or not self.years:
+            return
+        print(f"\n♻️  Incremental re-scrape{' (full check)' if INCREMENTAL_FULL_CHECK else ''}:")
+        for year, entry in sorted(self.years.items()):
+            sections = ", ".join(f"{section} {entry['sections'][section]}" for section in SECTION_COLUMNS)
+            print(f"    → {year}: {entry['skipped']}/{entry['checked']} players skipped "
+                  f"({100 * entry['skipped'] / entry['checked']:.1f}% skip rate), re-parsed {sections}; "
+                  f"{entry['status']['changed']} rows changed, {entry['status']['new']} new")
+
+
+INCREMENTAL_STATS = IncrementalStats()
+
+
+class PlayerManifest:
+    """
+    Per-year record of every scraped player (output/manifests/manifest_<year>.json): the resolved
+    JUCO profile URL, one fingerprint per section and the row they produced. Rows that differ from
+    the previous entry are collected as deltas, one line per changed column.
+    """
+
+    SAVE_EVERY = 25
+
+    def __init__(self, year: int, directory: Path = None):
+        self.year = year
+        self.path = (directory or MANIFEST_DIR) / f"manifest_{year}{shard_suffix()}.json"
+        self.players = {}
+        self.baseline = 0
+        self.checked = 0
+        self.deltas = []
+        self._unsaved = 0
+
+    def load(self):
+        if self.path.exists():
+            try:
+                self.players = json.loads(self.path.read_text(encoding='utf-8'))['players']
+            except (OSError, ValueError, KeyError) as e:
+                print(f"  ⚠️  Could not read manifest {self.path.name}: {e}")
+        self.baseline = len(self.players)
+        return self
+
+    def previous(self, url: str) -> Optional[dict]:
+        """The entry incremental parsing starts from (None outside incremental mode)"""
+        return self.players.get(url) if INCREMENTAL else None
+
+    def update(self, url: str, row: dict, state: dict):
+        entry = self.players.get(url)
+        if entry is None:
+            status = 'new'
+            self.deltas.append([url, row['Player Name'], 'new', '', '', ''])
+        else:
+            changes = [(column, entry['row'].get(column, "NA"), row.get(column, "NA")) for column in CSV_HEADERS
+                       if column not in DELTA_IGNORED_COLUMNS and entry['row'].get(column, "NA") != row.get(column, "NA")]
+            status = 'changed' if changes else 'unchanged'
+            for column, old, new in changes:
+                self.deltas.append([url, row['Player Name'], 'changed', column, old, new])
+            if changes:
+                print(f"    🔁 Changed since {entry['checked_at']}: {', '.join(column for column, _, _ in changes)}")
+        INCREMENTAL_STATS.record(self.year, state['reparsed'], status)
+        self.checked += 1
+        self.players[url] = {
+            # Only a resolved JUCO profile is worth going straight to next time
+            'profile_url': state['profile_url'] if '/junior-college-' in (state['profile_url'] or '') else None,
+            'fingerprints': {section: value for section, value in state['fingerprints'].items() if value is not None},
+            'row': row,
+            'checked_at': datetime.now().isoformat(timespec='seconds'),
+        }
+        self._unsaved += 1
+        if self._unsaved >= self.SAVE_EVERY:
+            self.save()
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix('.tmp')
+        tmp_path.write_text(json.dumps({'year': self.year, 'players': self.players}), encoding='utf-8')
+        os.replace(tmp_path, self.path)
+        self._unsaved = 0
+
+    def write_delta(self) -> Optional[Path]:
+        """Changed and new rows since the previous manifest, as output/deltas/delta_<year>_<timestamp>.csv"""
+        if not self.baseline or not self.checked:
+            return None
+        DELTA_DIR.mkdir(parents=True, exist_ok=True)
+        path = DELTA_DIR / f"delta_{self.year}_{datetime.now().strftime('%Y%m%d_%H%M%S')}{shard_suffix()}.csv"
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(DELTA_HEADERS)
+            writer.writerows(self.deltas)
+        return path
+
+# =============================================================================
+# PROFILE PARSING
+# =============================================================================
+
+class ProfileIndex:
+    """
+    Persistent player ID -> JUCO profile URL index (PROFILE_INDEX, JSON). Institution IDs never
+    change, so once any run has resolved a player's JUCO profile, later runs and classes open it
+    on the first navigation instead of loading the cover profile and looking for the link.
+    Saves merge with the file on disk, so shard and queue processes can share one index.
+    """
+
+    SAVE_EVERY = 25
+
+    def __init__(self, path: Optional[Path]):
+        self.path = path
+        self._entries = None
+        self._unsaved = {}
+
+    @property
+    def entries(self) -> dict:
+        if self._entries is None:
+            self._entries = self._read()
+        return self._entries
+
+    def _read(self) -> dict:
+        if self.path is None or not self.path.exists():
+            return {}
+        try:
+            return json.loads(self.path.read_text(encoding='utf-8'))
+        except (OSError, ValueError) as e:
+            print(f"  ⚠️  Could not read profile index {self.path}: {e}")
+            return {}
+
+    def get(self, player_id: str) -> Optional[str]:
+        return self.entries.get(player_id) if self.path is not None and player_id != "NA" else None
+
+    def record(self, player_id: str, profile_url: str):
+        if self.path is None or player_id == "NA" or '/junior-college-' not in profile_url:
+            return
+        if self.entries.get(player_id) != profile_url:
+            self.entries[player_id] = self._unsaved[player_id] = profile_url
+            if len(self._unsaved) >= self.SAVE_EVERY:
+                self.save()
+
+    def forget(self, player_id: str):
+        """A stale URL (the profile moved or is gone) is dropped and resolved again from the player URL"""
+        self.entries.pop(player_id, None)
+        self._unsaved.pop(player_id, None)
+
+    def save(self):
+        if self.path is None or not self._unsaved:
+            return
+        entries = dict(self._read(), **self._unsaved)
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(f'.{os.getpid()}.tmp')
+            tmp_path.write_text(json.dumps(entries), encoding='utf-8')
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"  ⚠️  Could not write profile index {self.path}: {e}")
+            return
+        self._entries = entries
+        self._unsaved = {}
+
+
+PROFILE_INDEX = ProfileIndex(PROFILE_INDEX_PATH)
+
+
+class NavigationStats:
+    """How each player reached its JUCO profile, against the old cover page -> dropdown -> JUCO page route"""
+
+    def __init__(self):
+        self.players = 0
+        self.profile_loads = 0
+        self.direct = 0
+        self.stale = 0
+        self.already_juco = 0
+        self.from_ids = 0
+        self.dropdowns = 0
+        self.dropdowns_avoided = 0
+
+    def report(self):
+        if not self.players:
+            return
+        # Old route: every player loaded its first URL, then the JUCO profile (reloading it if already there)
+        saved = self.direct + self.already_juco - self.stale
+        print(f"\n🧭 JUCO profile resolution ({self.players} players):")
+        print(f"    → {self.profile_loads} profile navigations ({self.profile_loads / self.players:.2f} per player), "
+              f"~{saved} saved ({saved / self.players:.2f} per player)")
+        print(f"    → Opened directly from index/manifest: {self.direct} ({self.stale} stale), "
+              f"already on the JUCO profile: {self.already_juco}, built from institution IDs: {self.from_ids}")
+        if self.dropdowns or self.dropdowns_avoided:
+            print(f"    → Cover dropdown clicks: {self.dropdowns}, avoided: {self.dropdowns_avoided}")
+
+
+NAVIGATION_STATS = NavigationStats()
+
+
+async def reveal_juco_profile_link_from_cover(browser: BrowserFetcher):
+    """
+    Browser fallback for cover profiles (2022 and earlier): click the JUCO dropdown
+    using JavaScript so its links render, then return the JUCO profile URL (or None).
+    """
+    page = browser.page
+    try:
+        print(f"      → DEBUG: Checking if this is a cover profile...")
+        
+        # Wait for page to render
+        await wait_until_ready(page, 'cover_render', 2000, selector=PROFILE_READY)
+        
+        # Try to click JUCO dropdown using JavaScript with valid selector
+        print(f"      → DEBUG: Attempting to click JUCO dropdown with JavaScript...")
         try:
-            ids = await extract_all_institution_ids(page)
-            data['247 Base ID'] = ids['base'] or "NA"
-            data['247 JUCO ID'] = ids['juco'] or "NA"
-            # HS ID will be updated later if we find HS profile
-            data['247 HS ID'] = ids['hs'] or "NA"
-            data['247 College IDs'] = ','.join(ids['colleges']) if ids['colleges'] else "NA"
+            clicked = await page.evaluate('''() => {
+                // Find any element (a or button) that contains "JUCO" text
+                const elements = Array.from(document.querySelectorAll('a, button, div'));
+                const jucoButton = elements.find(el => {
+                    const text = el.textContent || '';
+                    return text.includes('JUCO') && !text.includes('(JUCO)');
+                });
+                if (jucoButton) {
+                    jucoButton.click();
+                    return true;
+                }
+                return false;
+            }''')
+            
+            if clicked:
+                print(f"      ✓ DEBUG: Clicked JUCO button, waiting for dropdown...")
+                await wait_until_ready(page, 'cover_dropdown', 1500, selector=JUCO_PROFILE_LINK, timeout_ms=1500)
+            else:
+                print(f"      → DEBUG: No JUCO button found (might already be on JUCO profile)")
+                
         except Exception as e:
-            print(f"      ⚠️  DEBUG: Could not extract all IDs: {e}")
-            data['247 Base ID'] = "NA"
-            data['247 JUCO ID'] = "NA"
-            data['247 HS ID'] = "NA"
-            data['247 College IDs'] = "NA"
+            print(f"      → DEBUG: JUCO button click attempt: {e}")
         
-        # --- 3. NOW SCRAPE JUCO DATA ---
-        html = await page.content()
-        from bs4 import BeautifulSoup
-        soup = BeautifulSoup(html, 'html.parser')
+        # Now look for JUCO profile link in the dropdown
+        snapshot = await browser.capture()
+        return snapshot.extract('juco_link')
         
-        # Header Info
-        name_elem = soup.select_one('.name') or soup.select_one('h1.name')
-        if name_elem: data['Player Name'] = clean_text(name_elem.get_text())
+    except Exception as e:
+        print(f"      ⚠️  DEBUG: Error in reveal_juco_profile_link_from_cover: {e}")
+        return None  # Continue anyway
+
+
+async def resolve_juco_profile(engine: FetchEngine, doc: PageSnapshot) -> PageSnapshot:
+    """
+    Follows a cover profile to the player's JUCO-specific profile when there is one. The URL comes
+    from the page's '(JUCO)' link or its institution IDs; only a cover page that shows neither gets
+    the browser dropdown click.
+    """
+    if '/junior-college-' in urlparse(doc.url).path:
+        NAVIGATION_STATS.already_juco += 1
+        print(f"      ✓ DEBUG: Already on the JUCO profile")
+        return doc
+    juco_url = doc.extract('juco_link')
+    if not juco_url:
+        ids = doc.extract('ids')
+        juco_url = institution_profile_url(doc.url, ids['base'], 'junior-college', ids['juco'])
+        NAVIGATION_STATS.from_ids += bool(juco_url)
+    if not juco_url and doc.via == 'browser':
+        NAVIGATION_STATS.dropdowns += 1
+        juco_url = await reveal_juco_profile_link_from_cover(engine.browser)
+    elif doc.via == 'browser':
+        NAVIGATION_STATS.dropdowns_avoided += 1
+    if not juco_url:
+        print(f"      → DEBUG: No JUCO profile link found (might already be on correct profile)")
+        return doc
+    print(f"      ✓ DEBUG: Found JUCO profile link")
+    print(f"      → DEBUG: Loading JUCO profile: {juco_url[:70]}...")
+    NAVIGATION_STATS.profile_loads += 1
+    juco_doc = await engine.fetch(juco_url, 'profile')
+    if juco_doc is None:
+        return doc
+    print(f"      ✓ DEBUG: Successfully loaded JUCO recruiting profile")
+    return juco_doc
+
+
+async def find_timeline_url(engine: FetchEngine, doc: PageSnapshot):
+    """Finds the 'see all' TimelineEvents link; browser-rendered pages are scrolled first so it lazy-loads"""
+    href = doc.extract('timeline_link')
+    if not href and doc.via == 'browser':
+        page = engine.page
+        await page.evaluate('window.scrollTo(0, document.body.scrollHeight)')
+        await wait_until_ready(page, 'timeline_link', 1500, selector=TIMELINE_EVENTS_LINK, timeout_ms=1500)
+        see_all_link = page.locator(TIMELINE_EVENTS_LINK)
+        if await see_all_link.count() > 0:
+            href = await see_all_link.first.get_attribute('href')
+    if not href:
+        return None
+    return f"https://247sports.com{href}" if href.startswith('/') else href
+
+
+async def next_timeline_page(engine: FetchEngine, timeline_doc: PageSnapshot):
+    """Loads the next page of the full timeline, following the link's href or clicking it in the browser"""
+    href = timeline_doc.extract('next_link')
+    if href is None:
+        return None
+    if href and not href.startswith('#') and not href.startswith('javascript'):
+        next_url = f"https://247sports.com{href}" if href.startswith('/') else href
+        return await engine.fetch(next_url, 'timeline')
+    if timeline_doc.via != 'browser':
+        return None
+    page = engine.page
+    next_button = page.locator(TIMELINE_NEXT_LINK)
+    if await next_button.count() > 0 and await next_button.is_visible():
+        first_item = await page.evaluate(
+            "() => document.querySelector('ul.timeline-event-index_lst li')?.textContent ?? null")
+        await next_button.click()
+        await wait_until_ready(page, 'timeline_next_page', 1000,
+                               function=TIMELINE_PAGE_CHANGED, arg=first_item)
+        return await engine.browser.capture()
+    return None
+
+
+class TimelineStats:
+    """What the TimelineEvents deep dive cost per player and why each walk stopped"""
+
+    def __init__(self):
+        self.walks = 0
+        self.seconds = 0.0
+        self.pages = 0
+        self.wasted = 0
+        self.stops = Counter()
+
+    def record(self, stop: str, seconds: float = 0.0):
+        self.stops[stop] += 1
+        if stop != 'profile_commitment':
+            self.walks += 1
+            self.seconds += seconds
+
+    def report(self):
+        if not self.stops:
+            return
+        print(f"\n📜 Timeline deep dive (budget {TIMELINE_BUDGET_S:.0f}s, {TIMELINE_PAGE_CONCURRENCY} pages at a time):")
+        if self.walks:
+            print(f"    → {self.walks} walks: {self.pages / self.walks:.1f} pages, {self.seconds / self.walks:.2f}s per player, "
+                  f"{self.wasted} pages fetched past the stop")
+        print("    → Stopped at: " + ", ".join(f"{stop.replace('_', ' ')} {count}" for stop, count in self.stops.most_common()))
+
+
+TIMELINE_STATS = TimelineStats()
+
+
+def timeline_page_url(first_url: str, param: str, number: int) -> str:
+    """TimelineEvents page `number`, using the page parameter name the site's own next link uses"""
+    parts = urlparse(first_url)
+    query = [(key, value) for key, value in parse_qsl(parts.query) if key.lower() != 'page'] + [(param, str(number))]
+    return urlunparse(parts._replace(query=urlencode(query)))
+
+
+async def fetch_timeline_pages(engine: FetchEngine, first_url: str, param: str, numbers: range) -> list:
+    """Several numbered pages at once; each rides a branch engine so browser fallbacks get their own tab"""
+    async def fetch(number: int):
+        async with engine.branch() as branch:
+            page = await branch.fetch(timeline_page_url(first_url, param, number), 'timeline')
+            if page is None:
+                engine.failure = branch.failure
+            return page
+    pages = await asyncio.gather(*(fetch(number) for number in numbers))
+    engine.fetches += len(pages)
+    return list(pages)
+
+
+async def walk_timeline_pages(engine: FetchEngine, first_url: str, data: dict, year: int, record: dict):
+    """
+    Applies the TimelineEvents pages in order until a commitment inside the class window turns up,
+    the list ends, TIMELINE_MAX_PAGES or the player's TIMELINE_BUDGET_S. Page 1's next link tells us
+    how the list paginates: numbered pages are requested TIMELINE_PAGE_CONCURRENCY at a time,
+    script-only pagination is clicked through one page after another.
+    """
+    started = time.perf_counter()
+    first = await engine.fetch(first_url, 'timeline')
+    if first is None:
+        record['error'] = True
+        TIMELINE_STATS.record('error', time.perf_counter() - started)
+        return
+    param_match = re.search(r'[?&](page)=\d+', first.extract('next_link') or '', re.IGNORECASE)
+    batch, number = [first], 1
+    while True:
+        for index, timeline_doc in enumerate(batch):
+            if timeline_doc is None:
+                record['error'] = True
+                TIMELINE_STATS.record('error', time.perf_counter() - started)
+                return
+            TIMELINE_STATS.pages += 1
+            for item in timeline_doc.extract('timeline_event_items'):
+                record['event_items'].append(item)
+                if apply_timeline_item(data, item, year, include_draft=False) and item['priority'] == 100:
+                    record['complete'] = False
+                    TIMELINE_STATS.wasted += len(batch) - index - 1
+                    TIMELINE_STATS.record('commitment', time.perf_counter() - started)
+                    return
+            if timeline_doc.extract('next_link') is None:
+                TIMELINE_STATS.wasted += len(batch) - index - 1
+                TIMELINE_STATS.record('last_page', time.perf_counter() - started)
+                return
+        if number >= TIMELINE_MAX_PAGES:
+            TIMELINE_STATS.record('page_limit', time.perf_counter() - started)
+            return
+        if time.perf_counter() - started > TIMELINE_BUDGET_S:
+            # Unlike the page limit this depends on how fast the site was, so the walk is not replayable
+            record['complete'] = False
+            TIMELINE_STATS.record('budget', time.perf_counter() - started)
+            return
+        if param_match:
+            numbers = range(number + 1, min(number + TIMELINE_PAGE_CONCURRENCY, TIMELINE_MAX_PAGES) + 1)
+            batch, number = await fetch_timeline_pages(engine, first_url, param_match.group(1), numbers), numbers[-1]
+        else:
+            next_doc = await next_timeline_page(engine, batch[-1])
+            if next_doc is None:
+                TIMELINE_STATS.record('last_page', time.perf_counter() - started)
+                return
+            batch, number = [next_doc], number + 1
+
+
+async def parse_timeline(engine: FetchEngine, doc: PageSnapshot, data, year, do_deep_dive: bool,
+                         record: dict = None):
+    """
+    Signing, commitment and draft from the profile timeline (and the full timeline pages when
+    deep diving). Every item read goes into record so the result store can replay it for
+    another class year; 'complete' is False when the walk stopped early or failed.
+    """
+    record = record if record is not None else {}
+    record.update({'profile_items': [], 'event_items': [], 'deep': do_deep_dive, 'complete': True, 'error': False})
+    try:
+        for item in doc.extract('timeline_items'):
+            record['profile_items'].append(item)
+            apply_timeline_item(data, item, year)
         
-        all_header_items = soup.select('.metrics-list li') + soup.select('.details li') + soup.select('ul.vitals li')
-        for item in all_header_items:
-            text = item.get_text(strip=True)
-            if 'Pos' in text or 'Position' in text:
-                match = re.search(r'(?:Pos|Position)[:\s]*(.*)', text, re.IGNORECASE)
-                if match: data['Position'] = clean_text(match.group(1))
-            elif 'Height' in text:
-                match = re.search(r'Height[:\s]*(.*)', text, re.IGNORECASE)
-                if match: data['Height'] = normalize_height(match.group(1))
-            elif 'Weight' in text:
-                match = re.search(r'Weight[:\s]*(.*)', text, re.IGNORECASE)
-                if match: data['Weight'] = clean_text(match.group(1))
-            elif 'Junior College' in text:
-                match = re.search(r'Junior College[:\s]*(.*)', text, re.IGNORECASE)
-                if match: data['Junior College'] = clean_text(match.group(1))
-            elif 'Home Town' in text or 'Hometown' in text or 'City' in text:
-                match = re.search(r'(?:Home Town|Hometown|City)[:\s]*(.*)', text, re.IGNORECASE)
-                if match: data['City, ST'] = clean_text(match.group(1))
-            elif 'Class' in text:
-                match = re.search(r'Class[:\s]*(.*)', text, re.IGNORECASE)
-                if match: data['Class'] = clean_text(match.group(1))
+        if do_deep_dive:
+            # Nothing on the TimelineEvents pages can outrank a commitment the profile already showed
+            if data.get('_date_priority', -1) >= 100:
+                record['complete'] = False
+                TIMELINE_STATS.record('profile_commitment')
+                return
+            full_timeline_url = await find_timeline_url(engine, doc)
+            if full_timeline_url:
+                await walk_timeline_pages(engine, full_timeline_url, data, year, record)
+                if record['error']:
+                    mark_incomplete(data, 'timeline', engine.failure or ScrapeFailure('other', "timeline page did not load"))
+    except Exception as e:
+        record['error'] = True
+        mark_incomplete(data, 'timeline', e)
+
+class BranchStats:
+    """Wall time of the timeline and HS branches against the time the player actually spent on both"""
+
+    def __init__(self):
+        self.players = 0
+        self.timeline_seconds = 0.0
+        self.hs_seconds = 0.0
+        self.wall_seconds = 0.0
+
+    def record(self, timeline_seconds: float, hs_seconds: float, wall_seconds: float):
+        self.players += 1
+        self.timeline_seconds += timeline_seconds
+        self.hs_seconds += hs_seconds
+        self.wall_seconds += wall_seconds
+
+    def report(self):
+        if not self.players:
+            return
+        timeline, hs, wall = (seconds / self.players for seconds in
+                              (self.timeline_seconds, self.hs_seconds, self.wall_seconds))
+        mode = "parallel" if PARALLEL_BRANCHES else "sequential"
+        print(f"\n🔀 Timeline + HS branches ({mode}, {self.players} players):")
+        print(f"    → Per player: timeline {timeline:.2f}s, HS {hs:.2f}s, wall {wall:.2f}s "
+              f"(one after the other: {timeline + hs:.2f}s, longest branch: {max(timeline, hs):.2f}s)")
+
+
+BRANCH_STATS = BranchStats()
+
+
+async def parse_profile(engine: FetchEngine, url: str, year: int, player_num: int, total: int,
+                        previous: dict = None, depth: str = 'full') -> dict:
+    """
+    Builds one CSV row; with a manifest entry (incremental mode) unchanged sections are copied from it.
+    'no_deep' skips the timeline deep dive, 'juco_only' the HS profile as well.
+    """
+    data = {header: "NA" for header in CSV_HEADERS}
+    data['Profile URL'] = url
+    data['Recruiting Year'] = str(year)
+    data['Scrape Date'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    data['Data Source'] = '247Sports JUCO'
+    data['_date_priority'] = -1
+    data['_incremental'] = {'profile_url': None, 'fingerprints': {}, 'reparsed': []}
+    PARSE_STATS.players += 1
+    
+    # --- 1-3. JUCO PROFILE AND TIMELINE ---
+    # The same player can be on several class lists; the first one to get here parses, the rest reuse it.
+    # Failures propagate to run_player, which classifies them for the retry queue
+    do_deep_dive = TIMELINE_BUDGET_S > 0 and depth == 'full'
+    with_hs = depth != 'juco_only'
+    player_id = extract_player_id(url)
+    async with RESULT_STORE.exclusive('player', player_id):
+        reused = not INCREMENTAL_FULL_CHECK and reuse_player_result(data, player_id, year, do_deep_dive)
+        # Loads the HS profile itself, alongside the timeline
+        if not reused:
+            await parse_profile_pages(engine, url, data, year, do_deep_dive, previous, with_hs)
+    if reused and with_hs:
+        await load_hs_profile(engine, url, data, year, previous)
+    
+    return data
+
+
+async def parse_profile_pages(engine: FetchEngine, url: str, data: dict, year: int, do_deep_dive: bool,
+                              previous: dict = None, with_hs: bool = True):
+    """Loads the JUCO profile and timeline and stores the result for other classes; raises ScrapeFailure if the profile did not load"""
+    fetches = engine.fetches
+
+    # --- 1. LOAD INITIAL PROFILE PAGE ---
+    # Go straight to the JUCO profile the manifest (incremental runs) or the profile index resolved before
+    NAVIGATION_STATS.players += 1
+    player_id = extract_player_id(url)
+    known_url = (previous or {}).get('profile_url') or PROFILE_INDEX.get(player_id)
+    doc = None
+    if known_url:
+        NAVIGATION_STATS.profile_loads += 1
+        doc = await engine.fetch(known_url, 'profile')
+        if doc is None and not (engine.failure and engine.failure.category == 'not_found'):
+            # A timeout, rate limit or cache miss says nothing about the entry: retry the player, keep it
+            print(f"    ❌ Could not load known profile: {known_url}")
+            raise engine.failure or ScrapeFailure('other', "profile did not load")
+        if doc is None or '/junior-college-' not in urlparse(doc.url).path:
+            # Gone, or redirected away from the JUCO profile: resolve it again from the cover
+            NAVIGATION_STATS.stale += 1
+            PROFILE_INDEX.forget(player_id)
+        else:
+            NAVIGATION_STATS.direct += 1
+    if doc is None:
+        NAVIGATION_STATS.profile_loads += 1
+        doc = await engine.fetch(url, 'profile')
+        if doc is None:
+            print(f"    ❌ Could not load profile: {url}")
+            raise engine.failure or ScrapeFailure('other', "profile did not load")
         
-        data['Class'] = str(year)
+        # --- 2. CHECK FOR COVER PROFILE (2022 and earlier) ---
+        # Navigate to JUCO-specific profile if needed
+        doc = await resolve_juco_profile(engine, doc)
+    elif '/junior-college-' not in urlparse(doc.url).path:
+        # A known URL saved before resolution worked (or now redirecting to the cover) still needs it
+        doc = await resolve_juco_profile(engine, doc)
+    data['_incremental']['profile_url'] = doc.url
+    PROFILE_INDEX.record(player_id, doc.url)
+    
+    if reuse_section(data, previous, 'juco', section_fingerprint(doc, 'juco')):
+        print(f"      ⏭️  DEBUG: JUCO profile unchanged since {previous['checked_at']}, reusing IDs and rankings")
+    else:
+        parse_juco_section(doc, data, year)
+
+    # --- 3 + 4. TIMELINE AND HS PROFILE ---
+    # Both only need what the JUCO profile gave us: the timeline walk stays on this tab while the
+    # HS profile loads on a branch engine (its fetches are not counted against this player entry)
+    timeline = {}
+    commit_team = doc.extract('commit_team')
+    started = time.perf_counter()
+    if PARALLEL_BRANCHES and with_hs:
+        async with engine.branch() as hs_engine:
+            # Let both branches finish before the borrowed tab goes back to the pool
+            results = await asyncio.gather(
+                load_timeline(engine, doc, data, year, do_deep_dive, previous, timeline, commit_team),
+                load_hs_profile(hs_engine, url, data, year, previous), return_exceptions=True)
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        timeline_seconds, hs_seconds = results
+        pages = engine.fetches - fetches
+    else:
+        timeline_seconds = await load_timeline(engine, doc, data, year, do_deep_dive, previous, timeline, commit_team)
+        pages = engine.fetches - fetches
+        hs_seconds = await load_hs_profile(engine, url, data, year, previous) if with_hs else 0.0
+    if with_hs:
+        BRANCH_STATS.record(timeline_seconds, hs_seconds, time.perf_counter() - started)
+
+    # Only a freshly walked timeline can be replayed for another class year
+    if timeline and not timeline['error']:
+        RESULT_STORE.put('player', player_id, {
+            'profile_url': doc.url,
+            'juco': {column: data[column] for column in SECTION_COLUMNS['juco'] if column != 'Class'},
+            'timeline': timeline,
+            'commit_team': commit_team,
+            'fingerprints': {section: data['_incremental']['fingerprints'][section]
+                             for section in ('juco', 'timeline') if section in data['_incremental']['fingerprints']},
+        }, pages=pages)
+
+
+async def load_timeline(engine: FetchEngine, doc: PageSnapshot, data: dict, year: int, do_deep_dive: bool,
+                        previous: Optional[dict], timeline: dict, commit_team: Optional[str]) -> float:
+    """Timeline branch: signing and draft columns (walk recorded in timeline); returns its wall time"""
+    started = time.perf_counter()
+    if reuse_section(data, previous, 'timeline', section_fingerprint(doc, 'timeline')):
+        print(f"      ⏭️  DEBUG: Timeline unchanged, reusing signing and draft fields")
+    else:
+        await parse_timeline(engine, doc, data, year, do_deep_dive, timeline)
+
+        # Fallback for Signed Team
+        if data['Signed Team'] == "NA":
+            data['Signed Team'] = commit_team or "NA"
+    return time.perf_counter() - started
+
+
+async def load_hs_profile(engine: FetchEngine, url: str, data: dict, year: int, previous: Optional[dict]) -> float:
+    """HS branch: the HS columns from the HS ID found on the JUCO profile; returns its wall time"""
+    started = time.perf_counter()
+    # --- 4. GET HS PROFILE USING DIRECT URL CONSTRUCTION ---
+    # We already extracted HS ID in step 2.5, so just build the URL directly
+    if data['247 HS ID'] != "NA":
+        # A finished HS profile never changes under the same HS ID, so incremental runs only
+        # re-fetch it to compare fingerprints when asked for a full check
+        same_hs = bool(previous and previous['row'].get('247 HS ID') == data['247 HS ID']
+                       and 'hs' in previous['fingerprints'])
+        if same_hs and not INCREMENTAL_FULL_CHECK:
+            reuse_section(data, previous, 'hs')
+            print(f"      ⏭️  DEBUG: Same HS profile as last run, reusing HS fields")
+        else:
+            async with RESULT_STORE.exclusive('hs', data['247 HS ID']):
+                await parse_hs_section(engine, url, data, year, previous if same_hs else None)
+    return time.perf_counter() - started
+
+
+def parse_juco_section(doc: PageSnapshot, data: dict, year: int):
+    """IDs, header and JUCO rankings from the JUCO profile"""
+    # --- 2.5 EXTRACT ALL INSTITUTION IDs ---
+    try:
+        print(f"      → DEBUG: Extracting all institution IDs...")
+        ids = doc.extract('ids')
+        print(f"      ✓ DEBUG: IDs extracted - Base: {ids['base']}, JUCO: {ids['juco']}, HS: {ids['hs']}, Colleges: {len(ids['colleges'])}")
+        data['247 Base ID'] = ids['base'] or "NA"
+        data['247 JUCO ID'] = ids['juco'] or "NA"
+        # HS ID will be updated later if we find HS profile
+        data['247 HS ID'] = ids['hs'] or "NA"
+        data['247 College IDs'] = ','.join(ids['colleges']) if ids['colleges'] else "NA"
+    except Exception as e:
+        print(f"      ⚠️  DEBUG: Could not extract all IDs: {e}")
+        data['247 Base ID'] = "NA"
+        data['247 JUCO ID'] = "NA"
+        data['247 HS ID'] = "NA"
+        data['247 College IDs'] = "NA"
+    
+    # --- 3. NOW SCRAPE JUCO DATA ---
+    data.update(doc.extract('header'))
+    data['Class'] = str(year)
+    
+    # JUCO RANKINGS
+    data.update(doc.extract('juco_rankings'))
+
+
+async def parse_hs_section(engine: FetchEngine, url: str, data: dict, year: int, previous: dict = None):
+    """Loads the HS profile built from the HS ID; its fields are reused if the page matches the manifest or result store"""
+    hs_id = data['247 HS ID']
+    base_id = data['247 Base ID']
+
+    entry = None if INCREMENTAL_FULL_CHECK else RESULT_STORE.get('hs', hs_id, year, this_run=INCREMENTAL)
+    if entry is not None:
+        data.update(entry['columns'])
+        data['_incremental']['fingerprints']['hs'] = entry['fingerprint']
+        RESULT_STORE.hit('hs', entry)
+        print(f"      🧠 DEBUG: Reusing parsed HS profile {hs_id} from the result store")
+        return
+    
+    # Built from the player URL's slug and the IDs on the JUCO profile
+    hs_url = institution_profile_url(url, base_id, 'high-school', hs_id)
+    if hs_url:
         
-        # JUCO RANKINGS
-        juco_map = {"COMPOSITE": "Composite JUCO", "247SPORTS": "247 JUCO"}
-        parse_rankings_section_robust(soup, data, juco_map, institution_check="JuniorCollege")
-
-        # Timeline
-        do_deep_dive = player_num <= DEEP_TIMELINE_LIMIT
-        await parse_timeline(page, data, year, do_deep_dive)
-
-        # --- 4. GET HS PROFILE USING DIRECT URL CONSTRUCTION ---
-        # We already extracted HS ID in step 2.5, so just build the URL directly
-        if data['247 HS ID'] != "NA":
-            hs_id = data['247 HS ID']
-            base_id = data['247 Base ID']
+        try:
+            print(f"      → DEBUG: Navigating to HS profile directly")
+            print(f"      → DEBUG: URL: {hs_url[:80]}...")
             
-            # Extract player slug from URL
-            player_slug = None
-            slug_match = re.search(r'/player/([^/]+)-\d+', url)
-            if slug_match:
-                player_slug = slug_match.group(1)
+            # Navigate to HS profile
+            hs_doc = await engine.fetch(hs_url, 'hs')
+            if hs_doc is None:
+                raise engine.failure or ScrapeFailure('other', "HS profile did not load")
             
-            if player_slug and base_id:
-                hs_url = f"https://247sports.com/player/{player_slug}-{base_id}/high-school-{hs_id}/"
-                
-                try:
-                    print(f"      → DEBUG: Navigating to HS profile directly")
-                    print(f"      → DEBUG: URL: {hs_url[:80]}...")
-                    
-                    # Navigate to HS profile
-                    await page.goto(hs_url, wait_until='domcontentloaded', timeout=30000)
-                    await page.wait_for_timeout(2000)
-                
-                # NO NEED to click "View recruiting profile" - it auto-loads
-                
-                hs_html = await page.content()
-                hs_soup = BeautifulSoup(hs_html, 'html.parser')
-                
-                # HS School Name - extract from header
-                hs_institution = hs_soup.select_one('.institution, .team-name, h2.institution')
-                if hs_institution:
-                    data['High School'] = clean_text(hs_institution.get_text())
+            # NO NEED to click "View recruiting profile" - it auto-loads
+            fingerprint = section_fingerprint(hs_doc, 'hs')
+            if reuse_section(data, previous, 'hs', fingerprint):
+                print(f"      ⏭️  DEBUG: HS profile unchanged, reusing HS fields")
+            else:
+                hs_header = hs_doc.extract('hs_header')
+                data.update(hs_header)
+                if 'High School' in hs_header:
                     print(f"      ✓ DEBUG: Found HS School: {data['High School']}")
-                
-                # HS Class Year
-                hs_header_items = hs_soup.select('.metrics-list li') + hs_soup.select('.details li') + hs_soup.select('ul.vitals li')
-                for item in hs_header_items:
-                    text = item.get_text(strip=True)
-                    if 'Class' in text:
-                        match = re.search(r'Class[:\s]*(.*)', text, re.IGNORECASE)
-                        if match: 
-                            data['HS Class Year'] = clean_text(match.group(1))
-                            print(f"      ✓ DEBUG: Found HS Class Year: {data['HS Class Year']}")
-                
+                if 'HS Class Year' in hs_header:
+                    print(f"      ✓ DEBUG: Found HS Class Year: {data['HS Class Year']}")
+            
                 # HS RANKINGS
                 print(f"      → DEBUG: Parsing HS rankings...")
-                hs_map = {"COMPOSITE": "Composite HS", "247SPORTS": "247 HS"}
-                parse_rankings_section_robust(hs_soup, data, hs_map, institution_check="HighSchool")
+                data.update(hs_doc.extract('hs_rankings'))
                 print(f"      ✓ DEBUG: HS Rankings - 247: {data['247 HS Stars']}⭐ / Composite: {data['Composite HS Stars']}⭐")
-                
-            except Exception as e:
-                print(f"      ❌ DEBUG: Could not load HS profile: {e}")
-
-        # Fallback for Signed Team
-        if data['Signed Team'] == "NA":
-            commit_banner = soup.select_one('.commit-banner, .commitment')
-            if commit_banner:
-                team_elem = commit_banner.select_one('span, a')
-                if team_elem:
-                    team_text = clean_text(team_elem.get_text())
-                    if team_text.lower() not in ['committed', 'commitment', 'signed']:
-                        data['Signed Team'] = team_text
-        
-        return data
+            RESULT_STORE.put('hs', hs_id, {
+                'columns': {column: data[column] for column in SECTION_COLUMNS['hs']},
+                'fingerprint': fingerprint,
+            }, pages=1)
         
-    except Exception as e:
-        print(f"    ❌ Error parsing {data.get('Player Name', 'Unknown')}: {e}")
-        return data
+        except Exception as e:
+            print(f"      ❌ DEBUG: Could not load HS profile ({classify_failure(e)}): {e}")
+            mark_incomplete(data, 'hs', e)
+
+# =============================================================================
+# PAGE POOL
+# =============================================================================
+
+class PooledPage:
+    def __init__(self, context, page):
+        self.context = context
+        self.page = page
+        self.uses = 0
+        self.crashed = False
+        self.fetcher = BrowserFetcher(page)
+        page.on('crash', lambda _: setattr(self, 'crashed', True))
+
+
+class PagePool:
+    """
+    Long-lived pool of warm pages, keyed by browser context.
+    Workers check a page out, use it for one player and hand it back; the page is
+    reset to about:blank between uses and recycled after PAGE_MAX_USES or a crash.
+    Contexts (cookies, HTTP cache) stay alive for the whole run.
+    """
+
+    def __init__(self, browser, size: int, contexts: int = POOL_CONTEXTS, max_uses: int = PAGE_MAX_USES):
+        self.browser = browser
+        self.size = size
+        self.context_count = max(1, min(contexts, size))
+        self.max_uses = max_uses
+        self.pages = {}
+        self.idle = asyncio.Queue()
+        self.checkouts = 0
+        self.recycled = 0
+        self.context_setups = 0
+        self.context_setup_time = 0.0
+        self.page_setups = 0
+        self.page_setup_time = 0.0
+        self.reset_time = 0.0
+        self.extra_pages = 0
+        self.trimmed = 0
+        self.targets = {}
+
+    async def start(self):
+        contexts = [await self._new_context() for _ in range(self.context_count)]
+        for i in range(self.size):
+            context = contexts[i % self.context_count]
+            self.targets[context] = self.targets.get(context, 0) + 1
+            self.idle.put_nowait(await self._new_page(context))
+
+    async def _new_context(self):
+        started = time.perf_counter()
+        context = await new_scraper_context(self.browser)
+        self.context_setup_time += time.perf_counter() - started
+        self.context_setups += 1
+        self.pages[context] = []
+        return context
+
+    async def _new_page(self, context) -> PooledPage:
+        started = time.perf_counter()
+        pooled = PooledPage(context, await context.new_page())
+        self.page_setup_time += time.perf_counter() - started
+        self.page_setups += 1
+        self.pages[context].append(pooled)
+        return pooled
+
+    def request_context(self):
+        """APIRequestContext of the first pooled context, for plain-HTTP fetches that share its cookies"""
+        return next(iter(self.pages)).request
+
+    async def acquire(self, extra: bool = False) -> PooledPage:
+        """Checks out an idle page; a parallel branch (extra) opens another one rather than wait for a worker's"""
+        if extra and self.idle.empty():
+            pooled = await self._new_page(min(self.pages, key=lambda context: len(self.pages[context])))
+            self.extra_pages += 1
+        else:
+            pooled = await self.idle.get()
+        pooled.uses += 1
+        self.checkouts += 1
+        return pooled
+
+    async def release(self, pooled: PooledPage, failed: bool = False):
+        """
+        Reset the page for the next worker, or replace it if it is worn out or broken. Pages beyond
+        the context's share of the pool (opened for parallel branches) are closed instead.
+        """
+        if len(self.pages[pooled.context]) > self.targets.get(pooled.context, 0):
+            self.trimmed += 1
+            self.pages[pooled.context].remove(pooled)
+            try:
+                await pooled.page.close()
+            except Exception:
+                pass
+            return
+        recycle = failed or pooled.crashed or pooled.page.is_closed() or pooled.uses >= self.max_uses
+        if not recycle:
+            started = time.perf_counter()
+            try:
+                await pooled.page.goto('about:blank', timeout=5000)
+            except Exception:
+                recycle = True
+            self.reset_time += time.perf_counter() - started
+        if recycle:
+            self.recycled += 1
+            self.pages[pooled.context].remove(pooled)
+            try:
+                await pooled.page.close()
+            except Exception:
+                pass
+            pooled = await self._new_page(pooled.context)
+        self.idle.put_nowait(pooled)
+
+    async def close(self):
+        for context in list(self.pages):
+            await context.close()
+        self.pages = {}
+
+    def report(self):
+        """Compare actual setup cost to one context per batch and one page per player"""
+        if not self.checkouts:
+            return
+        avg_page = self.page_setup_time / max(self.page_setups, 1)
+        avg_context = self.context_setup_time / max(self.context_setups, 1)
+        batches = (self.checkouts + self.size - 1) // self.size
+        baseline = self.checkouts * avg_page + batches * avg_context
+        actual = self.page_setup_time + self.context_setup_time + self.reset_time
+        saved = baseline - actual
+        print(f"\n♻️  Page pool: {self.checkouts} checkouts on {self.size} pages / {self.context_count} context(s)")
+        print(f"    → Setups: {self.context_setups} contexts (avg {avg_context * 1000:.0f} ms), "
+              f"{self.page_setups} pages (avg {avg_page * 1000:.0f} ms), {self.recycled} recycled, "
+              f"{self.extra_pages} added for parallel HS/timeline branches ({self.trimmed} closed again)")
+        print(f"    → Setup time: {actual:.1f}s vs ~{baseline:.1f}s without pooling "
+              f"(saved ~{saved * 1000 / self.checkouts:.0f} ms per player)")
 
 # =============================================================================
 # CONCURRENT SCRAPING
 # =============================================================================
 
-async def scrape_player_batch(browser, urls: list, year: int, batch_num: int, total_players: int) -> list:
-    tasks = []
-    context = await browser.new_context(user_agent=USER_AGENT)
-    for i, url in enumerate(urls):
-        page = await context.new_page()
-        player_num = batch_num * MAX_CONCURRENT + i + 1
-        tasks.append(scrape_player(page, url, year, player_num, total_players))
-    results = await asyncio.gather(*tasks, return_exceptions=True)
-    await context.close()
-    valid_results = []
-    for result in results:
-        if isinstance(result, dict):
-            if '_date_priority' in result: del result['_date_priority']
-            valid_results.append(result)
-    return valid_results
-
-async def scrape_player(page, url: str, year: int, player_num: int, total: int) -> dict:
-    try:
-        print(f"  [{player_num}/{total}] {url.split('/')[-2]}")
-        data = await parse_profile(page, url, year, player_num, total)
-        if data['Player Name'] != "NA":
-            deep_marker = "🔍" if player_num <= DEEP_TIMELINE_LIMIT else "⚡"
-            hs_marker = "+" if data['High School'] != "NA" else ""
-            print(f"    ✓ {deep_marker}{hs_marker} {data['Player Name']} - JUCO: {data['Composite JUCO Stars']}⭐ / HS: {data['Composite HS Stars']}⭐")
+class ThroughputMonitor:
+    """Tracks how busy each worker slot is so we can report real utilization"""
+
+    def __init__(self, slots: int):
+        self.slots = slots
+        self.started = time.perf_counter()
+        self.busy = [0.0] * slots
+        self.completed = 0
+
+    def record(self, slot: int, seconds: float):
+        self.busy[slot] += seconds
+        self.completed += 1
+
+    def report(self, year):
+        elapsed = max(time.perf_counter() - self.started, 1e-9)
+        per_minute = self.completed / elapsed * 60
+        idle_pct = 100 * (1 - sum(self.busy) / (elapsed * self.slots))
+        print(f"\n📈 Throughput for {year}:")
+        print(f"    → {self.completed} players in {elapsed / 60:.1f} min ({per_minute:.1f} players/min)")
+        print(f"    → {self.slots} slots, {idle_pct:.1f}% slot-idle")
+        for slot, busy in enumerate(self.busy):
+            print(f"      Slot {slot + 1}: {100 * busy / elapsed:.1f}% busy")
+
+
+# =============================================================================
+# RUN PLANNER
+# =============================================================================
+# Each matrix job has a hard time limit. The planner measures how long players take at each depth
+# and degrades the ones still to come before the limit would cut the run off mid-roster; whatever a
+# stopped run leaves behind is listed in a resume manifest and picked up by the next run's journal.
+
+# Deepest first; 'list' rows come straight from the rankings list (SCRAPE_MODE lite / hybrid), never from the planner
+PLAYER_DEPTHS = ('full', 'no_deep', 'juco_only', 'list')
+
+
+class RunPlanner:
+    """
+    Fits the run into RUN_BUDGET_MIN. Player wall times feed a moving average per depth, and each
+    player gets the deepest depth that still leaves time for everyone after it at 'juco_only', so
+    the top of the roster keeps full detail and the tail still gets its basic row.
+    """
+
+    # Cost of each depth relative to a full player, used until that depth has timings of its own
+    RELATIVE_COST = {'full': 1.0, 'no_deep': 0.6, 'juco_only': 0.35}
+    SMOOTHING = 0.2
+
+    def __init__(self, budget_s: float, reserve_s: float):
+        self.budget = budget_s
+        self.reserve = reserve_s
+        self.deadline = time.monotonic() + budget_s - reserve_s if budget_s > 0 else None
+        self.seconds = {}
+        self.depths = Counter()
+        self.skipped = 0
+        self.cancelled = 0
+        self.stop_reason = None
+        self.signalled = None
+
+    def cost(self, depth: str) -> Optional[float]:
+        """Expected seconds for one player at this depth (None before anything was timed)"""
+        if depth in self.seconds:
+            return self.seconds[depth]
+        for measured, seconds in self.seconds.items():
+            return seconds * self.RELATIVE_COST[depth] / self.RELATIVE_COST[measured]
+        return None
+
+    def expired(self) -> bool:
+        """True once no new player may start: stopped by a signal, or the deadline has passed"""
+        if self.stop_reason is None and self.deadline is not None and time.monotonic() >= self.deadline:
+            self.stop('deadline reached')
+        return self.stop_reason is not None
+
+    def depth(self, remaining: int, slots: int) -> Optional[str]:
+        """Depth for the next player, with `remaining` players (it included) still to start; None means stop"""
+        if self.expired():
+            return None
+        floor = self.cost('juco_only')
+        if self.deadline is None or floor is None:
+            return 'full'
+        left = self.deadline - time.monotonic()
+        for depth in self.RELATIVE_COST:
+            if (self.cost(depth) + (remaining - 1) * floor) / slots <= left:
+                return depth
+        return 'juco_only'
+
+    def record(self, depth: str, seconds: float):
+        self.depths[depth] += 1
+        previous = self.seconds.get(depth)
+        self.seconds[depth] = seconds if previous is None else previous + self.SMOOTHING * (seconds - previous)
+
+    def stop(self, reason: str):
+        if self.stop_reason is None:
+            self.stop_reason = reason
+            print(f"\n⏱️  Run planner: {reason}, no new players will start")
+
+    def install_signal_handlers(self):
+        """SIGTERM/SIGINT stop the run gracefully; a second signal gets the default handling"""
+        loop = asyncio.get_running_loop()
+        self.signalled = asyncio.Event()
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            try:
+                loop.add_signal_handler(signum, self._on_signal, signum)
+            except (NotImplementedError, RuntimeError):
+                # No loop signal handlers on Windows; the job just keeps the default behaviour
+                return
+
+    def _on_signal(self, signum: int):
+        loop = asyncio.get_running_loop()
+        for other in (signal.SIGTERM, signal.SIGINT):
+            loop.remove_signal_handler(other)
+        self.stop(f"{signal.Signals(signum).name} received")
+        self.signalled.set()
+
+    async def drain(self, workers: list):
+        """
+        Waits for the worker tasks. After a signal, players still running get RUN_SIGNAL_GRACE_S and
+        are then cancelled; they were never journaled, so the next run scrapes them again.
+        """
+        if self.signalled is None:
+            await asyncio.gather(*workers)
+            return
+        finished = asyncio.gather(*workers, return_exceptions=True)
+        signalled = asyncio.create_task(self.signalled.wait())
+        try:
+            await asyncio.wait([finished, signalled], return_when=asyncio.FIRST_COMPLETED)
+            if not finished.done():
+                _, running = await asyncio.wait(workers, timeout=RUN_SIGNAL_GRACE_S)
+                for worker in running:
+                    worker.cancel()
+                self.cancelled += len(running)
+                await finished
+        finally:
+            signalled.cancel()
+        await asyncio.gather(*(worker for worker in workers if not worker.cancelled()))
+
+    def report(self):
+        if self.deadline is None and self.stop_reason is None:
+            return
+        budget = (f"{self.budget / 60:.0f} min budget, {self.reserve:.0f}s reserve" if self.deadline is not None
+                  else "no budget")
+        print(f"\n⏱️  Run planner ({budget}):")
+        for depth in self.RELATIVE_COST:
+            if self.depths[depth]:
+                print(f"    → {depth}: {self.depths[depth]} players, ~{self.seconds[depth]:.1f}s each")
+        if self.skipped:
+            print(f"    → {self.skipped} reduced players not re-scraped (no deeper depth fitted)")
+        if self.stop_reason:
+            print(f"    → Stopped early: {self.stop_reason}"
+                  + (f", {self.cancelled} players cancelled mid-scrape" if self.cancelled else ""))
+
+
+PLANNER = RunPlanner(RUN_BUDGET_MIN * 60, RUN_RESERVE_S)
+
+
+class YearRun:
+    """One year's scrape: its roster, the players still to do, journal, manifest and CSV"""
+
+    def __init__(self, year: int, roster_urls: list, roster: dict, player_urls: list, pending: list,
+                 journal: ScrapeJournal, manifest: PlayerManifest, filename: Path):
+        self.year = year
+        self.roster_urls = roster_urls
+        self.roster = roster
+        self.player_urls = player_urls
+        self.pending = pending
+        self.journal = journal
+        self.manifest = manifest
+        self.filename = filename
+        self.positions = {url: i + 1 for i, url in enumerate(roster_urls)}
+        self.results = asyncio.Queue()
+        self.all_data = []
+
+    def record(self, url: str, data: Optional[dict], failure: ScrapeFailure = None,
+               depth: str = 'full') -> Optional[dict]:
+        """
+        Journals one result before anything else sees it; returns the row, or None for a failure.
+        A row that comes with a failure is partial: kept, but flagged so the next run redoes it.
+        """
+        if data is None:
+            failure = failure or ScrapeFailure('other', "profile did not load")
+            self.journal.record_failed(url, failure.detail, failure.category)
+            print(f"    📓 Recorded as failed ({failure.category}): {url}")
+            return None
+        incremental = data.pop('_incremental', None)
+        self.journal.record_done(url, data, depth, failure)
+        if failure is not None:
+            print(f"    📓 Kept a partial row ({failure.category}), flagged for the next run: {url}")
+        # A reduced or partial row would show up as spurious deltas; the manifest keeps the last full one
+        if incremental is not None and depth == 'full' and failure is None:
+            self.manifest.update(url, data, incremental)
         return data
+
+
+class YearScheduler:
+    """
+    Hands out players from every year to one shared set of worker slots. The next player
+    comes from the year with the fewest players in flight (ties: the fewest handed out so
+    far), and while other years still have players waiting no year holds more than
+    YEAR_MAX_SHARE of the slots, so one huge class cannot starve the small ones.
+    """
+
+    def __init__(self, runs: list, slots: int):
+        self.runs = {run.year: run for run in runs}
+        self.queues = {run.year: deque((run.positions[url], url) for url in run.pending) for run in runs}
+        self.slots = slots
+        self.cap = max(1, int(slots * YEAR_MAX_SHARE + 0.5))
+        self.in_flight = Counter()
+        self.dispatched = Counter()
+        self.started = time.perf_counter()
+        self.finished = {}
+        self.retries = RetryQueue()
+
+    def next(self) -> Optional[tuple]:
+        """
+        (run, player_num, url, depth, attempt, last failure, partial row so far) for a free slot. Retries are due once
+        every year's queue is empty; None when nothing is ready (see retries.wait()) or the planner stops.
+        """
+        while True:
+            waiting = [year for year, queue in self.queues.items() if queue]
+            if not waiting and not self.retries:
+                return None
+            depth = PLANNER.depth(sum(len(queue) for queue in self.queues.values()) + len(self.retries), self.slots)
+            if depth is None:
+                return None
+            if not waiting:
+                retry = self.retries.pop_ready()
+                if retry is None:
+                    return None
+                run, player_num, url, attempt, failure, partial = retry
+                self.in_flight[run.year] += 1
+                return run, player_num, url, depth, attempt, failure, partial
+            # The cap only holds back a year while another one has work; a free slot never sits idle
+            eligible = [year for year in waiting if self.in_flight[year] < self.cap] or waiting
+            year = min(eligible, key=lambda year: (self.in_flight[year], self.dispatched[year], year))
+            player_num, url = self.queues[year].popleft()
+            # A player the journal has at reduced depth is only worth redoing at a deeper one
+            # (a partial row is also worth redoing at the same depth)
+            journal = self.runs[year].journal
+            previous = journal.depth(url)
+            if previous and (PLAYER_DEPTHS.index(depth) > PLAYER_DEPTHS.index(previous)
+                             or depth == previous and not journal.is_incomplete(url)):
+                PLANNER.skipped += 1
+                continue
+            self.in_flight[year] += 1
+            self.dispatched[year] += 1
+            return self.runs[year], player_num, url, depth, 1, None, None
+
+    def retry(self, run: YearRun, player_num: int, url: str, attempt: int, failure: ScrapeFailure,
+              partial: Optional[tuple]) -> bool:
+        """Queues another attempt after a backoff; False when the failure is final"""
+        if (failure.category not in RETRY_CATEGORIES or attempt >= RETRY_MAX_ATTEMPTS
+                or PLANNER.stop_reason is not None):
+            return False
+        delay = self.retries.push((run, player_num, url, attempt + 1, failure, partial), attempt)
+        FAILURE_STATS.record(failure, 'retried')
+        print(f"    🔁 {failure.category} on {url.split('/')[-2]}, retry {attempt}/{RETRY_MAX_ATTEMPTS - 1} "
+              f"in {delay:.0f}s")
+        return True
+
+    def done(self, run: YearRun):
+        self.in_flight[run.year] -= 1
+        if not self.queues[run.year] and not self.in_flight[run.year] and not self.retries.years()[run.year]:
+            self.finished[run.year] = time.perf_counter() - self.started
+            if len(self.runs) > 1:
+                print(f"  🏁 {run.year} finished: {self.dispatched[run.year]} players in "
+                      f"{self.finished[run.year] / 60:.1f} min")
+
+    def report(self):
+        if len(self.runs) < 2:
+            return
+        print(f"\n🗓️  Year scheduler ({len(self.runs)} years, at most {self.cap} slots per year while others wait):")
+        for year in sorted(self.runs):
+            finished = self.finished.get(year)
+            print(f"    → {year}: {self.dispatched[year]} players, "
+                  + (f"finished after {finished / 60:.1f} min" if finished is not None else "unfinished"))
+
+
+async def run_player(slot: int, pool: PagePool, http: HttpFetcher, url: str, year: int, player_num: int,
+                     total: int, previous: dict = None, depth: str = 'full') -> tuple:
+    """
+    Scrapes one player on a pooled page at the planner's depth: (row or None, ScrapeFailure or None,
+    seconds). A row with a failure is partial: the profile loaded but its HS profile or timeline did not.
+    """
+    started = time.perf_counter()
+    pooled = await pool.acquire() if pool else None
+    failed = False
+    try:
+        engine = FetchEngine(pooled.fetcher if pooled else None, http, year=year, pool=pool)
+        data = await scrape_player(engine, url, year, player_num, total, previous, depth)
+        if data.get('Player Name', "NA") == "NA":
+            raise ScrapeFailure('missing_selector', "no player name on the profile")
+        data.pop('_date_priority', None)
+        failure = data.pop('_incomplete', None)
     except Exception as e:
-        print(f"    ❌ Error: {e}")
-        return {header: "NA" for header in CSV_HEADERS}
+        failure = e if isinstance(e, ScrapeFailure) else ScrapeFailure(classify_failure(e), f"{type(e).__name__}: {e}".rstrip(': '))
+        print(f"    ❌ Worker {slot + 1} {failure.category} on {url}: {failure.detail}")
+        data = None
+        failed = True
+    if pooled:
+        await pool.release(pooled, failed=failed)
+    return data, failure, time.perf_counter() - started
+
+
+async def player_worker(slot: int, pool: PagePool, http: HttpFetcher, scheduler: YearScheduler,
+                        monitor: ThroughputMonitor):
+    """Takes players from the scheduler until every year is done; each result is journaled before anything else"""
+    while True:
+        item = scheduler.next()
+        if item is None:
+            # Players still backing off keep the worker around until they are due
+            wait = scheduler.retries.wait()
+            if wait is None or PLANNER.expired():
+                return
+            await asyncio.sleep(min(wait, 5))
+            continue
+        run, player_num, url, depth, attempt, last_failure, partial = item
+        data, failure, seconds = await run_player(slot, pool, http, url, run.year, player_num,
+                                                  len(run.roster_urls), run.manifest.previous(url), depth)
+        monitor.record(slot, seconds)
+        PLANNER.record(depth, seconds)
+        # The best row so far: a partial one from an earlier attempt beats none at all
+        partial = (data, depth) if data is not None else partial
+        if failure is not None and scheduler.retry(run, player_num, url, attempt, failure, partial):
+            scheduler.done(run)
+            continue
+        if failure is None:
+            if last_failure is not None:
+                FAILURE_STATS.record(last_failure, 'recovered')
+        else:
+            data, depth = partial or (None, depth)
+            FAILURE_STATS.record(failure, 'partial' if data is not None else 'failed', url)
+        data = run.record(url, data, failure, depth)
+        await run.results.put((url, data))
+        scheduler.done(run)
+
+
+async def csv_writer(filename: Path, results: asyncio.Queue, all_data: list, total: int):
+    """Appends each journaled player to the CSV as soon as a worker hands it over (data is None for failures)"""
+    handled = 0
+    while True:
+        item = await results.get()
+        if item is None:
+            return
+        url, data = item
+        handled += 1
+        if data is not None:
+            append_to_csv(filename, [data])
+            all_data.append(data)
+        if handled % 10 == 0 or handled == total:
+            print(f"    💾 Progress: {handled}/{total} players done ({len(all_data)} saved to CSV)")
+
+
+async def queue_worker(slot: int, pool: PagePool, http: HttpFetcher, work_queue: LeaseQueue,
+                       monitor: ThroughputMonitor):
+    """Leases one player at a time from the shared queue until nothing is pending or leased anywhere"""
+    while True:
+        # Leases are only taken while the planner allows new players; the rest stay queued for other workers
+        if PLANNER.expired():
+            return
+        leased = await work_queue.call(work_queue.lease)
+        if leased is None:
+            if not await work_queue.call(work_queue.unfinished):
+                return
+            # Other workers still hold leases; wait in case one expires back into the queue
+            await asyncio.sleep(min(QUEUE_HEARTBEAT_S, 10))
+            continue
+        year, player_num, total, url = leased
+        data, failure, seconds = await run_player(slot, pool, http, url, year, player_num, total)
+        monitor.record(slot, seconds)
+        if data is not None:
+            data.pop('_incremental', None)
+            await work_queue.call(work_queue.complete, url, data, seconds)
+            if failure is not None:
+                FAILURE_STATS.record(failure, 'partial', url)
+        else:
+            # The lease queue does its own retrying (QUEUE_MAX_ATTEMPTS), on whichever worker leases it next
+            await work_queue.call(work_queue.fail, url, f"{failure.category}: {failure.detail}", seconds)
+            FAILURE_STATS.record(failure, 'failed', url)
+            print(f"    📓 Returned to the queue as failed ({failure.category}): {url}")
+
+
+async def heartbeat_leases(work_queue: LeaseQueue):
+    while True:
+        await asyncio.sleep(QUEUE_HEARTBEAT_S)
+        await work_queue.call(work_queue.heartbeat)
+
+
+async def scrape_queue(browser, work_queue: LeaseQueue):
+    """Runs MAX_CONCURRENT queue workers in this process, heartbeating their leases"""
+    print(f"\n👷 Worker {work_queue.worker} leasing players from {work_queue.path} with {MAX_CONCURRENT} slots...")
+    slots = max(1, MAX_CONCURRENT)
+    monitor = ThroughputMonitor(slots)
+    pool = PagePool(browser, slots) if browser is not None else None
+    http = None
+    heartbeat = asyncio.create_task(heartbeat_leases(work_queue))
+    try:
+        if pool:
+            await pool.start()
+            http = HttpFetcher(pool.request_context()) if FETCH_MODE != 'browser' else None
+        await PLANNER.drain([
+            asyncio.create_task(queue_worker(slot, pool, http, work_queue, monitor)) for slot in range(slots)
+        ])
     finally:
-        await page.close()
+        heartbeat.cancel()
+        await work_queue.call(work_queue.release)
+        if pool:
+            await pool.close()
+    
+    monitor.report(f"worker {work_queue.worker}")
+    if pool:
+        pool.report()
+
+async def scrape_player(engine: FetchEngine, url: str, year: int, player_num: int, total: int,
+                        previous: dict = None, depth: str = 'full') -> dict:
+    """One player's row; a profile that did not load raises (ScrapeFailure) instead of returning NAs"""
+    print(f"  [{player_num}/{total}] {url.split('/')[-2]}" + (f" ({depth})" if depth != 'full' else ""))
+    data = await parse_profile(engine, url, year, player_num, total, previous, depth)
+    if data['Player Name'] != "NA":
+        deep_marker = "🔍" if TIMELINE_BUDGET_S > 0 and depth == 'full' else "⚡"
+        hs_marker = "+" if data['High School'] != "NA" else ""
+        print(f"    ✓ {deep_marker}{hs_marker} {data['Player Name']} - JUCO: {data['Composite JUCO Stars']}⭐ / HS: {data['Composite HS Stars']}⭐")
+    return data
 
 # =============================================================================
 # MAIN SCRAPER
 # =============================================================================
 
-async def scrape_year(browser, year: int) -> list:
+def year_csv_path(year: int) -> Path:
+    return OUTPUT_DIR / f"juco_recruiting_class_{year}_{datetime.now().strftime('%Y%m%d')}{shard_suffix()}.csv"
+
+
+def list_row(entry: dict, url: str, year: int) -> dict:
+    """A CSV row from one player's rankings list columns; everything only a profile has stays NA"""
+    row = {header: "NA" for header in CSV_HEADERS}
+    # Snapshots saved by older versions may carry columns the list no longer supplies
+    row.update({column: value for column, value in entry.items() if column in ListRow.__annotations__})
+    row['247 Base ID'] = extract_player_id(url)
+    row['Class'] = row['Recruiting Year'] = str(year)
+    row['Profile URL'] = url
+    row['Scrape Date'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    row['Data Source'] = '247Sports JUCO (rankings list)'
+    return row
+
+
+def profile_players(roster: dict) -> Optional[set]:
+    """Players SCRAPE_MODE wants a profile scrape for: all (None), none in lite mode, the top HYBRID_TOP_N in hybrid"""
+    if SCRAPE_MODE == 'lite':
+        return set()
+    if SCRAPE_MODE == 'hybrid':
+        return {player['url'] for player in roster['players'][:HYBRID_TOP_N]}
+    return None
+
+
+def record_list_rows(journal: ScrapeJournal, roster: dict, year: int, player_urls: list) -> list:
+    """
+    SCRAPE_MODE lite / hybrid: journals a list row for every player that has no row yet and returns
+    the players whose profiles still need a visit (none in lite mode, the top HYBRID_TOP_N by roster
+    rank without a full row in hybrid mode). Those get the whole profile scrape: the HS ID and the
+    timeline the list cannot supply are only found on the JUCO profile page.
+    """
+    entries = {player['url']: player['list'] for player in roster['players'] if player.get('list')}
+    added = 0
+    for url in player_urls:
+        if url not in journal.done and url in entries:
+            journal.record_done(url, list_row(entries[url], url, year), 'list')
+            added += 1
+    unlisted = sum(url not in entries for url in player_urls)
+    print(f"  📋 {SCRAPE_MODE.capitalize()} mode: {added} rows built from the rankings list"
+          + (f", {unlisted} players had no list entry" if unlisted else ""))
+    wanted = profile_players(roster)
+    return [url for url in player_urls if url in wanted and (journal.depth(url) != 'full' or journal.is_incomplete(url))]
+
+
+async def prepare_year(browser, year: int) -> Optional[YearRun]:
+    """Roster (discovered or reused), START_FROM / shard selection and the journal's pending players"""
     print(f"\n{'='*80}")
     print(f"🎓 SCRAPING {year} JUCO RECRUITING CLASS (DEBUG MODE)")
     print(f"{'='*80}")
-    player_urls = await click_load_more_until_complete(browser, year)
-    if not player_urls:
+    roster_urls, roster = await load_roster(browser, year)
+    if not roster_urls:
         print(f"  ❌ No players found for {year}")
-        return []
-    if START_FROM_PLAYER > 0:
-        print(f"  ⏩ Resuming from player #{START_FROM_PLAYER}")
-        player_urls = player_urls[START_FROM_PLAYER:]
+        return None
+    player_urls = roster_urls
+    start_index = resolve_start_index(player_urls, START_FROM)
+    if start_index > 0:
+        print(f"  ⏩ Resuming from player #{start_index + 1}: {player_urls[start_index]}")
+        player_urls = player_urls[start_index:]
+    if SHARD_COUNT > 1:
+        player_urls = shard_urls(player_urls)
+        print(f"  🧩 Shard {SHARD_INDEX} of {SHARD_COUNT}: {len(player_urls)} of {len(roster_urls)} roster players")
+    
+    journal = ScrapeJournal(year, roster)
+    if JOURNAL_RESUME:
+        journal.load()
+    manifest = PlayerManifest(year).load()
+    if INCREMENTAL:
+        known = sum(url in manifest.players for url in player_urls)
+        print(f"  ♻️  Incremental mode: {known}/{len(player_urls)} players in {manifest.path.name}"
+              f"{', re-fetching HS pages for a full check' if INCREMENTAL_FULL_CHECK else ''}")
+    resume_path = resume_manifest_path(journal)
+    if JOURNAL_RESUME and resume_path.exists():
+        try:
+            resume = json.loads(resume_path.read_text(encoding='utf-8'))
+            print(f"  ⏱️  Left by the previous run ({resume['stopped'] or 'not stopped'}, {resume['written_at']}): "
+                  f"{len(resume['missing'])} players without a row, {len(resume['reduced'])} at reduced depth, "
+                  f"{len(resume.get('incomplete', {}))} partial")
+        except (OSError, ValueError, KeyError) as e:
+            print(f"  ⚠️  Could not read resume manifest {resume_path.name}: {e}")
+    if SCRAPE_MODE in ('lite', 'hybrid'):
+        pending = record_list_rows(journal, roster, year, player_urls)
+    else:
+        pending = journal.pending(player_urls)
+    if journal.done or journal.failed:
+        print(f"  📓 Journal {journal.path.name}: {len(journal.done)} done, {len(journal.failed)} failed, "
+              f"{len(pending)} to scrape{' (retrying failures only)' if RETRY_FAILED else ''}")
+    return YearRun(year, roster_urls, roster, player_urls, pending, journal, manifest, year_csv_path(year))
+
+
+def resume_manifest_path(journal: ScrapeJournal) -> Path:
+    return journal.path.with_name(journal.path.stem.replace('journal_', 'resume_', 1) + '.json')
+
+
+def write_resume_manifest(run: YearRun) -> Optional[Path]:
+    """
+    What this run left for the next one: players without a row, rows scraped at reduced depth and
+    partial rows (sections that kept failing).
+    The journal drives the actual resume; the manifest is removed once the year is complete.
+    """
+    journal = run.journal
+    path = resume_manifest_path(journal)
+    missing = [url for url in run.player_urls if url not in journal.done]
+    # List rows are all lite mode (and hybrid below the top N) set out to get
+    wanted = profile_players(run.roster)
+    reduced = [url for url in journal.reduced(run.player_urls)
+               if wanted is None or url in wanted or journal.depth(url) != 'list']
+    incomplete = journal.incomplete(run.player_urls)
+    if not missing and not reduced and not incomplete:
+        path.unlink(missing_ok=True)
+        return None
+    manifest = {
+        'year': run.year,
+        'roster_discovered_at': run.roster['discovered_at'],
+        'journal': journal.path.name,
+        'written_at': datetime.now().isoformat(timespec='seconds'),
+        'stopped': PLANNER.stop_reason,
+        'done': len(journal.done),
+        'missing': missing,
+        'failed': [url for url in missing if url in journal.failed],
+        'reduced': {url: journal.depth(url) for url in reduced},
+        'incomplete': {url: journal.done[url]['incomplete'] for url in incomplete},
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix('.tmp')
+    tmp_path.write_text(json.dumps(manifest, indent=2), encoding='utf-8')
+    os.replace(tmp_path, path)
+    return path
+
+
+def finish_year(run: YearRun) -> list:
+    """Compacts the journal into the year's CSV and saves the manifest, delta and shard summary"""
+    journal, manifest = run.journal, run.manifest
+    rows = journal.compact(run.filename, run.roster_urls)
+    journal.close()
+    print(f"  📓 Compacted journal into {run.filename.name}: {len(rows)} players, {len(journal.failed)} failed "
+          f"(listed in {journal.failed_path.name})")
+    if SHARD_COUNT > 1:
+        summary_path = write_shard_summary(run.year, run.roster, run.roster_urls, run.player_urls, rows,
+                                           list(journal.failed), run.filename)
+        print(f"  🧩 Shard summary written: {summary_path}")
+    manifest.save()
+    PROFILE_INDEX.save()
+    resume_path = write_resume_manifest(run)
+    if resume_path:
+        resume = json.loads(resume_path.read_text(encoding='utf-8'))
+        print(f"  ⏱️  Resume manifest {resume_path.name}: {len(resume['missing'])} players left, "
+              f"{len(resume['reduced'])} at reduced depth, {len(resume['incomplete'])} partial, "
+              f"picked up by the next run")
+    delta_path = manifest.write_delta()
+    if delta_path:
+        changed = len({delta[0] for delta in manifest.deltas})
+        print(f"  ♻️  Wrote {delta_path.name}: {changed} new or changed players, {len(manifest.deltas)} lines")
     
-    print(f"\n🔄 Scraping {len(player_urls)} player profiles...")
-    year_range = f"{min(YEARS)}-{max(YEARS)}" if len(YEARS) > 1 else str(YEARS[0])
-    timestamp = datetime.now().strftime('%Y%m%d')
-    filename = OUTPUT_DIR / f"juco_recruiting_class_{year_range}_{timestamp}.csv"
+    print(f"\n✅ Completed {run.year}: {len(run.all_data)} players scraped this run, {len(rows)} in total")
+    return rows
+
+
+async def scrape_years(browser, years: list) -> list:
+    """
+    Scrapes one or more years through one shared worker pool. Discovery runs for every year at
+    once, then all their players go through the YearScheduler; each year keeps its own journal,
+    manifest and CSV.
+    """
+    if len(years) > 1:
+        print(f"\n🗓️  Scraping {len(years)} years concurrently: {', '.join(map(str, years))}")
+    prepared = await asyncio.gather(*(prepare_year(browser, year) for year in years))
+    runs = [run for run in prepared if run is not None]
+    rows = []
+    try:
+        pending = [run for run in runs if run.pending]
+        if pending:
+            await scrape_pending(browser, pending)
+    finally:
+        for run in runs:
+            rows.extend(finish_year(run))
+    return rows
+
+
+async def scrape_year(browser, year: int) -> list:
+    return await scrape_years(browser, [year])
+
+
+async def scrape_pending(browser, runs: list):
+    """Runs the worker pool over every year's unfinished players; player numbers are roster positions"""
+    total = sum(len(run.pending) for run in runs)
+    label = ", ".join(str(run.year) for run in runs)
+    limit = f", adaptive request limit from {min(INITIAL_CONCURRENT, MAX_CONCURRENT)}" if ADAPTIVE_CONCURRENCY else ""
+    print(f"\n🔄 Scraping {total} player profiles ({label}) with {MAX_CONCURRENT} workers{limit}...")
     
-    all_data = []
-    batch_buffer = []
-    for i in range(0, len(player_urls), MAX_CONCURRENT):
-        batch = player_urls[i:i + MAX_CONCURRENT]
-        batch_num = i // MAX_CONCURRENT
-        print(f"\n  📦 Batch {batch_num + 1}/{(len(player_urls) + MAX_CONCURRENT - 1) // MAX_CONCURRENT}")
-        batch_data = await scrape_player_batch(browser, batch, year, batch_num, len(player_urls))
-        all_data.extend(batch_data)
-        batch_buffer.extend(batch_data)
-        if len(batch_buffer) >= 100:
-            append_to_csv(filename, batch_buffer)
-            print(f"    💾 Saved {len(batch_buffer)} players to CSV")
-            batch_buffer = []
-        print(f"    → Progress: {len(all_data)}/{len(player_urls)} players")
+    slots = max(1, min(MAX_CONCURRENT, total))
+    scheduler = YearScheduler(runs, slots)
+    monitor = ThroughputMonitor(slots)
+    # Replay mode runs without a browser: every page comes from the cache
+    pool = PagePool(browser, slots) if browser is not None else None
+    http = None
+    try:
+        if pool:
+            await pool.start()
+            http = HttpFetcher(pool.request_context()) if FETCH_MODE != 'browser' else None
+        writers = [asyncio.create_task(csv_writer(run.filename, run.results, run.all_data, len(run.pending)))
+                   for run in runs]
+        workers = [
+            asyncio.create_task(player_worker(slot, pool, http, scheduler, monitor))
+            for slot in range(slots)
+        ]
+        await PLANNER.drain(workers)
+        # Players still backing off when the planner stopped: keep what an earlier attempt got
+        for run, player_num, url, attempt, failure, partial in scheduler.retries.drain():
+            FAILURE_STATS.record(failure, 'abandoned', url)
+            data, depth = partial or (None, 'full')
+            await run.results.put((url, run.record(url, data, failure, depth)))
+        for run in runs:
+            await run.results.put(None)
+        await asyncio.gather(*writers)
+    finally:
+        if pool:
+            await pool.close()
     
-    if batch_buffer:
-        append_to_csv(filename, batch_buffer)
-        print(f"    💾 Saved final {len(batch_buffer)} players to CSV")
-    print(f"\n✅ Completed {year}: {len(all_data)} players scraped")
-    return all_data
+    monitor.report(label)
+    scheduler.report()
+    if pool:
+        pool.report()
+
+async def watch_queue(work_queue: LeaseQueue):
+    """Coordinator without a worker: prints live progress until every player is done or failed"""
+    while await work_queue.call(work_queue.unfinished) and not PLANNER.expired():
+        await work_queue.call(print_queue_progress, work_queue)
+        await asyncio.sleep(QUEUE_STATUS_INTERVAL_S)
+
+
+def export_queue_year(work_queue: LeaseQueue, year: int) -> list:
+    """Writes one year's finished rows from the queue as its CSV, in roster order"""
+    rows = work_queue.rows(year)
+    filename = year_csv_path(year)
+    tmp_path = filename.with_suffix('.tmp')
+    with open(tmp_path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=CSV_HEADERS)
+        writer.writeheader()
+        writer.writerows(rows)
+    os.replace(tmp_path, filename)
+    failures = work_queue.failures(year)
+    print(f"  💾 {year}: wrote {len(rows)} players to {filename.name}, {len(failures)} failed")
+    for url, attempts, reason in failures[:20]:
+        print(f"      ❌ {url} ({attempts} attempts: {reason})")
+    return rows
+
+
+async def run_work_queue(browser) -> list:
+    """QUEUE_DB mode: enqueue YEARS (coordinator), lease players (worker), export once the queue drains"""
+    work_queue = LeaseQueue(QUEUE_DB)
+    try:
+        if QUEUE_ROLE in ('coordinator', 'all'):
+            rosters = await asyncio.gather(*(load_roster(browser, year) for year in YEARS))
+            for year, (player_urls, _) in zip(YEARS, rosters):
+                added = await work_queue.call(work_queue.enqueue, year, player_urls)
+                print(f"  📥 Queued {year}: {added} new of {len(player_urls)} roster players")
+        if QUEUE_ROLE in ('worker', 'all'):
+            await scrape_queue(browser, work_queue)
+        if QUEUE_ROLE == 'coordinator':
+            await watch_queue(work_queue)
+        await work_queue.call(print_queue_progress, work_queue)
+        if QUEUE_ROLE == 'worker':
+            return await work_queue.call(work_queue.rows)
+        unfinished = await work_queue.call(work_queue.unfinished)
+        if unfinished:
+            print(f"  ⏳ {unfinished} players still leased by other workers, CSVs written with what is done")
+        rows = []
+        for year in YEARS:
+            rows.extend(await work_queue.call(export_queue_year, work_queue, year))
+        return rows
+    finally:
+        work_queue.close()
+
+async def scrape_all_years(browser) -> list:
+    """YEARS under the global scheduler ('concurrent') or one after another ('sequential')"""
+    if YEAR_SCHEDULER == 'concurrent':
+        return await scrape_years(browser, YEARS)
+    rows = []
+    for year in YEARS:
+        if PLANNER.expired():
+            print(f"  ⏱️  Skipping {year}: the run planner has stopped")
+            continue
+        rows.extend(await scrape_year(browser, year))
+    return rows
 
 async def main():
     print("\n" + "="*80)
     print("🏈 247SPORTS JUCO SCRAPER - DEBUG VERSION")
     print("="*80)
+    if not 0 <= SHARD_INDEX < SHARD_COUNT:
+        print(f"❌ SHARD_INDEX must be between 0 and SHARD_COUNT - 1 (got {SHARD_INDEX} of {SHARD_COUNT})")
+        sys.exit(1)
+    if QUEUE_DB and SCRAPE_MODE != 'full':
+        print(f"ℹ️  SCRAPE_MODE={SCRAPE_MODE} only applies to journal runs, queue workers always open profiles")
     OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        all_players = []
-        for year in YEARS:
-            year_data = await scrape_year(browser, year)
-            all_players.extend(year_data)
-        await browser.close()
+    all_players = []
+    PLANNER.install_signal_handlers()
+    LOOP_LAG.start()
+    if CACHE_MODE == 'replay':
+        print("🗄️  REPLAY MODE: serving every page from the cache, no network access")
+        if QUEUE_DB:
+            all_players.extend(await run_work_queue(None))
+        else:
+            all_players.extend(await scrape_all_years(None))
+    else:
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(headless=True)
+            if QUEUE_DB:
+                all_players.extend(await run_work_queue(browser))
+            else:
+                all_players.extend(await scrape_all_years(browser))
+            await browser.close()
+    await LOOP_LAG.stop()
+    PARSE_POOL.shutdown()
+    WAIT_STATS.report()
+    TRAFFIC_STATS.report()
+    DISCOVERY_STATS.report()
+    CONCURRENCY.report()
+    FETCH_STATS.report()
+    PARSE_STATS.report()
+    PARSE_POOL.report()
+    LOOP_LAG.report()
+    BRANCH_STATS.report()
+    NAVIGATION_STATS.report()
+    TIMELINE_STATS.report()
+    PLANNER.report()
+    FAILURE_STATS.report()
+    EXTRACT_STATS.report()
+    INCREMENTAL_STATS.report()
+    RESULT_STORE.report()
+    if PAGE_CACHE is not None:
+        PAGE_CACHE.report()
     if not all_players:
         print("\n❌ CRITICAL: No data scraped.")
         sys.exit(1)